@@ -215,7 +215,11 @@ def process_file(
 
     # --- PHASE 2: SEGMENTATION ---
     print_phase_header(2, "TOPIC SEGMENTATION")
-    topic_segments = segmenter.segment_text(raw_text)
+    # Split once; the segmenter and classifier share the same sentence table. Segmentation therefore
+    # runs on the classifier's sentences (spaCy split plus Tagalog command splitting) rather than the
+    # Segmenter's own regex units, so CLI topic boundaries can differ slightly from the GUI's.
+    sentence_table = classifier.build_sentence_table(raw_text)
+    topic_segments = segmenter.segment_text(raw_text, sentence_table=sentence_table)
     segmenter.print_segments(topic_segments)
 
     # --- PHASE 3: ACTION ITEM EXTRACTION ---
@@ -227,12 +231,14 @@ def process_file(
             raw_text,
             segment_metadata,
             persist=False,
+            sentence_table=sentence_table,
         )
     else:
         audit_report = classifier.audit_transcript(
             raw_text,
             persist=False,
             segment_context=topic_segments,
+            sentence_table=sentence_table,
         )
     corrections = audit_report["corrections"]
 
@@ -5,6 +5,9 @@ from datetime import datetime
 from html import escape
 from tempfile import NamedTemporaryFile
 
+from core.lexicon import ACTION_VERB_PATTERN, FALLBACK_ACTION_VERB_PATTERN, action_cue_hits, action_verb_hits
+from core.sentence_table import SentenceTable, split_sentences
+
 
 class ReportContentFormatter:
     """Text normalization utilities for PDF-friendly output."""
@@ -67,7 +70,7 @@ class ReportContentFormatter:
                     return ["This comprehensive meeting covered multiple topics in depth, with thorough discussion and clear next steps."]
             return ["No executive summary was generated for this session."]
 
-        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+        sentences = split_sentences(text)
         if not sentences:
             return [text]
 
@@ -332,21 +335,9 @@ class ReportContentFormatter:
         score = 0.12
         found_markers = []
 
-        action_verb_pattern = re.compile(
-            r"\b(please|pwede|paki|can you|could you|need to|must|should|due|"
-            r"submit|send|prepare|review|finalize|update|document|record|log|check|coordinate|"
-            r"schedule|arrange|execute|create|make|build|run|close|isolate|investigate|"
-            r"implement|validate|configure|analyze|audit|approve|reject|merge|revert|"
-            r"release|publish|assign|notify|inform|alert|confirm|clarify|explain|summarize|"
-            r"read|write|call|test|deploy|fix|produce|handle|simulate|open|complete|design|form|begin|start|"
-            r"ipasa|buksan|isara|ilagay|tawagan|asikaso|ayos|gawin|tumalo|tumalon|basahin|magbasa|magsulat|"
-            r"isulat|tingnan|kunin|sabihin|tapusin|simulan|tulungan|bayaran|ipadala|ibigay)\b",
-            flags=re.IGNORECASE,
-        )
-
-        matches = action_verb_pattern.findall(item)
+        matches = action_verb_hits(item)
         if matches:
-            found_markers.extend([m.lower() for m in matches])
+            found_markers.extend([hit.text.lower() for hit in matches])
             score += 0.40
 
         if len(item.split()) >= 6:
@@ -455,6 +446,7 @@ class ExportService:
     def __init__(self):
         self.output_dir = os.path.join("output", "pdf")
         self.formatter = ReportContentFormatter()
+        self._topic_segmenter = None
 
     def _extract_json_object(self, text):
         """Extract first JSON object from model output, including fenced output."""
@@ -510,17 +502,7 @@ class ExportService:
         if not text_value:
             return []
 
-        action_verb_pattern = re.compile(
-            r"\b(please|pwede|paki|can you|could you|need to|must|should|due|"
-            r"submit|send|prepare|review|finalize|update|document|record|log|check|coordinate|"
-            r"schedule|arrange|execute|create|make|build|run|close|isolate|investigate|"
-            r"implement|validate|configure|analyze|audit|approve|reject|merge|revert|"
-            r"release|publish|assign|notify|inform|alert|confirm|clarify|explain|summarize|"
-            r"read|write|call|test|deploy|fix|produce|handle|simulate|open|complete|design|form|begin|start|"
-            r"ipasa|buksan|isara|ilagay|tawagan|asikaso|ayos|gawin|tumalo|tumalon|basahin|magbasa|magsulat|"
-            r"isulat|tingnan|kunin|sabihin|tapusin|simulan|tulungan|bayaran|ipadala|ibigay)\b",
-            flags=re.IGNORECASE,
-        )
+        action_verb_pattern = ACTION_VERB_PATTERN
 
         split_pattern = re.compile(
             r"(\b(?:and then|then|at saka|saka|tapos|after that|next|and also|plus|but then|however|pero|but|and|at|or)\b|\s*[;,]\s*)",
@@ -569,9 +551,11 @@ class ExportService:
         return cleaned if cleaned else [text_value]
 
 
-    def _build_language_aware_topic_labels(self, transcript_text, max_topics=5):
+    def _build_language_aware_topic_labels(self, transcript_text, max_topics=5, sentence_table=None):
         """Build transcript-derived topic labels that preserve the transcript language."""
-        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", transcript_text or "") if s.strip()]
+        if sentence_table is None:
+            sentence_table = self.build_sentence_table(transcript_text)
+        sentences = sentence_table.sentences
         topics = []
         seen = set()
 
@@ -601,37 +585,26 @@ class ExportService:
 
         return topics
 
-    def extract_action_items_fast(self, transcript_text, max_items=25):
-        """Fast Llama-first extractor that returns only transcript-grounded action phrases."""
+    def build_sentence_table(self, transcript_text):
+        """Split a cleaned transcript once into the sentence table shared by extraction, analytics, and summary."""
+        return SentenceTable.from_text(self.formatter.clean_transcript_text(transcript_text))
+
+    def extract_action_items_fast(self, transcript_text, max_items=25, sentence_table=None):
+        """Fast Llama-first extractor that returns only transcript-grounded action phrases.
+
+        Pass the transcript's canonical ``sentence_table`` to reuse its split for the regex
+        fallback and sentence count instead of splitting the text again. The table used is
+        returned under ``sentence_table`` so later stages (analytics, summary) can reuse it.
+        """
         clean_text = self.formatter.clean_transcript_text(transcript_text)
-        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", clean_text) if s.strip()]
+        if sentence_table is None:
+            sentence_table = self.build_sentence_table(clean_text)
+        sentences = list(sentence_table.sentences)
         details = []
 
         # Regex fallback (also used as safety net when model output is invalid).
         def fallback_candidates():
-            markers = [
-                r"\bplease\b", r"\bpwede\b", r"\bpaki\b", r"\bcan you\b", r"\bcould you\b",
-                r"\bneed to\b", r"\bmust\b", r"\bshould\b", r"\bdue\b", r"\bsubmit\b",
-                r"\bsend\b", r"\bprepare\b", r"\breview\b", r"\bipasa\b", r"\bbuksan\b",
-                r"\bisara\b", r"\bilagay\b", r"\bupdate\b", r"\bfinalize\b", r"\bexecute\b",
-                r"\bcreate\b", r"\bmake\b", r"\bbuild\b", r"\brun\b", r"\bclose\b",
-                r"\bisolate\b", r"\binvestigate\b", r"\bimplement\b", r"\bvalidate\b",
-                r"\bconfigure\b", r"\banalyze\b", r"\baudit\b", r"\bapprove\b", r"\breject\b",
-                r"\bmerge\b", r"\brevert\b", r"\brelease\b", r"\bpublish\b", r"\bassign\b",
-                r"notify", r"inform", r"alert", r"confirm", r"clarify",
-                r"explain", r"summarize", r"read", r"write", r"call",
-                r"test", r"deploy", r"fix", r"produce", r"handle", r"simulate",
-                r"open", r"complete", r"design", r"form", r"begin", r"start",
-                r"tawagan", r"asikaso", r"ayos", r"gawin", r"tumalo", r"tumalon", 
-                r"basahin", r"magbasa", r"magsulat", r"isulat", r"tingnan", r"kunin", r"sabihin", 
-                r"tapusin", r"simulan", r"tulungan", r"bayaran", r"ipadala", r"ibigay"
-            ]
-            pattern = re.compile("|".join(markers), flags=re.IGNORECASE)
-            out = []
-            for sentence in sentences:
-                if pattern.search(sentence):
-                    out.append(sentence)
-            return out
+            return [sentence for sentence in sentences if FALLBACK_ACTION_VERB_PATTERN.search(sentence)]
 
         model_items = []
         try:
@@ -738,15 +711,18 @@ class ExportService:
             "confidence_scores": [float(detail.get("weight", 0.0)) for detail in details],
             "total_sentences": len(sentences),
             "clean_transcript": clean_text,
+            "sentence_table": sentence_table,
         }
 
-    def build_transcript_analytics(self, transcript_text, action_items=None, sentences=None):
+    def build_transcript_analytics(self, transcript_text, action_items=None, sentences=None, sentence_table=None):
         """Build conservative analytics for the transcript without inventing labels."""
         action_items = [str(item).strip() for item in (action_items or []) if str(item).strip()]
         transcript_text = transcript_text or ""
 
         if sentences is None:
-            sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", transcript_text) if s.strip()]
+            if sentence_table is None:
+                sentence_table = self.build_sentence_table(transcript_text)
+            sentences = list(sentence_table.sentences)
 
         total_sentences = len(sentences)
         action_count = len(action_items)
@@ -763,38 +739,17 @@ class ExportService:
                 "should", "have", "has", "be", "been", "being", "is", "are", "was", "were",
             }
             
-            # Comprehensive multilingual action cues: English, Tagalog, Taglish
-            action_cues = {
-                # English action verbs
-                "submit", "send", "prepare", "review", "complete", "finalize", "update",
-                "coordinate", "call", "follow", "draft", "deliver", "share", "check",
-                "run", "create", "close", "isolate", "document", "execute", "schedule",
-                "arrange", "investigate", "implement", "test", "deploy", "verify", "validate",
-                "configure", "analyze", "audit", "approve", "reject", "merge", "revert",
-                "fix", "patch", "release", "publish", "assign", "reassign", "escalate",
-                "notify", "inform", "alert", "confirm", "clarify", "explain", "summarize",
-                "start", "begin",
-                # Tagalog action verbs
-                "sara", "bukas", "tawag", "ilipat", "tulong", "asikaso", "ayos", "gawa",
-                "ipasa", "buksan", "isara", "ilagay", "ipaalam", "iupdate", "icheck",
-                "bigyan", "bayaran", "gatarin", "tiyakin", "suriin", "basahin", "sulatin",
-                "sabihin", "tanungin", "tumingin", "magsimula", "magtrabaho", "magpatibay",
-                "magbasa", "magsulat", "isulat", "simulan",
-                # Taglish blend
-                "idraft", "ireview", "isubmit", "idocument", "icoordinate",
-            }
-
+            # Comprehensive multilingual action cues (English, Tagalog, Taglish) live in core.lexicon;
+            # one scan per item returns every cue hit.
             for item in items:
-                words = re.findall(r"[A-Za-zÀ-ÿ']+", item.lower())
-                for word in words:
+                for hit in action_cue_hits(item):
+                    word = hit.text
                     if len(word) < 4:
                         continue
                     if word in stop_words:
                         continue
-                    # Keep action-like words first
-                    if word in action_cues:
-                        tokens.append(word)
-                        action_cues_used.append(word)
+                    tokens.append(word)
+                    action_cues_used.append(word)
 
             # Fallback to generic keyword extraction when action-cue-only set is empty.
             if not tokens:
@@ -850,11 +805,11 @@ class ExportService:
             "action_items": action_items,
         }
 
-    def build_preview_summary(self, transcript_text, action_items=None, summary_text=None):
+    def build_preview_summary(self, transcript_text, action_items=None, summary_text=None, sentence_table=None):
         """Build an executive overview for preview/PDF export.
 
         Prefer an explicit summary when provided, then Groq/Llama summarization, then a short
-        transcript excerpt fallback.
+        transcript excerpt fallback (taken from ``sentence_table`` when one is passed).
         """
         summary_text = (summary_text or "").strip()
         if summary_text:
@@ -875,15 +830,19 @@ class ExportService:
         except Exception:
             pass
 
-        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", clean_text) if s.strip()]
+        if sentence_table is None:
+            sentence_table = self.build_sentence_table(clean_text)
+        sentences = sentence_table.sentences
         if sentences:
             return " ".join(sentences[:2])
         return clean_text[:300]
 
-    def build_topic_labels(self, transcript_text, max_topics=5):
+    def build_topic_labels(self, transcript_text, max_topics=5, sentence_table=None):
         """Build topic labels for preview/PDF export.
 
         Prefer the LLM when available, then semantic segmenter, then fall back to short transcript-derived labels.
+        The segmenter and the fallbacks work on the transcript's ``sentence_table`` (built here when not
+        passed), so topic labels use the same sentence split as extraction and analytics.
         """
         clean_text = self.formatter.clean_transcript_text(transcript_text)
         if not clean_text:
@@ -925,18 +884,26 @@ class ExportService:
         except Exception:
             pass
 
+        if sentence_table is None:
+            sentence_table = self.build_sentence_table(clean_text)
         style = self._detect_transcript_style(clean_text)
 
         if style in {"tagalog", "taglish"}:
-            topics = self._build_language_aware_topic_labels(clean_text, max_topics=max_topics)
+            topics = self._build_language_aware_topic_labels(
+                clean_text, max_topics=max_topics, sentence_table=sentence_table
+            )
             if topics:
                 return topics
 
         try:
-            from core.segmenter import Segmenter
-
-            segmenter = Segmenter(chunk_size=5, max_tokens=250)
-            segmenter.segment_text(clean_text)
+            if self._topic_segmenter is None:
+                from core.segmenter import Segmenter
+
+                # Kept across exports so the embedding model loads once; repeated transcripts
+                # are served from the shared embedding cache without inference.
+                self._topic_segmenter = Segmenter(chunk_size=5, max_tokens=250)
+            segmenter = self._topic_segmenter
+            segmenter.segment_text(sentence_table.text, sentence_table=sentence_table)
             topics = []
             seen = set()
             for segment in segmenter.get_segment_metadata():
@@ -955,13 +922,14 @@ class ExportService:
         except Exception:
             pass
 
-        topics = self._build_language_aware_topic_labels(clean_text, max_topics=max_topics)
+        topics = self._build_language_aware_topic_labels(
+            clean_text, max_topics=max_topics, sentence_table=sentence_table
+        )
         if topics:
             return topics
 
-        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", clean_text) if s.strip()]
         topics = []
-        for sentence in sentences:
+        for sentence in sentence_table.sentences:
             words = re.findall(r"[A-Za-zÀ-ÿ']+", sentence)
             if len(words) < 4:
                 continue
@@ -1183,10 +1151,14 @@ class ExportService:
         section_order=None,
         include_sections=None,
         analytics=None,
+        sentence_table=None,
     ):
         """Generate a professional PDF report with narrative summary and Llama action items."""
         clean_content = self.formatter.clean_transcript_text(content)
-        analytics = analytics if analytics is not None else self.build_transcript_analytics(clean_content, action_items=action_items)
+        if analytics is None:
+            analytics = self.build_transcript_analytics(
+                clean_content, action_items=action_items, sentence_table=sentence_table
+            )
         chart_path = None
 
         try:
@@ -6,16 +6,17 @@ import re
 import tempfile
 import subprocess
 import glob
-import pickle
 import wave
 from tkinter import simpledialog, filedialog
 
 from faster_whisper import WhisperModel
 import scipy.io.wavfile as wav
-from sklearn.linear_model import SGDClassifier
-from sklearn.feature_extraction.text import HashingVectorizer
 from app.export_service import ExportService
+from core.lexicon import looks_like_information_override
+from core.model_registry import get_model_registry
 from core.segmenter import Segmenter
+from core.streaming_segmenter import END_OF_STREAM, StreamingSegmenter
+from integrations.groq.rate_limits import recommended_wait_seconds
 
 try:
     from integrations.groq.transcribe import transcribe_with_groq
@@ -39,8 +40,8 @@ except Exception as e:
     BartTokenizer = None
     LOCAL_BART_IMPORT_ERROR = str(e)
 
-# we can add pickle file loading here centralized for the whole app, 
-# so if we want to load a saved SVM model or something later we can do it here and pass it to the relevant components (pickle.load(MODEL_PATH) for example)
+# The SVM student is resolved through the process-wide model registry (core/model_registry.py),
+# shared with ActionItemClassifier and hot-reloaded when the model file changes on disk.
 
 class AppLogic:
     def __init__(self, view, audio):
@@ -53,10 +54,13 @@ class AppLogic:
         self.file_transcriber = None
         self.project_root = os.path.dirname(os.path.dirname(__file__))
         self.model_path = os.path.join(self.project_root, "svm_model.pkl")
-        self.vectorizer = HashingVectorizer(n_features=2**16, ngram_range=(1, 3), alternate_sign=False)
-        self.classifier = self._load_or_init_classifier()
+        self.model_registry = get_model_registry()
         self.local_bart = None
         self.segmenter = Segmenter(chunk_size=5, max_tokens=1024)
+        # Topics are segmented while a live meeting is recorded; see _start_live_segmentation.
+        self.live_segmenter = StreamingSegmenter(self.segmenter, on_segment=self._on_live_segment)
+        self._live_segment_queue = queue.Queue()
+        self._live_segment_thread = None
         self.live_transcribe_prompt = (
             "This is a Taglish meeting transcript involving technical tasks and action items."
         )
@@ -65,67 +69,19 @@ class AppLogic:
     def _format_secs(self, seconds):
         return f"{seconds:.1f}s"
 
-    def _load_or_init_classifier(self):
-        if os.path.exists(self.model_path):
-            with open(self.model_path, "rb") as f:
-                return pickle.load(f)
+    @property
+    def classifier(self):
+        return self.model_registry.get(self.model_path).clf
 
-        model = SGDClassifier(loss="hinge")
-        X_initial = self.vectorizer.transform(["info", "please do this"])
-        y_initial = [0, 1]
-        model.partial_fit(X_initial, y_initial, classes=[0, 1])
-        return model
+    @property
+    def vectorizer(self):
+        return self.model_registry.get(self.model_path).vectorizer
 
     def _get_features(self, sentence):
         return self.vectorizer.transform([sentence])
 
     def _looks_like_information_override(self, sentence):
-        normalized = re.sub(r"\s+", " ", str(sentence or "")).strip().lower().rstrip(".?!,")
-        if not normalized:
-            return False
-
-        info_patterns = [
-            r"^thank you(?: so much)?$",
-            r"^thanks(?: everyone| all)?$",
-            r"^appreciate it$",
-            r"^noted$",
-            r"^received(?: with thanks)?$",
-            r"^copy that$",
-            r"^got it$",
-            r"^roger that$",
-            r"^understood$",
-            r"^acknowledged$",
-            r"^good (?:morning|afternoon|evening)(?: everyone)?$",
-            r"^welcome(?: everyone)?$",
-            r"^fyi$",
-            r"^for your information$",
-            r"^no further updates from the team$",
-            r"^nothing else to add$",
-        ]
-
-        task_markers = [
-            r"\bplease\b",
-            r"\bneed(s)? to\b",
-            r"\bshould\b",
-            r"\bmust\b",
-            r"\bwill\b",
-            r"\bcan you\b",
-            r"\bcould you\b",
-            r"\bfollow up\b",
-            r"\bsend\b",
-            r"\bprepare\b",
-            r"\breview\b",
-            r"\bupdate\b",
-            r"\bcomplete\b",
-        ]
-
-        if len(normalized.split()) > 12:
-            return False
-
-        if any(re.search(pattern, normalized) for pattern in task_markers):
-            return False
-
-        return any(re.fullmatch(pattern, normalized) for pattern in info_patterns)
+        return looks_like_information_override(sentence)
 
     def _load_local_bart(self):
         if self.local_bart is not None:
@@ -348,7 +304,7 @@ class AppLogic:
                     is_rate_limit_error = True
 
                 if attempt < retries and not quiet:
-                    wait_s = self._recommended_wait_seconds(e, attempt)
+                    wait_s = recommended_wait_seconds(e, attempt)
                     self._append_system_text(
                         f"Groq attempt {attempt}/{retries} failed: {e}. Retrying in {wait_s}s..."
                     )
@@ -374,22 +330,6 @@ class AppLogic:
 
         raise RuntimeError(f"Groq failed after {retries} attempts: {last_error}")
 
-    def _recommended_wait_seconds(self, error, attempt):
-        """Derive retry wait from Groq rate-limit messages, with safe fallback."""
-        msg = str(error)
-        lowered = msg.lower()
-
-        match = re.search(r"try again in\s*(?:(\d+)m)?\s*(\d+(?:\.\d+)?)s", lowered)
-        if match:
-            minutes = int(match.group(1) or 0)
-            seconds = float(match.group(2) or 0)
-            return max(1, int(minutes * 60 + seconds + 1))
-
-        if "429" in lowered or "rate_limit" in lowered or "rate limit" in lowered:
-            return min(120, 8 * attempt)
-
-        return min(30, 2 * attempt)
-
     def _transcribe_groq_chunked(self, file_path, language="tl", segment_seconds=120, quiet=False):
         segment_seconds = int(os.getenv("GROQ_SEGMENT_SECONDS", str(segment_seconds)))
         segment_seconds = max(30, min(segment_seconds, 300))
@@ -503,12 +443,68 @@ class AppLogic:
 
         threading.Thread(target=worker, daemon=True).start()
 
-    def _extract_topic_labels_from_transcript(self, transcript_text):
+    def _start_live_segmentation(self):
+        """Segment live transcript lines into topics on a background thread until the meeting ends."""
+        self._stop_live_segmentation(feed_remaining=False)
+        self.live_segmenter.reset()
+        # Each meeting gets its own queue, so nothing queued for an earlier meeting can reach this one.
+        self._live_segment_queue = queue.Queue()
+        self._live_segment_thread = threading.Thread(
+            target=self.live_segmenter.consume,
+            args=(self._live_segment_queue,),
+            daemon=True,
+        )
+        self._live_segment_thread.start()
+
+    def _stop_live_segmentation(self, feed_remaining=True):
+        """Stop the live segmentation thread once it has segmented the queued lines (or dropped them)."""
+        thread, self._live_segment_thread = self._live_segment_thread, None
+        if thread is None:
+            return
+        if not feed_remaining:
+            while True:
+                try:
+                    self._live_segment_queue.get_nowait()
+                except queue.Empty:
+                    break
+        # The consumer finishes the lines ahead of the sentinel, so no other thread feeds the segmenter.
+        self._live_segment_queue.put(END_OF_STREAM)
+        thread.join()
+
+    def _on_live_segment(self, segment):
+        description = segment.get("topical_description") or segment.get("topic_label", "")
+        start_time = segment.get("start_time")
+        prefix = f"[{start_time}] " if start_time else ""
+        self.view.after(0, self._append_system_text, f"{prefix}Topic {segment['segment_id']} closed: {description}")
+
+    def _finalize_live_topics(self, max_topics=5):
+        """Close the last open live segment and return de-duplicated topic labels (None if there are none)."""
+        self._stop_live_segmentation()
+        try:
+            self.live_segmenter.finalize()
+        except Exception as e:
+            print(f"[Warning] Could not finalize live segmentation: {e}")
+            return None
+
+        topics = []
+        seen = set()
+        for segment in self.live_segmenter.get_segments():
+            desc = str(segment.get("topical_description", "")).strip()
+            normalized = re.sub(r"\s+", " ", desc.lower())
+            if not desc or normalized in seen:
+                continue
+            seen.add(normalized)
+            topics.append(desc[:80] + ("..." if len(desc) > 80 else ""))
+            if len(topics) >= max_topics:
+                break
+        return topics or None
+
+    def _extract_topic_labels_from_transcript(self, transcript_text, sentence_table=None):
         """Build topic labels using the exporter so language-aware fallbacks stay consistent."""
-        topics = self.exporter.build_topic_labels(transcript_text)
+        topics = self.exporter.build_topic_labels(transcript_text, sentence_table=sentence_table)
         return topics if topics else None
 
-    def _process_file_to_pdf(self, file_path, fallback_duration_seconds=None):
+    def _process_file_to_pdf(self, file_path, fallback_duration_seconds=None, topics=None):
         t_start = time.perf_counter()
         # For live recordings, prefer the fallback duration (actual elapsed time) over file headers
         # since file headers may not be reliable for just-saved files
@@ -538,8 +534,17 @@ class AppLogic:
         summarize_time = time.perf_counter() - t1
 
         # Build real preview content so the viewer does not fall back to placeholders.
-        preview_summary = self.exporter.build_preview_summary(text, action_items=preview_action_items)
-        preview_topics = self._extract_topic_labels_from_transcript(text) or []
+        preview_summary = self.exporter.build_preview_summary(
+            text,
+            action_items=preview_action_items,
+            sentence_table=extraction.get("sentence_table"),
+        )
+        # Live recordings arrive with topics already segmented during the meeting.
+        preview_topics = (
+            topics
+            or self._extract_topic_labels_from_transcript(text, sentence_table=extraction.get("sentence_table"))
+            or []
+        )
 
         total_time = time.perf_counter() - t_start
 
@@ -550,6 +555,7 @@ class AppLogic:
                 summary_text=preview_summary,
                 topics=preview_topics,
                 duration_seconds=media_duration_seconds,
+                sentence_table=extraction.get("sentence_table"),
             )
 
         self.view.after(0, open_preview)
@@ -578,6 +584,7 @@ class AppLogic:
         self.view.is_recording = True
         self._last_ui_speaker_label = None
         self._ensure_transcript_ready()
+        self._start_live_segmentation()
         self.view.status_indicator.configure(text="● RECORDING", text_color="#ff4b4b")
         self.view.btn_record.configure(image=self.view.stop_icon, command=self.handle_stop, border_color="#ff4b4b")
         self.view.transcript_box.configure(state="normal")
@@ -618,6 +625,8 @@ class AppLogic:
         self._append_system_text("Stopped.")
 
         if decision is False:
+            self._stop_live_segmentation(feed_remaining=False)
+            self.live_segmenter.reset()
             self.audio.clear_recording_buffer()
             self._append_system_text("Recording discarded. No PDF generated.")
             return
@@ -642,8 +651,11 @@ class AppLogic:
 
         def worker():
             try:
+                live_topics = self._finalize_live_topics()
                 print(f"[Debug] Worker thread: calling _process_file_to_pdf with duration={fallback_duration}")
-                result = self._process_file_to_pdf(saved_path, fallback_duration_seconds=fallback_duration)
+                result = self._process_file_to_pdf(
+                    saved_path, fallback_duration_seconds=fallback_duration, topics=live_topics
+                )
                 if result.get("cancelled"):
                     self.view.after(0, self._append_system_text, "PDF generation cancelled.")
                     return
@@ -708,6 +720,7 @@ class AppLogic:
                 # Check the audio handler's text queue
                 new_text = self.audio.text_queue.get(timeout=0.1)
                 print(f"[Debug]: UI Received: {new_text}")
+                self._live_segment_queue.put(new_text)
                 # Safely update the GUI from a background thread
                 self.view.after(0, self.update_ui_text, new_text)
             except queue.Empty:
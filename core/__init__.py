@@ -2,9 +2,24 @@
 Core modules for ThesisModel processing pipeline.
 """
 
-from .transcriber import Transcriber
-from .segmenter import Segmenter
-from .classifier import ActionItemClassifier
-from .summarizer import Summarizer
+import importlib
+
+# Pipeline classes are imported on first access so lightweight modules (model store, lexicon,
+# sentence table) can be used without loading Whisper, spaCy, or sentence-transformers.
+_LAZY_EXPORTS = {
+    'Transcriber': '.transcriber',
+    'Segmenter': '.segmenter',
+    'ActionItemClassifier': '.classifier',
+    'Summarizer': '.summarizer',
+}
 
 __all__ = ['Transcriber', 'Segmenter', 'ActionItemClassifier', 'Summarizer']
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,217 @@
+"""
+Length-Bucketed Sentence Encoding
+Wraps a SentenceTransformer-compatible encoder so sentences are encoded in batches of similar
+token length: sentences are sorted by tokenized length and packed into batches whose padded size
+(rows x longest row) stays within a token budget. A batch of short acknowledgements therefore
+holds many rows, a batch of long monologue sentences only a few, and little compute is spent on
+padding. Output rows come back in the caller's order.
+
+The token budget is tuned per machine and model: the first large enough call times a few
+candidate budgets on its own sentences and the fastest one is stored in a small JSON file.
+"""
+
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+
+DEFAULT_TOKEN_BUDGET = 4096
+TOKEN_BUDGET_CANDIDATES = (1024, 2048, 4096, 8192, 16384)
+MAX_BATCH_ROWS = 512
+MIN_TUNING_SENTENCES = 64
+MAX_TUNING_SENTENCES = 256
+DEFAULT_TUNING_PATH = os.path.join("output", "cache", "encoder_tuning.json")
+
+_tuning_lock = threading.Lock()
+
+
+def machine_key():
+    """Identify the machine a tuned budget was measured on."""
+    return f"{platform.node()}|{platform.machine()}|{os.cpu_count()}"
+
+
+def _read_tuning(path):
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_tuning(path, tuning):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    handle = tempfile.NamedTemporaryFile(
+        mode="w", encoding="utf-8", dir=directory, prefix=".tuning.", suffix=".tmp", delete=False
+    )
+    try:
+        with handle:
+            json.dump(tuning, handle, indent=2, sort_keys=True)
+        os.replace(handle.name, path)
+    except BaseException:
+        if os.path.exists(handle.name):
+            os.remove(handle.name)
+        raise
+
+
+def plan_batches(lengths, token_budget, max_rows=MAX_BATCH_ROWS):
+    """
+    Group sentence indices into length-sorted batches within a padded-token budget.
+
+    Args:
+        lengths (array-like): Token length of each sentence
+        token_budget (int): Largest rows x longest-row product per batch
+        max_rows (int): Cap on rows per batch
+
+    Returns:
+        list[np.ndarray]: Index arrays, longest sentences first
+    """
+    lengths = np.maximum(np.asarray(lengths, dtype=np.int64), 1)
+    order = np.argsort(-lengths, kind="stable")
+    batches = []
+    start = 0
+    while start < order.size:
+        # Lengths are descending, so the first row is the longest of the batch.
+        rows = int(min(max_rows, max(1, token_budget // lengths[order[start]])))
+        batches.append(order[start:start + rows])
+        start += rows
+    return batches
+
+
+class BucketedEncoder:
+    """Encode sentences in length-bucketed, token-budgeted batches."""
+
+    def __init__(self, model, model_key, token_budget=None, tuning_path=DEFAULT_TUNING_PATH):
+        """
+        Initialize the encoder.
+
+        Args:
+            model (SentenceTransformer): Encoder with ``encode`` (and ideally ``tokenizer``/``max_seq_length``)
+            model_key (str): Name the tuned budget is stored under (model and backend)
+            token_budget (int | None): Fixed padded-token budget per batch (None tunes it per machine)
+            tuning_path (str | None): JSON file holding tuned budgets (None keeps them in memory only)
+        """
+        self.model = model
+        self.model_key = str(model_key)
+        self.tuning_path = tuning_path
+        self.token_budget = int(token_budget) if token_budget else None
+        self.tuning_results = None
+        self._auto_tune = token_budget is None
+        self._tune_lock = threading.Lock()
+        if self._auto_tune and tuning_path:
+            stored = _read_tuning(tuning_path).get(f"{machine_key()}|{self.model_key}")
+            if stored:
+                self.token_budget = int(stored["token_budget"])
+                self._auto_tune = False
+
+    def token_lengths(self, sentences):
+        """Tokenized length of each sentence (truncated like the model does), or a word-count estimate."""
+        tokenizer = getattr(self.model, "tokenizer", None)
+        max_length = getattr(self.model, "max_seq_length", None)
+        if tokenizer is not None:
+            try:
+                encoded = tokenizer(
+                    list(sentences),
+                    add_special_tokens=True,
+                    truncation=max_length is not None,
+                    max_length=max_length,
+                )
+                return np.array([len(ids) for ids in encoded["input_ids"]], dtype=np.int64)
+            except Exception:
+                pass
+        lengths = np.array([len(sentence.split()) * 4 // 3 + 2 for sentence in sentences], dtype=np.int64)
+        return np.minimum(lengths, max_length) if max_length else lengths
+
+    def _encode_batches(self, sentences, lengths, token_budget, normalize_embeddings):
+        output = None
+        for batch in plan_batches(lengths, token_budget):
+            vectors = np.asarray(
+                self.model.encode(
+                    [sentences[index] for index in batch],
+                    batch_size=len(batch),
+                    convert_to_numpy=True,
+                    normalize_embeddings=normalize_embeddings,
+                    show_progress_bar=False,
+                ),
+                dtype=np.float32,
+            )
+            if output is None:
+                output = np.empty((len(sentences), vectors.shape[1]), dtype=np.float32)
+            output[batch] = vectors
+        return output
+
+    def tune(self, sentences, normalize_embeddings=True):
+        """
+        Time each candidate budget on a sample of ``sentences`` and keep the fastest.
+
+        Args:
+            sentences (list[str]): Sentences representative of the workload
+            normalize_embeddings (bool): Passed through to the encoder
+
+        Returns:
+            int: Chosen token budget
+        """
+        sentences = list(sentences)
+        step = max(1, len(sentences) // MAX_TUNING_SENTENCES)
+        sample = sentences[::step][:MAX_TUNING_SENTENCES]
+        lengths = self.token_lengths(sample)
+
+        # Warm-up so one-time setup is not charged to the first candidate.
+        self._encode_batches(sample[:8], lengths[:8], DEFAULT_TOKEN_BUDGET, normalize_embeddings)
+        results = {}
+        for budget in TOKEN_BUDGET_CANDIDATES:
+            started = time.perf_counter()
+            self._encode_batches(sample, lengths, budget, normalize_embeddings)
+            elapsed = time.perf_counter() - started
+            results[budget] = len(sample) / elapsed if elapsed else float("inf")
+
+        self.token_budget = max(results, key=results.get)
+        self.tuning_results = results
+        self._auto_tune = False
+        print(
+            f"[System] Tuned embedding batch budget for {self.model_key}: {self.token_budget} tokens "
+            f"({results[self.token_budget]:.1f} sentences/s on {len(sample)} sentences)"
+        )
+
+        if self.tuning_path:
+            try:
+                with _tuning_lock:
+                    tuning = _read_tuning(self.tuning_path)
+                    tuning[f"{machine_key()}|{self.model_key}"] = {
+                        "token_budget": self.token_budget,
+                        "sentences_per_sec": {str(budget): round(rate, 1) for budget, rate in results.items()},
+                        "tuned_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    }
+                    _write_tuning(self.tuning_path, tuning)
+            except OSError as error:
+                print(f"[Warning] Could not save encoder tuning ({error}).")
+        return self.token_budget
+
+    def encode(self, sentences, normalize_embeddings=True):
+        """
+        Embed sentences, returning rows in the given order.
+
+        Args:
+            sentences (list[str]): Sentences to embed
+            normalize_embeddings (bool): Unit-normalize each embedding
+
+        Returns:
+            np.ndarray: float32 matrix with one row per sentence
+        """
+        sentences = [str(sentence) for sentence in sentences]
+        if not sentences:
+            return np.zeros((0, 0), dtype=np.float32)
+        # One caller tunes; concurrent callers encode with the current budget instead of waiting.
+        if self._auto_tune and len(sentences) >= MIN_TUNING_SENTENCES and self._tune_lock.acquire(blocking=False):
+            try:
+                if self._auto_tune:
+                    self.tune(sentences, normalize_embeddings=normalize_embeddings)
+            finally:
+                self._tune_lock.release()
+        budget = self.token_budget or DEFAULT_TOKEN_BUDGET
+        return self._encode_batches(sentences, self.token_lengths(sentences), budget, normalize_embeddings)
@@ -3,15 +3,32 @@ Phase 3: Action Item Classifier Module
 Handles SVM model loading, feature engineering, Model-Lllama auditing, and action item prediction.
 """
 
+import copy
 import json
 import math
 import os
-import pickle
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import spacy
 from sklearn.feature_extraction.text import HashingVectorizer
-from sklearn.linear_model import SGDClassifier
+from sklearn.utils import murmurhash3_32
+
+from core.lexicon import (
+    TAGALOG_COMMAND_PATTERN,
+    looks_like_information_override,
+    looks_like_specific_task,
+)
+from core.model_registry import get_model_registry
+from core.model_store import model_store_path, save_model_store
+from core.model_writer import ModelWriter, atomic_pickle_dump
+from core.sentence_table import SentenceTable
+from core.threshold_sweep import MODE_BALANCED, MODE_HIGH_RECALL, sweep_thresholds
+from core.verdict_cache import DEFAULT_VERDICT_CACHE_PATH, VerdictCache
+from integrations.groq.rate_limits import is_rate_limit_error, recommended_wait_seconds
 
 try:
     from dotenv import load_dotenv
@@ -30,8 +47,27 @@ class ActionItemClassifier:
     """Classifies text as action items or information items using an incremental SVM."""
 
     # Operating mode constants for threshold-based inference
-    MODE_BALANCED = "balanced"
-    MODE_HIGH_RECALL = "high_recall"
+    MODE_BALANCED = MODE_BALANCED
+    MODE_HIGH_RECALL = MODE_HIGH_RECALL
+
+    # Bump these whenever a Model-Lllama prompt changes so stale cached verdicts are ignored.
+    SENTENCE_PROMPT_VERSION = "sentence-v2"
+    SEGMENT_PROMPT_VERSION = "segment-v1"
+    BATCH_PROMPT_VERSION = "batch-v2"
+
+    # Prompt/completion tokens reserved per sentence in a batched verification request.
+    BATCH_VERDICT_TOKENS = 60
+
+    # Batches up to this size are scored by the lean hashing + sparse-dot path (live mode).
+    LEAN_SCORING_MAX_SENTENCES = 8
+    # Token -> hashed column cache used by the lean path.
+    HASH_CACHE_MAX_TOKENS = 200000
+
+    # Sentence splitter backends: full spaCy pipeline, senter-only spaCy, or rule-based sentencizer.
+    SPLITTER_PARSER = "parser"
+    SPLITTER_SENTER = "senter"
+    SPLITTER_RULE = "rule"
+    SPACY_MODEL_NAME = "en_core_web_sm"
 
     def __init__(
         self,
@@ -40,6 +76,19 @@ class ActionItemClassifier:
         confidence_threshold=0.70,
         corrections_csv_path="user_corrections.csv",
         model_llama_name=None,
+        verdict_cache_path=DEFAULT_VERDICT_CACHE_PATH,
+        audit_concurrency=None,
+        audit_retries=3,
+        audit_batch_size=10,
+        audit_batch_token_budget=6000,
+        audit_context_sentences=3,
+        audit_context_token_budget=400,
+        audit_budget=None,
+        audit_budget_fraction=None,
+        sentence_splitter=SPLITTER_SENTER,
+        sentence_n_process=1,
+        sentence_chunk_chars=100000,
+        save_debounce_seconds=2.0,
     ):
         """
         Initialize the classifier.
@@ -50,6 +99,20 @@ class ActionItemClassifier:
             confidence_threshold (float): Student confidence threshold that triggers audit
             corrections_csv_path (str): CSV path for persisted corrections
             model_llama_name (str | None): Groq model used as Model-Lllama
+            verdict_cache_path (str | None): SQLite file for cached Model-Lllama verdicts (None disables)
+            audit_concurrency (int | None): Parallel Model-Lllama requests per transcript audit
+            audit_retries (int): Attempts per Model-Lllama request before giving up on a sentence
+            audit_batch_size (int): Maximum sentences per batched Model-Lllama request (1 disables batching)
+            audit_batch_token_budget (int): Approximate prompt token budget per batched request
+            audit_context_sentences (int): Neighbouring sentences on each side sent as audit context
+            audit_context_token_budget (int): Approximate token cap for one sentence's context window
+            audit_budget (int | None): Maximum sentences audited per transcript (None = no cap)
+            audit_budget_fraction (float | None): Maximum share of transcript sentences audited
+            sentence_splitter (str): "senter" (spaCy sentence recognizer only), "parser" (full
+                spaCy pipeline), or "rule" (rule-based sentencizer, no model download)
+            sentence_n_process (int): Worker processes for ``nlp.pipe`` on long transcripts
+            sentence_chunk_chars (int): Approximate characters per chunk fed to ``nlp.pipe``
+            save_debounce_seconds (float): Quiet period before a background model save is written
         """
         self.model_path = model_path
         self.corrections_csv_path = corrections_csv_path
@@ -58,25 +121,30 @@ class ActionItemClassifier:
             "GROQ_MODEL_LLAMA", "llama-3.1-8b-instant"
         )
         self.model_llama_available = GROQ_AVAILABLE
-        self.nlp = spacy.load("en_core_web_sm")
-        self.information_override_patterns = [
-            r"^thank you(?: so much)?$",
-            r"^thanks(?: everyone| all)?$",
-            r"^appreciate it$",
-            r"^noted$",
-            r"^received(?: with thanks)?$",
-            r"^copy that$",
-            r"^got it$",
-            r"^roger that$",
-            r"^understood$",
-            r"^acknowledged$",
-            r"^good (?:morning|afternoon|evening)(?: everyone)?$",
-            r"^welcome(?: everyone)?$",
-            r"^fyi$",
-            r"^for your information$",
-            r"^no further updates from the team$",
-            r"^nothing else to add$",
-        ]
+        self.verdict_cache = VerdictCache(verdict_cache_path) if verdict_cache_path else None
+        self.audit_concurrency = max(
+            1, int(audit_concurrency or os.getenv("MODEL_LLAMA_CONCURRENCY", "4"))
+        )
+        self.audit_retries = max(1, int(audit_retries))
+        self.audit_batch_size = max(1, int(audit_batch_size))
+        self.audit_batch_token_budget = int(audit_batch_token_budget)
+        self.audit_context_sentences = max(0, int(audit_context_sentences))
+        self.audit_context_token_budget = int(audit_context_token_budget)
+        self.audit_budget = audit_budget
+        self.audit_budget_fraction = audit_budget_fraction
+        self._rate_limit_lock = threading.Lock()
+        self._rate_limit_until = 0.0
+        self.sentence_splitter = sentence_splitter
+        self.sentence_n_process = max(1, int(sentence_n_process))
+        self.sentence_chunk_chars = max(1000, int(sentence_chunk_chars))
+        self._nlp = None
+        self._nlp_lock = threading.Lock()
+        self.model_store_dir = model_store_path(model_path)
+        self.model_writer = ModelWriter(
+            model_path,
+            debounce_seconds=save_debounce_seconds,
+            write_fn=self._write_model_files,
+        )
         self.mode_thresholds = {
             self.MODE_BALANCED: 0.0,
             self.MODE_HIGH_RECALL: -0.12,
@@ -89,27 +157,107 @@ class ActionItemClassifier:
             alternate_sign=False,
         )
 
-        self.clf = self._load_or_init_model()
+        # Weights live in the process-wide registry so the GUI and CLI share one hot-reloadable student.
+        self.model_registry = get_model_registry()
+        self._model_snapshot = None
+        self._hash_state = None
+        self._snapshot()
 
     def _load_dotenv(self):
         """Load environment variables if python-dotenv is available."""
         if load_dotenv is not None:
             load_dotenv()
 
-    def _load_or_init_model(self):
-        """Load existing model or initialize a new one."""
-        if os.path.exists(self.model_path):
-            print(f"[System] Loading existing model from {self.model_path}...")
-            with open(self.model_path, "rb") as handle:
-                return pickle.load(handle)
-
-        print("[System] Initializing new SVM model...")
-        model = SGDClassifier(loss="hinge")
-        X_initial = self.vectorizer.transform(["info", "please do this"])
-        y_initial = [0, 1]
-        model.partial_fit(X_initial, y_initial, classes=[0, 1])
+    def _vectorizer_settings(self):
+        """HashingVectorizer settings recorded alongside the weights."""
+        return {
+            "n_features": int(self.vectorizer.n_features),
+            "ngram_range": list(self.vectorizer.ngram_range),
+            "alternate_sign": bool(self.vectorizer.alternate_sign),
+        }
+
+    def _threshold_settings(self):
+        """Operating thresholds recorded alongside the weights."""
+        return {
+            "mode_thresholds": dict(self.mode_thresholds),
+            "operating_mode": self.operating_mode,
+            "confidence_threshold": float(self.confidence_threshold),
+        }
+
+    def _apply_store_manifest(self, manifest):
+        """Adopt the mode thresholds saved with the weights."""
+        mode_thresholds = ((manifest or {}).get("thresholds") or {}).get("mode_thresholds")
+        if mode_thresholds:
+            self.mode_thresholds.update({mode: float(value) for mode, value in mode_thresholds.items()})
+
+    def _snapshot(self):
+        """
+        Return the registry's current model snapshot, adopting it first if it is new.
+
+        Every prediction reads one snapshot for its whole duration, so a hot reload or a publish
+        after training swaps weights between predictions, never in the middle of one.
+        """
+        snapshot = self.model_registry.get(self.model_path, vectorizer_settings=self._vectorizer_settings())
+        current = self._model_snapshot
+        if snapshot is not current:
+            if current is None or snapshot.manifest is not current.manifest:
+                self._apply_store_manifest(snapshot.manifest)
+            self.vectorizer = snapshot.vectorizer
+            self._model_snapshot = snapshot
+        return snapshot
+
+    @property
+    def clf(self):
+        """Current student model from the shared registry."""
+        return self._snapshot().clf
+
+    def _detached_model_copy(self, clf):
+        """Deep copy of a published model with weights in ordinary (non-mapped) memory."""
+        model = copy.deepcopy(clf)
+        for name in ("coef_", "intercept_"):
+            value = getattr(model, name, None)
+            if isinstance(value, np.memmap):
+                setattr(model, name, np.array(value))
         return model
 
+    def _train_copy_on_write(self, features, labels):
+        """
+        Train a private copy of the current model and publish it as a new snapshot.
+
+        Published models are never modified, so predictions running on other threads keep
+        scoring against their snapshot without taking a lock. The copy, ``partial_fit`` and
+        publish run inside ``ModelRegistry.update``, which orders every writer of this model
+        path (including other classifier instances), so no correction is dropped.
+        """
+
+        def train(clf):
+            model = self._detached_model_copy(clf)
+            model.partial_fit(features, labels, classes=[0, 1])
+            return model
+
+        self.model_registry.update(self.model_path, train, vectorizer_settings=self._vectorizer_settings())
+        self._snapshot()
+
+    def _write_model_files(self, clf):
+        """
+        Persist a model snapshot as the memory-mappable model store plus the pickle.
+
+        Runs under the registry's writer lock. The store is written before the pickle is renamed
+        into place, so the pickle is never newer than the store and no reader mistakes the
+        store for stale halfway through a save.
+        """
+        with self.model_registry.writing(self.model_path):
+            atomic_pickle_dump(
+                clf,
+                self.model_path,
+                before_replace=lambda: save_model_store(
+                    clf,
+                    self.model_store_dir,
+                    vectorizer_settings=self._vectorizer_settings(),
+                    thresholds=self._threshold_settings(),
+                ),
+            )
+
     def _sigmoid(self, value):
         """Numerically stable sigmoid helper."""
         if value >= 0:
@@ -118,13 +266,14 @@ class ActionItemClassifier:
         z = math.exp(value)
         return z / (1 + z)
 
+    def _margins_to_confidence(self, margins):
+        """Vectorized counterpart of ``_sigmoid(abs(margin))`` for an array of margins."""
+        margins = np.asarray(margins, dtype=np.float64).ravel()
+        return 1.0 / (1.0 + np.exp(-np.abs(margins)))
+
     def _decision_to_confidence(self, features):
         """Convert the model margin into a confidence-like score in [0, 1]."""
-        margin = self.clf.decision_function(features)
-        if hasattr(margin, "__len__"):
-            margin_value = float(margin[0])
-        else:
-            margin_value = float(margin)
+        margin_value = float(self._sparse_margins(features)[0])
 
         prediction = 1 if margin_value >= 0 else 0
         confidence = self._sigmoid(abs(margin_value))
@@ -143,6 +292,37 @@ class ActionItemClassifier:
         """Return the active decision threshold for the current operating mode."""
         return float(self.mode_thresholds.get(self.operating_mode, 0.0))
 
+    def tune_mode_thresholds(self, sentences, labels, target_recall=0.95):
+        """
+        Re-tune the operating-mode thresholds on labeled sentences with one threshold sweep.
+
+        The new thresholds apply immediately to every classifier sharing this model path and are
+        recorded in the model store manifest on the next ``save_model``.
+
+        Args:
+            sentences (list[str]): Held-out sentences
+            labels (list[int]): Their 0/1 labels
+            target_recall (float): Recall the high-recall mode must reach
+
+        Returns:
+            ThresholdSweep: Full precision/recall/F1 curve of the current model
+        """
+        sweep = sweep_thresholds(labels, self.decision_scores(sentences))
+        if len(sweep) == 0:
+            print("[Warning] No scored sentences; keeping the current mode thresholds.")
+            return sweep
+        self.mode_thresholds.update(sweep.mode_thresholds(target_recall=target_recall))
+        # Republish the same weights with the new thresholds so other classifiers sharing the
+        # registry adopt them too.
+        thresholds = self._threshold_settings()
+        self.model_registry.update(
+            self.model_path,
+            lambda clf: clf,
+            manifest_fn=lambda manifest: dict(manifest or {}, thresholds=thresholds),
+        )
+        self._snapshot()
+        return sweep
+
     def _normalize_label(self, label_text):
         """Normalize label text into 0/1."""
         if label_text is None:
@@ -177,21 +357,125 @@ class ActionItemClassifier:
         except Exception:
             return None
 
+    @property
+    def nlp(self):
+        """spaCy pipeline used for sentence boundaries, loaded on first use."""
+        if self._nlp is None:
+            with self._nlp_lock:
+                if self._nlp is None:
+                    self._nlp = self._load_sentence_pipeline(self.sentence_splitter)
+        return self._nlp
+
+    def _rule_sentence_pipeline(self):
+        """Blank English pipeline with the rule-based sentencizer (no trained model needed)."""
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        return nlp
+
+    def _load_sentence_pipeline(self, mode):
+        """
+        Build the spaCy pipeline for the requested splitter backend.
+
+        The senter backend excludes the parser, NER, tagger, and lemmatizer and keeps only the
+        statistical sentence recognizer. If the trained model cannot be loaded, the rule-based
+        sentencizer is used instead.
+        """
+        if mode == self.SPLITTER_RULE:
+            return self._rule_sentence_pipeline()
+
+        try:
+            if mode == self.SPLITTER_PARSER:
+                return spacy.load(self.SPACY_MODEL_NAME)
+
+            nlp = spacy.load(
+                self.SPACY_MODEL_NAME,
+                exclude=["parser", "ner", "lemmatizer", "attribute_ruler", "tagger"],
+            )
+            if "senter" in nlp.disabled:
+                nlp.enable_pipe("senter")
+            if "tok2vec" in nlp.pipe_names:
+                listeners = getattr(nlp.get_pipe("tok2vec"), "listening_components", [])
+                if "senter" not in listeners:
+                    nlp.disable_pipe("tok2vec")
+            return nlp
+        except Exception as error:
+            print(f"[System] spaCy model '{self.SPACY_MODEL_NAME}' unavailable ({error}); using rule-based sentence splitter.")
+            return self._rule_sentence_pipeline()
+
+    def _chunk_sentence_spans(self, normalized):
+        """Cut long text into ~``sentence_chunk_chars`` (start, end) chunks at sentence-final punctuation."""
+        if len(normalized) <= self.sentence_chunk_chars:
+            return [(0, len(normalized))]
+
+        chunks = []
+        start = 0
+        while start < len(normalized):
+            end = start + self.sentence_chunk_chars
+            if end >= len(normalized):
+                chunks.append((start, len(normalized)))
+                break
+
+            window = normalized[start:end]
+            cut = max(window.rfind(". "), window.rfind("? "), window.rfind("! "))
+            if cut <= 0:
+                cut = window.rfind(" ")
+            cut = end if cut <= 0 else start + cut + 1
+            chunks.append((start, cut))
+            start = cut
+        return [span for span in (self._strip_span(normalized, a, b) for a, b in chunks) if span[0] < span[1]]
+
+    @staticmethod
+    def _strip_span(text, start, end, chars=None):
+        """Narrow ``(start, end)`` so ``text[start:end]`` equals the old slice stripped of ``chars``."""
+        piece = text[start:end]
+        left = len(piece) - len(piece.lstrip(chars))
+        if left == len(piece):
+            return start, start
+        return start + left, end - (len(piece) - len(piece.rstrip(chars)))
+
     def _split_sentences(self, raw_text):
         """Split transcript into coherent sentence-like units without fragmenting clauses."""
+        return [sentence for sentence, _, _ in self._split_sentence_spans(raw_text)]
+
+    def _split_sentence_spans(self, raw_text):
+        """
+        Split a transcript like ``_split_sentences``, keeping where each sentence was cut from.
+
+        Args:
+            raw_text (str): Transcript text (whitespace is normalized first)
+
+        Returns:
+            list[tuple[str, int, int]]: (sentence, start_char, end_char) in the normalized text;
+                a merged sentence spans all of its parts
+        """
         if not raw_text:
             return []
 
-        normalized = re.sub(r"\s+", " ", str(raw_text)).strip()
+        normalized = SentenceTable.normalize_text(raw_text)
         if not normalized:
             return []
 
-        # Prefer spaCy boundaries; they are safer than raw period splitting.
-        doc = self.nlp(normalized)
-        candidates = [sent.text.strip(" \t\r\n.,;:") for sent in doc.sents if sent.text.strip()]
+        edge_chars = " \t\r\n.,;:"
+
+        # Prefer spaCy boundaries; they are safer than raw period splitting. Long transcripts are
+        # chunked through nlp.pipe so they stay under spaCy's max_length and can use several cores.
+        chunks = self._chunk_sentence_spans(normalized)
+        n_process = self.sentence_n_process if len(chunks) > 1 else 1
+        docs = self.nlp.pipe([normalized[a:b] for a, b in chunks], n_process=n_process, batch_size=4)
+        candidates = [
+            self._strip_span(normalized, chunk_start + sent.start_char, chunk_start + sent.end_char, edge_chars)
+            for (chunk_start, _), doc in zip(chunks, docs)
+            for sent in doc.sents
+            if sent.text.strip()
+        ]
         if not candidates:
-            candidates = [s.strip(" \t\r\n.,;:") for s in re.split(r"[.!?]+", normalized) if s.strip()]
+            candidates = [
+                self._strip_span(normalized, match.start(), match.end(), edge_chars)
+                for match in re.finditer(r"[^.!?]+", normalized)
+                if match.group().strip()
+            ]
 
+        # Each merged sentence keeps its parts as (offset in the merged text, offset in the transcript).
         merged = []
         dangling_starts = (
             "to ",
@@ -208,14 +492,14 @@ class ActionItemClassifier:
             "if ",
         )
 
-        for chunk in candidates:
-            sentence = chunk.strip()
+        for chunk_start, chunk_end in candidates:
+            sentence = normalized[chunk_start:chunk_end]
             if not sentence:
                 continue
 
             lower_sentence = sentence.lower()
             if merged:
-                previous = merged[-1]
+                previous = merged[-1]["text"]
                 previous_lower = previous.lower()
 
                 # Re-attach obvious tails caused by abbreviations/time notation (e.g., "2 p." + "to help...").
@@ -226,10 +510,19 @@ class ActionItemClassifier:
                 very_short_tail = len(sentence.split()) <= 4
 
                 if previous_ends_abbrev or previous_time_stub or looks_dangling or (starts_lower and very_short_tail):
-                    merged[-1] = f"{previous} {sentence}".strip()
+                    merged[-1]["parts"].append((len(previous) + 1, chunk_start))
+                    merged[-1]["text"] = f"{previous} {sentence}"
+                    merged[-1]["end"] = chunk_end
                     continue
 
-            merged.append(sentence)
+            merged.append({"text": sentence, "parts": [(0, chunk_start)], "end": chunk_end})
+
+        def _transcript_offset(unit, offset):
+            # The part containing a merged-text offset maps it back into the transcript.
+            for part_offset, part_start in reversed(unit["parts"]):
+                if offset >= part_offset:
+                    return part_start + offset - part_offset
+            return unit["parts"][0][1]
 
         # Post-process to handle Tagalog/Taglish utterances that may contain
         # multiple imperatives or requests without punctuation (e.g., "Pwede... Tumalon... Pakisara...").
@@ -237,108 +530,63 @@ class ActionItemClassifier:
             if not sentence:
                 return []
 
-            # Common Tagalog polite/request markers and imperative verbs that often begin separate action items
-            markers = [
-                r"\bpwede\b",
-                r"\bpak(i|a)[a-z]*\b",
-                r"\btumalon\b",
-                r"\bsara\b",
-                r"\bbukas\b",
-                r"\btawag\b",
-                r"\bilipat\b",
-                r"\btulong\b",
-                r"\bsubmit\b",
-                r"\bsend\b",
-                r"\bprepare\b",
-            ]
-
-            pattern = re.compile(r"(" + r"|".join(markers) + r")", flags=re.IGNORECASE)
+            # Tagalog/Taglish request markers come precompiled from the shared lexicon;
+            # one scan yields every marker offset.
+            marker_starts = [m.start() for m in TAGALOG_COMMAND_PATTERN.finditer(sentence)]
 
             # If no marker found, return original sentence
-            if not pattern.search(sentence):
-                return [sentence]
+            if not marker_starts:
+                return [(0, len(sentence))]
 
             parts = []
             last_idx = 0
-            for m in pattern.finditer(sentence):
-                start = m.start()
+            for start in marker_starts:
                 # If the marker appears at position 0, don't split before it.
                 if start == 0:
                     continue
 
                 # Capture preceding chunk if it's non-empty and reasonably long
-                chunk = sentence[last_idx:start].strip()
-                if chunk:
+                chunk = self._strip_span(sentence, last_idx, start)
+                if chunk[0] < chunk[1]:
                     parts.append(chunk)
                 last_idx = start
 
-            tail = sentence[last_idx:].strip()
-            if tail:
+            tail = self._strip_span(sentence, last_idx, len(sentence))
+            if tail[0] < tail[1]:
                 parts.append(tail)
 
             # Ensure each returned part is cleaned and long enough
-            cleaned = [p.strip(" ,.;:\n\t") for p in parts if p and len(p.split()) > 1]
-            return cleaned if cleaned else [sentence]
+            cleaned = [self._strip_span(sentence, a, b, " ,.;:\n\t") for a, b in parts]
+            cleaned = [(a, b) for a, b in cleaned if len(sentence[a:b].split()) > 1]
+            return cleaned if cleaned else [(0, len(sentence))]
 
         final = []
-        for s in merged:
-            for piece in _split_tagalog_commands(s):
+        for unit in merged:
+            sentence = unit["text"]
+            for piece_start, piece_end in _split_tagalog_commands(sentence):
+                piece = sentence[piece_start:piece_end]
                 if piece and len(piece) > 5:
-                    final.append(piece)
+                    start = _transcript_offset(unit, piece_start)
+                    end = unit["end"] if piece_end == len(sentence) else _transcript_offset(unit, piece_end - 1) + 1
+                    final.append((piece, start, end))
 
         return final
 
-    def _looks_like_specific_task(self, sentence):
-        """Detect whether a sentence is a concrete assigned task with ownership or timing."""
-        lower = sentence.lower().strip()
-
-        task_markers = [
-            r"\bplease\b",
-            r"\bneed(s)? to\b",
-            r"\bshould\b",
-            r"\bmust\b",
-            r"\bassign(ed|ment)?\b",
-            r"\bwill\b",
-            r"\bcan you\b",
-            r"\bcould you\b",
-            r"\bby\s+(?:tomorrow|today|monday|tuesday|wednesday|thursday|friday|saturday|sunday|\d{1,2}(?:[:.]\d{2})?\s*(?:am|pm)?|end of day|eod|next week|next month)\b",
-            r"\bdeadline\b",
-            r"\bfollow up\b",
-            r"\baction item\b",
-            r"\bowner\b",
-            r"\bresponsible\b",
-            r"\btask\b",
-            r"\bdeliverable\b",
-            r"\bsubmit\b",
-            r"\bsend\b",
-            r"\bprepare\b",
-            r"\breview\b",
-            r"\bcomplete\b",
-            r"\bfinalize\b",
-            r"\bupdate\b",
-            r"\bcoordinate\b",
-        ]
+    def build_sentence_table(self, raw_text):
+        """
+        Split a transcript once into the canonical sentence table shared by every stage.
 
-        ownership_markers = [
-            r"\bfor (?:you|us|him|her|them|the team|the group)\b",
-            r"\bassigned to\b",
-            r"\byou will\b",
-            r"\byou need to\b",
-            r"\blet's\b",
-            r"\bwe need to\b",
-            r"\bthis needs to\b",
-        ]
+        Args:
+            raw_text (str): Full transcript text
 
-        has_task_marker = any(re.search(pattern, lower) for pattern in task_markers)
-        has_owner_marker = any(re.search(pattern, lower) for pattern in ownership_markers)
-        has_deadline = bool(
-            re.search(
-                r"\b(by|before|within|due|until)\b.*\b(tomorrow|today|monday|tuesday|wednesday|thursday|friday|saturday|sunday|\d{1,2}(?:[:.]\d{2})?\s*(?:am|pm)?|eod|end of day|next week|next month)\b",
-                lower,
-            )
-        )
+        Returns:
+            SentenceTable: Sentence ids, character spans, token counts (segments unassigned)
+        """
+        return SentenceTable.from_spans(SentenceTable.normalize_text(raw_text), self._split_sentence_spans(raw_text))
 
-        return has_task_marker or has_owner_marker or has_deadline
+    def _looks_like_specific_task(self, sentence):
+        """Detect whether a sentence is a concrete assigned task with ownership or timing."""
+        return looks_like_specific_task(sentence)
 
     def _format_segment_context(self, segment_context):
         """Serialize segment metadata into a compact context block."""
@@ -366,8 +614,42 @@ class ActionItemClassifier:
 
         return "\n\n".join(line for line in lines if line)
 
+    def _cached_verdict(self, prompt_version, sentence, context):
+        """Look up a cached verdict; returns (cache_key, verdict_or_None)."""
+        if self.verdict_cache is None:
+            return None, None
+
+        key = VerdictCache.make_key(self.model_llama_name, prompt_version, sentence, context)
+        try:
+            return key, self.verdict_cache.get(key)
+        except Exception as e:
+            print(f"[System] Verdict cache lookup failed: {e}")
+            return key, None
+
+    def _store_verdict(self, key, verdict, prompt_version):
+        """Persist a usable verdict; unavailable or unlabeled results are never cached."""
+        if self.verdict_cache is None or key is None or verdict.get("label") is None:
+            return
+
+        try:
+            self.verdict_cache.put(key, verdict, model_name=self.model_llama_name, prompt_version=prompt_version)
+        except Exception as e:
+            print(f"[System] Verdict cache write failed: {e}")
+
+    def get_verdict_cache_stats(self):
+        """Return hit/miss counters for the Model-Lllama verdict cache."""
+        if self.verdict_cache is None:
+            return None
+        return self.verdict_cache.stats()
+
     def _model_llama_verdict(self, sentence, transcript_context, segment_context=None):
         """Ask Groq Llama to verify a single sentence using transcript and segment context."""
+        segment_context_block = self._format_segment_context(segment_context)
+        context_block = f"{transcript_context[:12000]}\n\n{segment_context_block[:6000]}"
+        cache_key, cached = self._cached_verdict(self.SENTENCE_PROMPT_VERSION, sentence, context_block)
+        if cached is not None:
+            return cached
+
         if not self.model_llama_available:
             return {
                 "available": False,
@@ -391,7 +673,7 @@ class ActionItemClassifier:
         client = Groq(api_key=api_key)
         system_prompt = (
             "You are Model-Lllama, the transcript-level verifier in an active learning pipeline. "
-            "Use the full meeting transcript context, not isolated segments, to classify each Taglish sentence. "
+            "Use the surrounding transcript context to classify each Taglish sentence. "
             "If topical segment gists are provided, use them as supporting context for the conversation topic. "
             "Only label action_item when the sentence is a concrete assigned task, request, follow-up, or deliverable that requires completion to move the project forward. "
             "The sentence should usually include ownership, responsibility, a recipient, or a timeframe/deadline. "
@@ -401,8 +683,7 @@ class ActionItemClassifier:
             "Use action_item only for specific assigned tasks, concrete follow-ups, and deadline-bound work. "
             "Use information_item for status updates, explanations, facts, and general discussion."
         )
-        segment_context_block = self._format_segment_context(segment_context)
-        user_prompt = "Full transcript context:\n"
+        user_prompt = "Transcript context:\n"
         user_prompt += f"{transcript_context[:12000]}\n\n"
         if segment_context_block:
             user_prompt += f"Segment context:\n{segment_context_block[:6000]}\n\n"
@@ -440,13 +721,15 @@ class ActionItemClassifier:
                     "raw": content,
                 }
 
-            return {
+            verdict = {
                 "available": True,
                 "label": label,
                 "confidence": None,
                 "reason": content.strip(),
                 "raw": content,
             }
+            self._store_verdict(cache_key, verdict, self.SENTENCE_PROMPT_VERSION)
+            return verdict
 
         label = self._normalize_label(payload.get("label"))
         confidence = payload.get("confidence")
@@ -455,13 +738,474 @@ class ActionItemClassifier:
         except Exception:
             confidence = None
 
-        return {
+        verdict = {
             "available": True,
             "label": label,
             "confidence": confidence,
             "reason": str(payload.get("reason", "")).strip(),
             "raw": payload,
         }
+        self._store_verdict(cache_key, verdict, self.SENTENCE_PROMPT_VERSION)
+        return verdict
+
+    def _wait_for_rate_limit_window(self):
+        """Block until any shared 429 cooldown set by another audit worker has passed."""
+        while True:
+            with self._rate_limit_lock:
+                remaining = self._rate_limit_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 1.0))
+
+    def _with_rate_limit_retries(self, request_fn):
+        """
+        Run a Groq request callable with retries, honoring 429 backoff hints.
+
+        A rate-limit response pauses every concurrent worker, not just the one that hit it.
+        The last error is re-raised once ``audit_retries`` attempts are exhausted.
+        """
+        for attempt in range(1, self.audit_retries + 1):
+            self._wait_for_rate_limit_window()
+            try:
+                return request_fn()
+            except Exception as e:
+                if attempt >= self.audit_retries:
+                    raise
+
+                wait_s = recommended_wait_seconds(e, attempt)
+                if is_rate_limit_error(e):
+                    with self._rate_limit_lock:
+                        self._rate_limit_until = max(self._rate_limit_until, time.monotonic() + wait_s)
+                else:
+                    time.sleep(wait_s)
+
+    def _model_llama_verdict_with_retries(self, sentence, transcript_context, segment_context=None):
+        """Call Model-Lllama for one sentence; exhausted retries keep the student label."""
+        try:
+            return self._with_rate_limit_retries(
+                lambda: self._model_llama_verdict(
+                    sentence,
+                    transcript_context,
+                    segment_context=segment_context,
+                )
+            )
+        except Exception as e:
+            return {
+                "available": False,
+                "label": None,
+                "confidence": None,
+                "reason": f"Model-Lllama failed after {self.audit_retries} attempts: {e}",
+                "raw": None,
+            }
+
+    def _run_bounded(self, request_fn, items, concurrency=None):
+        """Map ``request_fn`` over ``items`` with a bounded thread pool, preserving input order."""
+        if not items:
+            return []
+
+        workers = max(1, min(int(concurrency or self.audit_concurrency), len(items)))
+        if workers == 1:
+            return [request_fn(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(request_fn, items))
+
+    def _model_llama_verdicts_concurrent(self, sentences, transcript_contexts, segment_contexts=None, concurrency=None):
+        """
+        Verify many sentences with one request each, using a bounded thread pool.
+
+        ``transcript_contexts`` and ``segment_contexts`` hold one context value per sentence.
+        Returns verdicts in the same order as ``sentences`` regardless of completion order.
+        """
+        if segment_contexts is None:
+            segment_contexts = [None] * len(sentences)
+
+        return self._run_bounded(
+            lambda item: self._model_llama_verdict_with_retries(*item),
+            list(zip(sentences, transcript_contexts, segment_contexts)),
+            concurrency=concurrency,
+        )
+
+    def _estimate_prompt_tokens(self, text):
+        """Approximate Groq prompt tokens (about four characters per token)."""
+        return max(1, (len(text or "") + 3) // 4)
+
+    def _segment_records(self, segment_context):
+        """Normalize segment metadata dicts or context-rich strings into gist/raw_text records."""
+        if not segment_context:
+            return []
+
+        if isinstance(segment_context, str):
+            gist = re.sub(r"\s+", " ", segment_context).strip()[:300]
+            return [{"segment_id": 1, "gist": gist, "raw_text": "", "sentences": [], "char_count": None}]
+
+        records = []
+        for index, segment in enumerate(segment_context, 1):
+            if isinstance(segment, dict):
+                label = segment.get("topic_label") or f"Topic {segment.get('segment_id', index)}"
+                gist = segment.get("topical_description") or segment.get("gist") or ""
+                records.append(
+                    {
+                        "segment_id": segment.get("segment_id", index),
+                        "gist": f"{label}: {gist}".strip(" :"),
+                        "raw_text": segment.get("raw_text") or segment.get("text") or "",
+                        "sentences": segment.get("sentences") or [],
+                        "char_count": segment.get("char_count"),
+                    }
+                )
+                continue
+
+            # Segmenter context-rich strings: "Topic N: gist\nToken count: ...\nSegment text: ..."
+            text = str(segment)
+            lines = text.splitlines()
+            raw_match = re.search(r"Segment text:\s*(.*)", text, flags=re.DOTALL)
+            records.append(
+                {
+                    "segment_id": index,
+                    "gist": lines[0].strip() if lines else "",
+                    "raw_text": raw_match.group(1).strip() if raw_match else text,
+                    "sentences": [],
+                    "char_count": None,
+                }
+            )
+        return records
+
+    def _locate_sentence_offsets(self, normalized_text, sentences):
+        """Find each sentence's character offset in the whitespace-normalized transcript."""
+        lowered = normalized_text.lower()
+        offsets = []
+        cursor = 0
+        for sentence in sentences:
+            probe = re.sub(r"\s+", " ", sentence).strip().lower()[:40]
+            found = lowered.find(probe, cursor) if probe else -1
+            if found == -1:
+                found = cursor
+            offsets.append(found)
+            cursor = found + max(1, len(probe))
+        return offsets
+
+    def _segment_start_offsets(self, normalized_text, records):
+        """Estimate where each segment starts in the transcript (segments are contiguous and ordered)."""
+        lowered = normalized_text.lower()
+        total_chars = sum(len(record["raw_text"]) for record in records) or 1
+        starts = []
+        cursor = 0
+        consumed = 0
+        for record in records:
+            first_sentence = record["sentences"][0] if record["sentences"] else record["raw_text"]
+            probe = re.sub(r"\s+", " ", str(first_sentence)).strip().lower()[:30]
+            found = lowered.find(probe, cursor) if probe else -1
+            if found == -1:
+                # Segmenter rewrites some punctuation, so fall back to the proportional position.
+                found = max(cursor, int(len(lowered) * consumed / total_chars))
+            starts.append(found)
+            cursor = found
+            consumed += len(record["raw_text"])
+        return starts
+
+    def build_context_windows(self, raw_text, sentences, indices=None, segment_context=None, sentence_table=None):
+        """
+        Build a constant-size audit context for each requested sentence.
+
+        Each window holds up to ``audit_context_sentences`` neighbours on either side (nearest
+        first, trimmed to ``audit_context_token_budget``) plus the gist of the segment containing
+        the sentence, located by character offset. Prompt size therefore does not grow with
+        meeting length, and late sentences get their own local context.
+
+        Args:
+            raw_text (str): Full transcript text
+            sentences (list[str]): Sentences from ``_split_sentences(raw_text)``
+            indices (list[int] | None): Sentence indices to build windows for (default: all)
+            segment_context (list | None): Segment metadata dicts or context-rich strings
+            sentence_table (SentenceTable | None): Canonical table for ``sentences``; its spans
+                and segment ids replace offset probing
+
+        Returns:
+            list[dict]: Windows with keys index, offset, segment_id, segment_gist, before, after
+        """
+        if indices is None:
+            indices = range(len(sentences))
+
+        records = self._segment_records(segment_context)
+        records_by_id = {record["segment_id"]: record for record in records}
+        if sentence_table is not None:
+            offsets = sentence_table.starts.tolist()
+            table_segments = sentence_table.segment_ids.tolist() if sentence_table.has_segments() else None
+        else:
+            offsets = self._locate_sentence_offsets(SentenceTable.normalize_text(raw_text), sentences)
+            table_segments = None
+        if table_segments is None and records:
+            normalized_text = sentence_table.text if sentence_table is not None else SentenceTable.normalize_text(raw_text)
+            segment_starts = self._segment_start_offsets(normalized_text, records)
+        else:
+            segment_starts = []
+
+        windows = []
+        for index in indices:
+            offset = offsets[index] if index < len(offsets) else 0
+            record = None
+            if table_segments is not None and index < len(table_segments):
+                record = records_by_id.get(table_segments[index])
+            else:
+                for start, candidate in zip(segment_starts, records):
+                    if start > offset:
+                        break
+                    record = candidate
+            if record is None and records:
+                record = records[0]
+
+            gist = record["gist"] if record else ""
+            used_tokens = self._estimate_prompt_tokens(sentences[index]) + self._estimate_prompt_tokens(gist)
+            before = []
+            after = []
+            for distance in range(1, self.audit_context_sentences + 1):
+                for neighbour_index, bucket in ((index - distance, before), (index + distance, after)):
+                    if neighbour_index < 0 or neighbour_index >= len(sentences):
+                        continue
+                    cost = self._estimate_prompt_tokens(sentences[neighbour_index])
+                    if used_tokens + cost > self.audit_context_token_budget:
+                        continue
+                    used_tokens += cost
+                    bucket.append((neighbour_index, sentences[neighbour_index]))
+
+            windows.append(
+                {
+                    "index": index,
+                    "offset": offset,
+                    "segment_id": record["segment_id"] if record else None,
+                    "segment_gist": gist,
+                    "before": [text for _, text in sorted(before)],
+                    "after": [text for _, text in sorted(after)],
+                }
+            )
+        return windows
+
+    def _format_context_window(self, window, sentence=None):
+        """Render a context window as prompt text, optionally marking the target sentence."""
+        before = " ".join(window.get("before", []))
+        after = " ".join(window.get("after", []))
+        if sentence is not None:
+            return " ".join(part for part in (before, f">> {sentence} <<", after) if part)
+        return f"Before: {before or '-'} | After: {after or '-'}"
+
+    def _pack_verification_batches(self, sentences, context_tokens):
+        """
+        Group sentence indices into batches that fit the prompt token budget.
+
+        Each batch holds at most ``audit_batch_size`` sentences, and the shared context plus
+        the sentences (with room for their JSON verdicts) stays within ``audit_batch_token_budget``.
+        A single sentence that alone exceeds the budget still gets its own batch.
+        """
+        sentence_budget = max(256, self.audit_batch_token_budget - context_tokens)
+        batches = []
+        current = []
+        current_tokens = 0
+
+        for index, sentence in enumerate(sentences):
+            cost = self._estimate_prompt_tokens(sentence) + self.BATCH_VERDICT_TOKENS
+            if current and (len(current) >= self.audit_batch_size or current_tokens + cost > sentence_budget):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(index)
+            current_tokens += cost
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _extract_json_array(self, text):
+        """Extract a JSON array (or an object wrapping one under "items") from a Groq response."""
+        if not text:
+            return None
+
+        stripped = text.strip()
+        if stripped.startswith("```"):
+            stripped = stripped.strip("`").strip()
+            if stripped.startswith("json"):
+                stripped = stripped[4:].lstrip()
+
+        start = stripped.find("[")
+        end = stripped.rfind("]")
+        if start != -1 and end > start:
+            try:
+                payload = json.loads(stripped[start : end + 1])
+                if isinstance(payload, list):
+                    return payload
+            except Exception:
+                pass
+
+        payload = self._extract_json_object(stripped)
+        if isinstance(payload, dict) and isinstance(payload.get("items"), list):
+            return payload["items"]
+        return None
+
+    def _model_llama_batch_verdict(self, sentences, context_block, sentence_contexts=None):
+        """
+        Ask Groq Llama to verify several sentences in one request sharing one context block.
+
+        ``sentence_contexts`` optionally attaches a short local window to each numbered sentence.
+
+        Returns one verdict dict per sentence, in input order. Sentences the model skipped come
+        back with ``label`` None so the caller can fall back to a single-sentence audit.
+        """
+        if not self.model_llama_available:
+            return [
+                {"available": False, "label": None, "confidence": None, "reason": "Groq Model-Lllama is unavailable.", "raw": None}
+                for _ in sentences
+            ]
+
+        self._load_dotenv()
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            return [
+                {"available": False, "label": None, "confidence": None, "reason": "GROQ_API_KEY not found.", "raw": None}
+                for _ in sentences
+            ]
+
+        client = Groq(api_key=api_key)
+        system_prompt = (
+            "You are Model-Lllama, the transcript-level verifier in an active learning pipeline. "
+            "Use the shared meeting context and each sentence's nearby lines to classify each numbered Taglish sentence independently. "
+            "If topical segment gists are provided, use them as supporting context for the conversation topic. "
+            "Only label action_item when the sentence is a concrete assigned task, request, follow-up, or deliverable that requires completion to move the project forward. "
+            "The sentence should usually include ownership, responsibility, a recipient, or a timeframe/deadline. "
+            "Do not label generic action words, verbs, or vague mentions of activity as action_item. "
+            "Examples that are NOT action_item: 'We discussed the plan', 'We will improve the process', 'They talked about sending updates later'. "
+            "Use information_item for status updates, explanations, facts, and general discussion. "
+            "Return a strict JSON array only, with one object per sentence and keys id, label, confidence, and reason."
+        )
+        numbered_lines = []
+        for index, sentence in enumerate(sentences, 1):
+            numbered_lines.append(f"[{index}] {sentence}")
+            if sentence_contexts and sentence_contexts[index - 1]:
+                numbered_lines.append(f"    Nearby: {sentence_contexts[index - 1]}")
+        numbered = "\n".join(numbered_lines)
+        user_prompt = (
+            f"{context_block}\n\n"
+            f"Sentences to verify:\n{numbered}\n\n"
+            'Return a JSON array only, for example: [{"id":1,"label":"action_item","confidence":0.93,"reason":"..."}]'
+        )
+
+        result = client.chat.completions.create(
+            model=self.model_llama_name,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0,
+            max_completion_tokens=min(4000, 100 + self.BATCH_VERDICT_TOKENS * len(sentences)),
+        )
+
+        content = result.choices[0].message.content if result.choices else ""
+        items = self._extract_json_array(content) or []
+
+        by_id = {}
+        for position, item in enumerate(items, 1):
+            if not isinstance(item, dict):
+                continue
+            try:
+                item_id = int(item.get("id", position))
+            except Exception:
+                item_id = position
+            by_id.setdefault(item_id, item)
+
+        verdicts = []
+        for index in range(1, len(sentences) + 1):
+            item = by_id.get(index)
+            if item is None:
+                verdicts.append(
+                    {"available": True, "label": None, "confidence": None, "reason": "Missing from batch response.", "raw": None}
+                )
+                continue
+
+            confidence = item.get("confidence")
+            try:
+                confidence = float(confidence) if confidence is not None else None
+            except Exception:
+                confidence = None
+
+            verdicts.append(
+                {
+                    "available": True,
+                    "label": self._normalize_label(item.get("label")),
+                    "confidence": confidence,
+                    "reason": str(item.get("reason", "")).strip(),
+                    "raw": item,
+                }
+            )
+        return verdicts
+
+    def verify_sentences_batched(self, sentences, context_blocks, concurrency=None, sentence_contexts=None):
+        """
+        Verify sentences with multi-sentence Model-Lllama requests.
+
+        Sentences sharing a context block are packed into token-budgeted batches so the context
+        is sent once per batch instead of once per sentence. Batches run concurrently with the
+        same rate-limit handling as single-sentence audits; cached verdicts are reused.
+
+        Args:
+            sentences (list[str]): Sentences to verify
+            context_blocks (list[str] | str): Shared context per sentence, or one block for all
+            concurrency (int | None): Maximum batch requests in flight
+            sentence_contexts (list[str] | None): Optional local context attached to each sentence
+
+        Returns:
+            list[dict]: One verdict per sentence, in input order
+        """
+        if isinstance(context_blocks, str):
+            context_blocks = [context_blocks] * len(sentences)
+        if sentence_contexts is None:
+            sentence_contexts = [""] * len(sentences)
+
+        verdicts = [None] * len(sentences)
+        cache_keys = [None] * len(sentences)
+        pending_by_context = {}
+
+        for index, (sentence, context_block) in enumerate(zip(sentences, context_blocks)):
+            cache_keys[index], cached = self._cached_verdict(
+                self.BATCH_PROMPT_VERSION,
+                sentence,
+                f"{context_block}\n{sentence_contexts[index]}",
+            )
+            if cached is not None:
+                verdicts[index] = cached
+            else:
+                pending_by_context.setdefault(context_block, []).append(index)
+
+        jobs = []
+        for context_block, indices in pending_by_context.items():
+            context_tokens = self._estimate_prompt_tokens(context_block)
+            item_texts = [f"{sentences[i]} {sentence_contexts[i]}" for i in indices]
+            for batch in self._pack_verification_batches(item_texts, context_tokens):
+                jobs.append((context_block, [indices[position] for position in batch]))
+
+        def run_job(job):
+            context_block, indices = job
+            batch_sentences = [sentences[i] for i in indices]
+            batch_contexts = [sentence_contexts[i] for i in indices]
+            try:
+                return self._with_rate_limit_retries(
+                    lambda: self._model_llama_batch_verdict(batch_sentences, context_block, batch_contexts)
+                )
+            except Exception as e:
+                return [
+                    {
+                        "available": False,
+                        "label": None,
+                        "confidence": None,
+                        "reason": f"Model-Lllama batch failed after {self.audit_retries} attempts: {e}",
+                        "raw": None,
+                    }
+                    for _ in indices
+                ]
+
+        for (_, indices), batch_verdicts in zip(jobs, self._run_bounded(run_job, jobs, concurrency=concurrency)):
+            for index, verdict in zip(indices, batch_verdicts):
+                verdicts[index] = verdict
+                self._store_verdict(cache_keys[index], verdict, self.BATCH_PROMPT_VERSION)
+
+        return verdicts
 
     def _enforce_action_item_specificity(self, sentence, model_llama_label, model_llama_reason):
         """
@@ -501,79 +1245,306 @@ class ActionItemClassifier:
 
     def _teach_student(self, sentence, correct_label):
         """Incrementally train the student model on one confirmed label."""
-        features = self.get_features(sentence)
-        self.clf.partial_fit(features, [int(correct_label)], classes=[0, 1])
+        self._teach_student_batch([sentence], [correct_label])
 
-    def save_model(self):
-        """Save the current model to disk."""
-        with open(self.model_path, "wb") as handle:
-            pickle.dump(self.clf, handle)
-        print(f"[System] Model saved to {self.model_path}")
+    def _teach_student_batch(self, sentences, correct_labels):
+        """Train the student on many confirmed labels with one transform and one partial_fit."""
+        if not sentences:
+            return
+        features = self.get_batch_features(sentences)
+        labels = np.asarray(correct_labels, dtype=int)
+        self._train_copy_on_write(features, labels)
+
+    def save_model(self, wait=False):
+        """
+        Save the current model to disk through the background writer.
+
+        A snapshot of the model is handed to ``model_writer``, which debounces rapid saves and
+        writes through a temp file plus atomic rename, so callers never block on disk I/O.
+        Published models are immutable, so the current one is handed over without copying.
+
+        Args:
+            wait (bool): Block until the snapshot is written (used by CLI training runs)
+        """
+        snapshot = self.clf
+        if isinstance(getattr(snapshot, "coef_", None), np.memmap):
+            # Detach weights mapped from the model store before pickling/rewriting them.
+            snapshot = self._detached_model_copy(snapshot)
+        self.model_writer.submit(snapshot)
+        if wait:
+            self.model_writer.flush()
+
+    def flush_model_writes(self, timeout=None):
+        """Block until any pending background model save is on disk."""
+        return self.model_writer.flush(timeout=timeout)
 
     def get_features(self, sentence):
         """Return the vectorized representation of a sentence."""
         return self.vectorizer.transform([sentence])
 
+    def get_batch_features(self, sentences):
+        """Return the vectorized representation of many sentences in one transform call."""
+        return self.vectorizer.transform(list(sentences))
+
     def _looks_like_information_override(self, sentence):
         """Force common acknowledgements and courtesy phrases into the information class."""
-        normalized = re.sub(r"\s+", " ", str(sentence or "")).strip().lower().rstrip(".?!,")
-        if not normalized:
-            return False
+        return looks_like_information_override(sentence)
 
-        if self._looks_like_specific_task(normalized):
-            return False
+    def _hashing_state(self, vectorizer):
+        """
+        Analyzer, token-column cache, and lean-path support flag for one vectorizer.
 
-        if len(normalized.split()) > 12:
-            return False
+        Rebuilt only when a reloaded snapshot brings a different vectorizer.
+        """
+        state = self._hash_state
+        if state is None or state[0] is not vectorizer:
+            # The lean hasher reproduces HashingVectorizer only for non-negative, non-binary counts.
+            lean_supported = (
+                not vectorizer.alternate_sign and not vectorizer.binary and vectorizer.norm in ("l2", "l1", None)
+            )
+            state = (vectorizer, vectorizer.build_analyzer(), {}, lean_supported)
+            self._hash_state = state
+        return state
 
-        return any(re.fullmatch(pattern, normalized) for pattern in self.information_override_patterns)
+    def _hash_sentence(self, sentence, vectorizer=None):
+        """
+        Hash one sentence into CSR-style (indices, data), matching ``HashingVectorizer.transform``.
 
-    def predict_with_confidence(self, sentence):
-        """Return the student prediction, confidence, and raw score."""
-        if self._looks_like_information_override(sentence):
-            return {
-                "label": 0,
-                "confidence": 1.0,
-                "score": -1.0,
-                "threshold": float(self.get_operating_threshold()),
+        Tokens come from the vectorizer's own analyzer and are hashed with MurmurHash3 exactly as
+        FeatureHasher does; columns are memoized per token so repeated vocabulary skips hashing.
+        """
+        vectorizer = vectorizer or self.vectorizer
+        _, analyzer, columns, _ = self._hashing_state(vectorizer)
+        n_features = vectorizer.n_features
+        indices = []
+        for token in analyzer(sentence):
+            column = columns.get(token)
+            if column is None:
+                hashed = murmurhash3_32(token, seed=0)
+                if hashed == -2147483648:
+                    column = (2147483647 - (n_features - 1)) % n_features
+                else:
+                    column = abs(hashed) % n_features
+                if len(columns) >= self.HASH_CACHE_MAX_TOKENS:
+                    columns.clear()
+                columns[token] = column
+            indices.append(column)
+
+        if not indices:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        indices, counts = np.unique(np.asarray(indices, dtype=np.int64), return_counts=True)
+        data = counts.astype(np.float64)
+        norm = vectorizer.norm
+        if norm == "l2":
+            data /= np.sqrt(np.dot(data, data))
+        elif norm == "l1":
+            data /= data.sum()
+        return indices, data
+
+    def _sparse_margins(self, features, snapshot=None):
+        """Decision margins for a CSR matrix: per-row dot of ``data`` with gathered ``coef_`` + intercept."""
+        snapshot = snapshot or self._snapshot()
+        features = features.tocsr()
+        products = features.data * snapshot.coef_row[features.indices]
+        row_ids = np.repeat(np.arange(features.shape[0]), np.diff(features.indptr))
+        return np.bincount(row_ids, weights=products, minlength=features.shape[0]) + snapshot.intercept
+
+    def decision_scores(self, sentences):
+        """
+        Raw decision margins for sentences without calling sklearn's ``decision_function``.
+
+        Small batches (live-mode utterances) are hashed in-process and scored with a NumPy dot
+        against the contiguous ``coef_`` row; larger batches use one vectorizer transform and a
+        sparse row-wise dot. Both match ``clf.decision_function`` to floating-point tolerance.
+        All rows are scored against the same registry snapshot.
+
+        Args:
+            sentences (list[str]): Sentences to score
+
+        Returns:
+            np.ndarray: One margin per sentence
+        """
+        sentences = list(sentences)
+        snapshot = self._snapshot()
+        vectorizer = snapshot.vectorizer
+        lean_supported = self._hashing_state(vectorizer)[3]
+        if lean_supported and len(sentences) <= self.LEAN_SCORING_MAX_SENTENCES:
+            margins = np.empty(len(sentences), dtype=np.float64)
+            for row, sentence in enumerate(sentences):
+                indices, data = self._hash_sentence(sentence, vectorizer)
+                margins[row] = np.dot(data, snapshot.coef_row[indices]) + snapshot.intercept
+            return margins
+        return self._sparse_margins(vectorizer.transform(sentences), snapshot)
+
+    def predict_many(self, sentences):
+        """
+        Score a list of sentences in one pass through the sparse-dot engine (``decision_scores``).
+
+        Args:
+            sentences (list[str]): Sentences to score
+
+        Returns:
+            list[dict]: One prediction dict per sentence, in input order, with the same keys
+            as ``predict_with_confidence``
+        """
+        sentences = [str(sentence or "") for sentence in sentences]
+        if not sentences:
+            return []
+
+        threshold = float(self.get_operating_threshold())
+        override_mask = np.fromiter(
+            (self._looks_like_information_override(sentence) for sentence in sentences),
+            dtype=bool,
+            count=len(sentences),
+        )
+
+        scores = np.full(len(sentences), -1.0, dtype=np.float64)
+        confidences = np.ones(len(sentences), dtype=np.float64)
+
+        scored_rows = np.flatnonzero(~override_mask)
+        if scored_rows.size:
+            margins = self.decision_scores([sentences[row] for row in scored_rows])
+            scores[scored_rows] = margins
+            confidences[scored_rows] = self._margins_to_confidence(margins)
+
+        labels = np.where(override_mask, 0, (scores >= threshold).astype(int))
+
+        return [
+            {
+                "label": int(label),
+                "confidence": float(confidence),
+                "score": float(score),
+                "threshold": threshold,
                 "operating_mode": self.operating_mode,
             }
+            for label, confidence, score in zip(labels, confidences, scores)
+        ]
 
-        features = self.get_features(sentence)
-        _, confidence, raw_score = self._decision_to_confidence(features)
-        threshold = self.get_operating_threshold()
-        prediction = 1 if raw_score >= threshold else 0
-        return {
-            "label": int(prediction),
-            "confidence": float(confidence),
-            "score": float(raw_score),
-            "threshold": float(threshold),
-            "operating_mode": self.operating_mode,
-        }
+    def predict_with_confidence(self, sentence):
+        """Return the student prediction, confidence, and raw score."""
+        return self.predict_many([sentence])[0]
 
     def predict(self, sentence):
         """Predict whether a sentence is an action item or information."""
         return self.predict_with_confidence(sentence)["label"]
 
-    def audit_sentence(self, sentence, transcript_context, persist=False, segment_context=None):
+    def select_audit_indices(self, student_predictions, audit_budget=None, audit_budget_fraction=None):
+        """
+        Rank low-confidence sentences by uncertainty and keep only what the audit budget allows.
+
+        Candidates are sentences below ``confidence_threshold``. They are ordered by absolute
+        margin between ``student_score`` and ``get_operating_threshold()`` (closest to the
+        decision boundary first), then capped by ``audit_budget`` sentences and/or
+        ``audit_budget_fraction`` of all transcript sentences, whichever is smaller.
+
+        Args:
+            student_predictions (list[dict]): Output of ``predict_many``
+            audit_budget (int | None): Override for the instance ``audit_budget``
+            audit_budget_fraction (float | None): Override for the instance ``audit_budget_fraction``
+
+        Returns:
+            tuple[list[int], list[int]]: (indices to audit, indices skipped for budget), each in
+            transcript order
+        """
+        budget = self.audit_budget if audit_budget is None else audit_budget
+        fraction = self.audit_budget_fraction if audit_budget_fraction is None else audit_budget_fraction
+
+        candidates = np.array(
+            [
+                index
+                for index, student in enumerate(student_predictions)
+                if student["confidence"] < self.confidence_threshold
+            ],
+            dtype=int,
+        )
+        if candidates.size == 0:
+            return [], []
+
+        limit = candidates.size
+        if budget is not None:
+            limit = min(limit, max(0, int(budget)))
+        if fraction is not None:
+            limit = min(limit, int(math.ceil(max(0.0, float(fraction)) * len(student_predictions))))
+
+        if limit >= candidates.size:
+            return candidates.tolist(), []
+
+        scores = np.array([student_predictions[index]["score"] for index in candidates], dtype=np.float64)
+        margins = np.abs(scores - self.get_operating_threshold())
+        # Stable sort keeps transcript order among equally uncertain sentences.
+        ranked = candidates[np.argsort(margins, kind="stable")]
+        selected = np.sort(ranked[:limit])
+        skipped = np.sort(ranked[limit:])
+        return selected.tolist(), skipped.tolist()
+
+    def _bounded_audit_context(self, sentence, transcript_context=None, raw_text=None):
+        """
+        Return an audit context for one sentence that fits ``audit_context_token_budget``.
+
+        A context already within the budget (e.g. a rendered ``build_context_windows`` window) is
+        used as given. Otherwise the sentence's window is built from ``raw_text`` (or from the
+        oversized context, treated as the transcript); a sentence not found in it is sent alone.
+        """
+        if transcript_context and self._estimate_prompt_tokens(transcript_context) <= self.audit_context_token_budget:
+            return transcript_context
+
+        source = raw_text or transcript_context
+        if not source:
+            return self._format_context_window({}, sentence)
+
+        sentence_table = self.build_sentence_table(source)
+        sentences = sentence_table.sentences
+        target = str(sentence).strip()
+        index = next((i for i, candidate in enumerate(sentences) if candidate.strip() == target), None)
+        if index is None:
+            index = next((i for i, candidate in enumerate(sentences) if target and target in candidate), None)
+        if index is None:
+            return self._format_context_window({}, sentence)
+
+        window = self.build_context_windows(source, sentences, [index], sentence_table=sentence_table)[0]
+        return self._format_context_window(window, sentence)
+
+    def audit_sentence(
+        self,
+        sentence,
+        transcript_context=None,
+        persist=False,
+        segment_context=None,
+        student=None,
+        model_llama=None,
+        budget_skipped=False,
+        raw_text=None,
+    ):
         """
-        Audit a single sentence against Model-Lllama using the full transcript context.
+        Audit a single sentence against Model-Lllama using its local context window.
+
+        Callers should pass a rendered ``build_context_windows`` window as ``transcript_context``
+        (``audit_transcription`` does). When none is given, or the context exceeds
+        ``audit_context_token_budget``, the window is built here from ``raw_text`` (or the oversized
+        context), so the prompt stays bounded whatever the transcript length.
 
         The student triggers audit when the confidence is low or when it predicts action_item.
+        A precomputed ``student`` prediction (from ``predict_many``) skips re-scoring the sentence,
+        and a precomputed ``model_llama`` verdict skips the Groq request. ``budget_skipped`` keeps
+        the student label for a low-confidence sentence that fell outside the audit budget.
         """
-        student = self.predict_with_confidence(sentence)
-        needs_audit = student["confidence"] < self.confidence_threshold
+        if student is None:
+            student = self.predict_with_confidence(sentence)
+        needs_audit = student["confidence"] < self.confidence_threshold and not budget_skipped
 
-        model_llama = None
         final_label = student["label"]
         label_source = "student"
+        if not needs_audit:
+            model_llama = None
 
         if needs_audit:
-            model_llama = self._model_llama_verdict(
-                sentence,
-                transcript_context,
-                segment_context=segment_context,
-            )
+            if model_llama is None:
+                model_llama = self._model_llama_verdict_with_retries(
+                    sentence,
+                    self._bounded_audit_context(sentence, transcript_context, raw_text),
+                    segment_context=segment_context,
+                )
             if model_llama.get("available") and model_llama.get("label") is not None:
                 final_label = self._enforce_action_item_specificity(
                     sentence,
@@ -595,6 +1566,7 @@ class ActionItemClassifier:
             "student_confidence": float(student["confidence"]),
             "student_score": float(student["score"]),
             "audited": bool(needs_audit),
+            "budget_skipped": bool(budget_skipped),
             "model_llama": model_llama,
             "model_llama_label": model_llama.get("label") if model_llama else None,
             "final_label": int(final_label),
@@ -607,24 +1579,94 @@ class ActionItemClassifier:
 
         return result
 
-    def audit_transcript(self, raw_text, persist=False, segment_context=None):
+    def audit_transcript(
+        self,
+        raw_text,
+        persist=False,
+        segment_context=None,
+        concurrency=None,
+        audit_budget=None,
+        audit_budget_fraction=None,
+        sentence_table=None,
+    ):
         """
-        Audit a whole transcription using the full context for every sentence.
+        Audit a whole transcription, giving every uncertain sentence its local context window.
+
+        Each audited sentence is sent with its neighbouring sentences and the gist of its segment
+        (see ``build_context_windows``) rather than the whole transcript. Low-confidence sentences
+        are packed into batched Model-Lllama requests grouped by segment gist (``audit_batch_size``
+        of 1 restores one request per sentence). Requests run concurrently (up to ``concurrency``
+        in flight, default ``audit_concurrency``); results are assembled in transcript order so the
+        report, corrections, and action items are deterministic. With an audit budget only the
+        most uncertain sentences are verified (see ``select_audit_indices``). Pass the transcript's
+        ``sentence_table`` (from ``build_sentence_table``) to reuse its split instead of re-running spaCy.
 
         Returns a transcript-level report and a correction queue that can be applied once.
         """
-        sentences = self._split_sentences(raw_text)
+        if sentence_table is None:
+            sentence_table = self.build_sentence_table(raw_text)
+        sentences = sentence_table.sentences
         evaluations = []
         corrections = []
         action_items = []
         segment_context_block = self._format_segment_context(segment_context)
+        student_predictions = self.predict_many(sentences)
 
-        for sentence in sentences:
+        audit_indices, skipped_indices = self.select_audit_indices(
+            student_predictions,
+            audit_budget=audit_budget,
+            audit_budget_fraction=audit_budget_fraction,
+        )
+        skipped_set = set(skipped_indices)
+        audit_sentences = [sentences[index] for index in audit_indices]
+        windows = self.build_context_windows(
+            raw_text, sentences, audit_indices, segment_context, sentence_table=sentence_table
+        )
+        local_contexts = [
+            self._format_context_window(window, sentence)
+            for window, sentence in zip(windows, audit_sentences)
+        ]
+        segment_gists = [window["segment_gist"] for window in windows]
+
+        if self.audit_batch_size > 1:
+            verdicts = self.verify_sentences_batched(
+                audit_sentences,
+                [f"Segment gist: {gist}" if gist else "Segment gist: -" for gist in segment_gists],
+                concurrency=concurrency,
+                sentence_contexts=[self._format_context_window(window) for window in windows],
+            )
+            # Sentences the batch response skipped fall back to one request each.
+            missing = [
+                position
+                for position, verdict in enumerate(verdicts)
+                if verdict.get("available") and verdict.get("label") is None
+            ]
+            fallback = self._model_llama_verdicts_concurrent(
+                [audit_sentences[position] for position in missing],
+                [local_contexts[position] for position in missing],
+                [segment_gists[position] for position in missing],
+                concurrency=concurrency,
+            )
+            for position, verdict in zip(missing, fallback):
+                verdicts[position] = verdict
+        else:
+            verdicts = self._model_llama_verdicts_concurrent(
+                audit_sentences,
+                local_contexts,
+                segment_gists,
+                concurrency=concurrency,
+            )
+        verdicts_by_index = dict(zip(audit_indices, verdicts))
+
+        for index, (sentence, student) in enumerate(zip(sentences, student_predictions)):
             result = self.audit_sentence(
                 sentence,
-                transcript_context=raw_text,
+                raw_text=raw_text,
                 segment_context=segment_context_block,
                 persist=False,
+                student=student,
+                model_llama=verdicts_by_index.get(index),
+                budget_skipped=index in skipped_set,
             )
             evaluations.append(result)
 
@@ -642,11 +1684,15 @@ class ActionItemClassifier:
             if result["model_llama_label"] is not None:
                 print(f"    -> Model label: {result['model_llama_label']}")
 
+        if skipped_indices:
+            print(f"[Model] Audit budget skipped {len(skipped_indices)} low-confidence sentences.")
+
         return {
             "transcript": raw_text,
             "sentences": evaluations,
             "corrections": corrections,
             "action_items": action_items,
+            "budget_skipped": [sentences[index] for index in skipped_indices],
         }
 
     def _audit_segment(self, segment_text, segment_label):
@@ -655,6 +1701,10 @@ class ActionItemClassifier:
 
         This is the fast path: one Llama call per segment instead of one per sentence.
         """
+        cache_key, cached = self._cached_verdict(self.SEGMENT_PROMPT_VERSION, segment_label, segment_text[:12000])
+        if cached is not None:
+            return cached
+
         if not self.model_llama_available:
             return {"label": None, "confidence": None, "reason": "Groq unavailable"}
 
@@ -692,7 +1742,9 @@ class ActionItemClassifier:
             if payload is None:
                 lowered = content.lower()
                 label = 1 if "action_item" in lowered else 0
-                return {"label": label, "confidence": None, "reason": content.strip()}
+                verdict = {"label": label, "confidence": None, "reason": content.strip()}
+                self._store_verdict(cache_key, verdict, self.SEGMENT_PROMPT_VERSION)
+                return verdict
 
             label = self._normalize_label(payload.get("label"))
             confidence = payload.get("confidence")
@@ -701,50 +1753,111 @@ class ActionItemClassifier:
             except Exception:
                 confidence = None
 
-            return {
+            verdict = {
                 "label": label,
                 "confidence": confidence,
                 "reason": str(payload.get("reason", "")).strip(),
             }
+            self._store_verdict(cache_key, verdict, self.SEGMENT_PROMPT_VERSION)
+            return verdict
         except Exception as e:
             return {"label": None, "confidence": None, "reason": str(e)}
 
-    def audit_segments_batch(self, raw_text, segment_metadata, persist=False):
+    def audit_segments_batch(
+        self,
+        raw_text,
+        segment_metadata,
+        persist=False,
+        concurrency=None,
+        audit_budget=None,
+        audit_budget_fraction=None,
+        sentence_table=None,
+    ):
         """
         Fast segment-level audit that still respects the student confidence threshold.
 
-        One Groq call is made per segment. Sentences are still scored individually by the
-        student model, and Llama only overrides the student when confidence is below threshold.
+        Sentences are scored individually by the student model. Low-confidence sentences of each
+        segment are verified together in batched Model-Lllama requests that share the segment
+        topic, each carrying its own neighbouring sentences; Llama only overrides the student when
+        confidence is below threshold. If a batch response omits a sentence, the
+        one-call-per-segment verdict is used instead.
+
+        Segment membership comes from the canonical ``sentence_table``: when the segmenter already
+        filled in segment ids they are used as-is, otherwise each sentence is placed by interval
+        lookup on the segments' character start offsets.
         """
-        if not segment_metadata:
-            return self.audit_transcript(raw_text, persist=persist)
+        if sentence_table is None:
+            sentence_table = self.build_sentence_table(raw_text)
 
-        sentences = self._split_sentences(raw_text)
-        sentence_segments = {}
-        segment_labels = {}
+        if not segment_metadata:
+            return self.audit_transcript(
+                raw_text,
+                persist=persist,
+                concurrency=concurrency,
+                audit_budget=audit_budget,
+                audit_budget_fraction=audit_budget_fraction,
+                sentence_table=sentence_table,
+            )
 
-        for segment in segment_metadata:
-            segment_id = segment.get("segment_id")
-            segment_text = segment.get("raw_text", "")
-            segment_description = segment.get("topical_description", "")
-            segment_label = segment.get("topic_label", f"Topic {segment_id}")
+        sentences = sentence_table.sentences
+        segment_ids = [segment.get("segment_id", index) for index, segment in enumerate(segment_metadata, 1)]
+        segments_by_id = dict(zip(segment_ids, segment_metadata))
 
-            segment_audit = self._audit_segment(segment_text, f"{segment_label}: {segment_description}")
-            segment_labels[segment_id] = segment_audit
+        if not sentence_table.has_segments():
+            if all("start_char" in segment for segment in segment_metadata):
+                segment_starts = [segment["start_char"] for segment in segment_metadata]
+            else:
+                segment_starts = self._segment_start_offsets(
+                    sentence_table.text, self._segment_records(segment_metadata)
+                )
+            sentence_table.assign_segment_spans(
+                list(zip(segment_ids, segment_starts))
+            )
 
-            for sentence in self._split_sentences(segment_text):
-                sentence_segments[sentence.lower()[:60]] = segment_id
+        def segment_topic(segment_id):
+            segment = segments_by_id.get(segment_id, {})
+            segment_label = segment.get("topic_label", f"Topic {segment_id}")
+            return f"{segment_label}: {segment.get('topical_description', '')}"
 
         evaluations = []
         corrections = []
         action_items = []
 
-        for sentence in sentences:
-            student = self.predict_with_confidence(sentence)
-            needs_audit = student["confidence"] < self.confidence_threshold
+        student_predictions = self.predict_many(sentences)
+        sentence_segment_ids = sentence_table.segment_ids.tolist()
+        audit_indices, skipped_indices = self.select_audit_indices(
+            student_predictions,
+            audit_budget=audit_budget,
+            audit_budget_fraction=audit_budget_fraction,
+        )
+        skipped_set = set(skipped_indices)
 
-            segment_id = sentence_segments.get(sentence.lower()[:60], 1)
-            segment_audit = segment_labels.get(segment_id, {})
+        windows = self.build_context_windows(
+            raw_text, sentences, audit_indices, segment_metadata, sentence_table=sentence_table
+        )
+        verdicts = self.verify_sentences_batched(
+            [sentences[index] for index in audit_indices],
+            [f"Segment topic: {segment_topic(sentence_segment_ids[index])}" for index in audit_indices],
+            concurrency=concurrency,
+            sentence_contexts=[self._format_context_window(window) for window in windows],
+        )
+        verdicts_by_index = dict(zip(audit_indices, verdicts))
+
+        segment_labels = {}
+        for index, verdict in verdicts_by_index.items():
+            segment_id = sentence_segment_ids[index]
+            if verdict.get("label") is None and segment_id not in segment_labels:
+                segment = segments_by_id.get(segment_id, {})
+                segment_labels[segment_id] = self._audit_segment(segment.get("raw_text", ""), segment_topic(segment_id))
+
+        for index, (sentence, student) in enumerate(zip(sentences, student_predictions)):
+            budget_skipped = index in skipped_set
+            needs_audit = student["confidence"] < self.confidence_threshold and not budget_skipped
+            segment_id = sentence_segment_ids[index]
+
+            segment_audit = verdicts_by_index.get(index) or {}
+            if segment_audit.get("label") is None:
+                segment_audit = segment_labels.get(segment_id, {})
 
             model_llama = None
             final_label = student["label"]
@@ -772,6 +1885,7 @@ class ActionItemClassifier:
                 "student_confidence": float(student["confidence"]),
                 "student_score": float(student["score"]),
                 "audited": bool(needs_audit),
+                "budget_skipped": bool(budget_skipped),
                 "segment_id": segment_id,
                 "model_llama": model_llama,
                 "model_llama_label": model_llama.get("label") if model_llama else None,
@@ -794,6 +1908,9 @@ class ActionItemClassifier:
             if model_llama is not None:
                 print(f"    -> Segment Llama label: {model_llama.get('label')}")
 
+        if skipped_indices:
+            print(f"[Model] Audit budget skipped {len(skipped_indices)} low-confidence sentences.")
+
         if persist and corrections:
             self.apply_batch_corrections(corrections, persist_csv=True, persist_model=True)
 
@@ -802,23 +1919,27 @@ class ActionItemClassifier:
             "sentences": evaluations,
             "corrections": corrections,
             "action_items": action_items,
+            "budget_skipped": [sentences[index] for index in skipped_indices],
         }
 
     def apply_batch_corrections(self, corrections, persist_csv=True, persist_model=True):
         """
         Teach the student model using a batch of confirmed corrections.
 
-        This is the only write path used after the single end-of-run confirmation.
+        This is the only write path used after the single end-of-run confirmation. The CSV append
+        and the model save both run on ``model_writer``'s thread, so the caller never waits on disk.
         """
         if not corrections:
             return
 
-        for correction in corrections:
-            label = 1 if correction["label"] == "action_item" else 0
-            self._teach_student(correction["text"], label)
+        self._teach_student_batch(
+            [correction["text"] for correction in corrections],
+            [1 if correction["label"] == "action_item" else 0 for correction in corrections],
+        )
 
         if persist_csv:
-            self._append_corrections_to_csv(corrections)
+            rows = [dict(correction) for correction in corrections]
+            self.model_writer.enqueue(lambda: self._append_corrections_to_csv(rows), "corrections CSV append")
 
         if persist_model:
             self.save_model()
@@ -826,7 +1947,7 @@ class ActionItemClassifier:
     def train_on_batch(self, texts, labels):
         """Incrementally train the model on a batch of data."""
         X = self.vectorizer.transform(texts)
-        self.clf.partial_fit(X, labels, classes=[0, 1])
+        self._train_copy_on_write(X, labels)
 
     def apply_correction(self, sentence, correct_label):
         """Compatibility helper for a single correction."""
@@ -841,8 +1962,11 @@ class ActionItemClassifier:
         classified_sentences = []
         detected_actions = []
 
-        for sent in segment:
-            prediction = self.predict(sent)
+        sentences = list(segment)
+        student_predictions = self.predict_many(sentences)
+
+        for sent, student in zip(sentences, student_predictions):
+            prediction = student["label"]
             status = "[!] Action" if prediction == 1 else "[ ] Info"
             print(f"  {status}: {sent}")
             classified_sentences.append({"sentence": sent, "label": prediction})
@@ -859,9 +1983,14 @@ class ActionItemClassifier:
         return {
             "model_path": self.model_path,
             "model_classes": self.clf.classes_.tolist() if hasattr(self.clf, "classes_") else None,
+            "model_version": self._snapshot().version,
             "vectorizer_features": self.vectorizer.n_features,
             "confidence_threshold": self.confidence_threshold,
             "operating_mode": self.operating_mode,
             "operating_threshold": self.get_operating_threshold(),
             "model_llama_name": self.model_llama_name,
+            "sentence_splitter": self.sentence_splitter,
+            "audit_budget": self.audit_budget,
+            "audit_budget_fraction": self.audit_budget_fraction,
+            "verdict_cache": self.get_verdict_cache_stats(),
         }
@@ -0,0 +1,325 @@
+"""
+Normalized Corpus Cache
+Compiles each labeled CSV in data/ once into a columnar .npz file (raw sentence, cleaned
+sentence, 0/1 label) so training and evaluation scripts stop re-parsing the CSVs with their own
+clean_text/normalize_labels copies. Entries are keyed by the source file's mtime/size and content
+hash, and recompiled only when a CSV actually changes.
+
+Usage:
+    python -m core.corpus_cache [--data-dir data] [--force]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+CORPUS_CACHE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DEFAULT_DATA_DIR = "data"
+DEFAULT_CORPUS_CACHE_DIR = os.path.join("output", "cache", "corpus")
+
+LABEL_MAP = {
+    "information_item": 0,
+    "information": 0,
+    "info": 0,
+    "action_item": 1,
+    "action": 1,
+    "act": 1,
+    "0": 0,
+    "1": 1,
+}
+
+CORPUS_COLUMNS = ["sentence_raw", "sentence", "label", "source_file"]
+
+
+def clean_text(text, lowercase=True):
+    """
+    Clean text while preserving action-item markers (stopwords and pronouns are kept).
+
+    Args:
+        text (str): Raw sentence
+        lowercase (bool): Lowercase the result
+
+    Returns:
+        str: Sentence with collapsed whitespace ("" for non-strings)
+    """
+    if not isinstance(text, str):
+        return ""
+    if lowercase:
+        text = text.lower()
+    return " ".join(text.split())
+
+
+def find_text_label_columns(columns):
+    """Pick the sentence and label columns of a dataset (case-insensitive), or None for each missing one."""
+    columns = list(columns)
+    text_col = next((col for col in ("sentence", "text") if col in columns), None)
+    if text_col is None:
+        text_col = next(
+            (col for col in columns if "text" in col or "sentence" in col or "content" in col),
+            None,
+        )
+
+    label_col = "label" if "label" in columns else None
+    if label_col is None:
+        label_col = next(
+            (col for col in columns if "label" in col or "type" in col or "classification" in col),
+            None,
+        )
+    return text_col, label_col
+
+
+def normalize_labels(df, source_file):
+    """
+    Normalize one labeled dataset into the corpus columns.
+
+    Rows whose label is not in ``LABEL_MAP`` are dropped.
+
+    Args:
+        df (pd.DataFrame): Dataset as read from CSV (or a Hugging Face split)
+        source_file (str): Name recorded in the ``source_file`` column
+
+    Returns:
+        tuple: (DataFrame with ``CORPUS_COLUMNS`` or None, success flag)
+    """
+    frame = df.copy()
+    frame.columns = [str(c).lower().strip() for c in frame.columns]
+    text_col, label_col = find_text_label_columns(frame.columns)
+    if text_col is None or label_col is None:
+        return None, False
+
+    labels = frame[label_col].astype(str).str.strip().str.lower().map(LABEL_MAP)
+    keep = labels.notna().to_numpy()
+    if not keep.any():
+        return None, False
+
+    raw = [text if isinstance(text, str) else "" for text in frame[text_col].to_numpy()[keep]]
+    result = pd.DataFrame(
+        {
+            "sentence_raw": raw,
+            "sentence": [clean_text(text) for text in raw],
+            "label": labels.to_numpy()[keep].astype(np.int8),
+        }
+    )
+    result["source_file"] = source_file
+    return result, True
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _pack_strings(values):
+    """Store strings as one UTF-8 blob plus character offsets (no pickled object arrays)."""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    if values:
+        np.cumsum([len(value) for value in values], out=offsets[1:])
+    blob = np.frombuffer("".join(values).encode("utf-8"), dtype=np.uint8)
+    return blob, offsets
+
+
+def _unpack_strings(blob, offsets):
+    text = blob.tobytes().decode("utf-8")
+    return [text[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def _read_manifest(cache_dir):
+    path = os.path.join(cache_dir, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return {"version": CORPUS_CACHE_VERSION, "files": {}}
+    if manifest.get("version") != CORPUS_CACHE_VERSION:
+        return {"version": CORPUS_CACHE_VERSION, "files": {}}
+    return manifest
+
+
+def _write_manifest(cache_dir, manifest):
+    handle = tempfile.NamedTemporaryFile(
+        mode="w", encoding="utf-8", dir=cache_dir, prefix=".manifest.", suffix=".tmp", delete=False
+    )
+    try:
+        with handle:
+            json.dump(manifest, handle, indent=2, sort_keys=True)
+        os.replace(handle.name, os.path.join(cache_dir, MANIFEST_NAME))
+    except BaseException:
+        if os.path.exists(handle.name):
+            os.remove(handle.name)
+        raise
+
+
+def _write_entry(frame, cache_path):
+    raw_blob, raw_offsets = _pack_strings(frame["sentence_raw"].tolist())
+    clean_blob, clean_offsets = _pack_strings(frame["sentence"].tolist())
+    handle = tempfile.NamedTemporaryFile(
+        mode="wb", dir=os.path.dirname(cache_path), prefix=".corpus.", suffix=".tmp", delete=False
+    )
+    try:
+        with handle:
+            np.savez(
+                handle,
+                raw_blob=raw_blob,
+                raw_offsets=raw_offsets,
+                clean_blob=clean_blob,
+                clean_offsets=clean_offsets,
+                label=frame["label"].to_numpy(dtype=np.int8),
+            )
+        os.replace(handle.name, cache_path)
+    except BaseException:
+        if os.path.exists(handle.name):
+            os.remove(handle.name)
+        raise
+
+
+def _read_entry(cache_path, source_name):
+    with np.load(cache_path, allow_pickle=False) as payload:
+        frame = pd.DataFrame(
+            {
+                "sentence_raw": _unpack_strings(payload["raw_blob"], payload["raw_offsets"]),
+                "sentence": _unpack_strings(payload["clean_blob"], payload["clean_offsets"]),
+                "label": payload["label"].astype(int),
+            }
+        )
+    frame["source_file"] = source_name
+    return frame
+
+
+def _cached_entry(path, cache_dir, manifest, force):
+    """
+    Return (manifest entry, status) for one CSV, compiling it when its content changed.
+
+    Status is "cached", "refreshed" (touched but identical) or "compiled".
+
+    A matching mtime/size skips hashing; a touched file whose hash is unchanged only refreshes
+    the recorded mtime.
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(path)
+    entry = manifest["files"].get(key)
+    cache_ok = entry is not None and (
+        not entry.get("cache_file") or os.path.exists(os.path.join(cache_dir, entry["cache_file"]))
+    )
+
+    if not force and cache_ok and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        return entry, "cached"
+
+    sha256 = _file_sha256(path)
+    if not force and cache_ok and entry["sha256"] == sha256:
+        entry.update({"mtime_ns": stat.st_mtime_ns, "size": stat.st_size})
+        return entry, "refreshed"
+
+    frame, ok = normalize_labels(pd.read_csv(path), os.path.basename(path))
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cache_file = f"{stem}-{sha256[:16]}.npz"
+    if ok:
+        _write_entry(frame, os.path.join(cache_dir, cache_file))
+    if entry is not None and entry.get("cache_file") not in (None, cache_file):
+        stale = os.path.join(cache_dir, entry["cache_file"])
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    entry = {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": sha256,
+        "cache_file": cache_file if ok else None,
+        "rows": int(len(frame)) if ok else 0,
+        "labeled": bool(ok),
+    }
+    manifest["files"][key] = entry
+    return entry, "compiled"
+
+
+def load_corpus(
+    paths=None,
+    data_dir=DEFAULT_DATA_DIR,
+    cache_dir=DEFAULT_CORPUS_CACHE_DIR,
+    source_names=None,
+    drop_empty=True,
+    force=False,
+    verbose=True,
+):
+    """
+    Load labeled datasets through the normalized corpus cache.
+
+    Args:
+        paths (list[str] | None): CSV files to load (default: every ``*.csv`` in ``data_dir``)
+        data_dir (str): Folder scanned when ``paths`` is None
+        cache_dir (str): Cache folder holding the compiled ``.npz`` files and manifest
+        source_names (dict | None): Optional path -> name used in ``source_file`` (default: file name)
+        drop_empty (bool): Drop rows whose cleaned sentence is empty
+        force (bool): Recompile every file even if the cache is current
+        verbose (bool): Print one line per file
+
+    Returns:
+        pd.DataFrame: Rows with ``sentence_raw``, ``sentence`` (cleaned, lowercase), ``label`` (0/1)
+        and ``source_file``; files without usable text/label columns are skipped
+    """
+    if paths is None:
+        paths = sorted(glob.glob(os.path.join(data_dir, "*.csv")))
+    source_names = source_names or {}
+
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = _read_manifest(cache_dir)
+    manifest_changed = False
+    parts = []
+
+    for path in paths:
+        name = source_names.get(path, os.path.basename(path))
+        if not os.path.exists(path):
+            if verbose:
+                print(f"[Warning] Corpus file not found: {path}")
+            continue
+        try:
+            entry, status = _cached_entry(path, cache_dir, manifest, force)
+        except Exception as error:
+            if verbose:
+                print(f"[Warning] Could not compile {path}: {error}")
+            continue
+        manifest_changed = manifest_changed or status != "cached"
+
+        if not entry.get("labeled"):
+            if verbose:
+                print(f"[Warning] Skipped {os.path.basename(path)}: missing text/label columns or labels")
+            continue
+        frame = _read_entry(os.path.join(cache_dir, entry["cache_file"]), name)
+        if drop_empty:
+            frame = frame[frame["sentence"].str.len() > 0]
+        parts.append(frame)
+        if verbose:
+            print(f"[System] Corpus {os.path.basename(path)}: {len(frame)} rows ({status})")
+
+    if manifest_changed:
+        _write_manifest(cache_dir, manifest)
+
+    if not parts:
+        return pd.DataFrame({column: [] for column in CORPUS_COLUMNS}).astype({"label": int})
+    return pd.concat(parts, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile labeled CSVs into the normalized corpus cache.")
+    parser.add_argument("paths", nargs="*", help="CSV files (default: every CSV in --data-dir)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Folder of labeled CSVs")
+    parser.add_argument("--cache-dir", default=DEFAULT_CORPUS_CACHE_DIR, help="Corpus cache folder")
+    parser.add_argument("--force", action="store_true", help="Recompile every file")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.paths or None, data_dir=args.data_dir, cache_dir=args.cache_dir, force=args.force)
+    print(f"[System] Corpus: {len(corpus)} rows, labels {corpus['label'].value_counts().to_dict()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Sentence Embedding Backends
+Loaders for the sentence encoder used by cosine segmentation. Every backend returns a
+SentenceTransformer-compatible object (``encode(sentences, convert_to_numpy=..., normalize_embeddings=...)``),
+so the Segmenter does not care which one is active:
+
+    torch      fp32 PyTorch model (the original behaviour)
+    int8       the same model with its Linear layers dynamically quantized to int8 (CPU)
+    onnx       ONNX Runtime export of the model
+    onnx-int8  ONNX Runtime export with dynamically quantized int8 weights
+
+A smaller model (``SMALL_EMBEDDING_MODEL``) can be combined with any backend. Backends produce
+slightly different vectors, so each one gets its own embedding cache namespace (see
+``embedding_cache_name``).
+"""
+
+import logging
+import os
+import platform
+import re
+import warnings
+
+try:
+    from sentence_transformers import SentenceTransformer
+except Exception:  # pragma: no cover - optional dependency
+    SentenceTransformer = None
+
+try:
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+except Exception:  # pragma: no cover - optional dependency (sentence-transformers >= 3.2)
+    export_dynamic_quantized_onnx_model = None
+
+try:
+    import torch
+except Exception:  # pragma: no cover - optional dependency
+    torch = None
+
+try:
+    from transformers import logging as hf_transformers_logging
+except Exception:  # pragma: no cover - optional dependency
+    hf_transformers_logging = None
+
+
+BACKEND_TORCH = "torch"
+BACKEND_INT8 = "int8"
+BACKEND_ONNX = "onnx"
+BACKEND_ONNX_INT8 = "onnx-int8"
+EMBEDDING_BACKENDS = (BACKEND_TORCH, BACKEND_INT8, BACKEND_ONNX, BACKEND_ONNX_INT8)
+
+DEFAULT_EMBEDDING_MODEL = "all-mpnet-base-v2"
+SMALL_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_ONNX_EXPORT_DIR = os.path.join("output", "cache", "onnx_models")
+
+
+def embedding_cache_name(model_name, backend=BACKEND_TORCH):
+    """Embedding cache namespace for a model/backend pair (the fp32 backend keeps the bare model name)."""
+    if backend == BACKEND_TORCH:
+        return str(model_name)
+    return f"{model_name}#{backend}"
+
+
+def _quiet_model_loading():
+    """Silence non-critical Hugging Face/transformers model-load warnings in CLI output."""
+    logging.getLogger("huggingface_hub").setLevel(logging.ERROR)
+    logging.getLogger("transformers").setLevel(logging.ERROR)
+    logging.getLogger("sentence_transformers").setLevel(logging.ERROR)
+    warnings.filterwarnings("ignore", message=r".*HF Hub.*")
+    warnings.filterwarnings("ignore", message=r".*UNEXPECTED.*")
+    if hf_transformers_logging is not None:
+        hf_transformers_logging.set_verbosity_error()
+
+
+def _quantization_config():
+    """Dynamic int8 quantization target matching this CPU."""
+    machine = platform.machine().lower()
+    if machine in ("arm64", "aarch64"):
+        return "arm64"
+    return "avx2"
+
+
+def _load_torch(model_name):
+    return SentenceTransformer(model_name)
+
+
+def _load_int8(model_name):
+    if torch is None:
+        raise RuntimeError("Missing dependency: torch. Run: pip install torch")
+    model = SentenceTransformer(model_name, device="cpu")
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_onnx(model_name):
+    try:
+        return SentenceTransformer(model_name, device="cpu", backend="onnx")
+    except TypeError as error:
+        raise RuntimeError(
+            "The onnx backend needs sentence-transformers>=3.2. Run: pip install -U 'sentence-transformers[onnx]'"
+        ) from error
+
+
+def _load_onnx_int8(model_name, export_dir=DEFAULT_ONNX_EXPORT_DIR):
+    config = _quantization_config()
+    file_name = f"model_qint8_{config}.onnx"
+
+    # Popular sentence-transformers repositories ship pre-quantized exports.
+    try:
+        return SentenceTransformer(
+            model_name, device="cpu", backend="onnx", model_kwargs={"file_name": f"onnx/{file_name}"}
+        )
+    except TypeError as error:
+        raise RuntimeError(
+            "The onnx-int8 backend needs sentence-transformers>=3.2. Run: pip install -U 'sentence-transformers[onnx]'"
+        ) from error
+    except Exception:
+        pass
+
+    if export_dynamic_quantized_onnx_model is None:
+        raise RuntimeError(
+            f"No {file_name} for {model_name} and no local exporter. Run: pip install -U 'sentence-transformers[onnx]'"
+        )
+
+    local_dir = os.path.join(export_dir, re.sub(r"[^A-Za-z0-9._-]+", "_", str(model_name)))
+    if not os.path.exists(os.path.join(local_dir, "onnx", file_name)):
+        print(f"[System] Exporting int8 ONNX model for {model_name} to {local_dir}")
+        model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+        model.save_pretrained(local_dir)
+        export_dynamic_quantized_onnx_model(model, config, local_dir)
+    return SentenceTransformer(local_dir, device="cpu", backend="onnx", model_kwargs={"file_name": f"onnx/{file_name}"})
+
+
+_LOADERS = {
+    BACKEND_TORCH: _load_torch,
+    BACKEND_INT8: _load_int8,
+    BACKEND_ONNX: _load_onnx,
+    BACKEND_ONNX_INT8: _load_onnx_int8,
+}
+
+
+def load_embedding_backend(model_name=DEFAULT_EMBEDDING_MODEL, backend=BACKEND_TORCH):
+    """
+    Load a sentence encoder for cosine segmentation.
+
+    Args:
+        model_name (str): Sentence-transformers model name or local path
+        backend (str): One of ``EMBEDDING_BACKENDS``
+
+    Returns:
+        SentenceTransformer: Encoder exposing ``encode(sentences, convert_to_numpy=..., normalize_embeddings=...)``
+    """
+    if backend not in _LOADERS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; choose from {', '.join(EMBEDDING_BACKENDS)}")
+    if SentenceTransformer is None:
+        raise RuntimeError(
+            "Missing dependency: sentence-transformers. Run: pip install sentence-transformers"
+        )
+
+    _quiet_model_loading()
+    return _LOADERS[backend](model_name)
@@ -0,0 +1,383 @@
+"""
+Sentence Embedding Cache
+Persists sentence embeddings so re-segmenting a transcript (or rebuilding its topic labels for
+export) does not run the sentence-transformer again. Entries are keyed by the embedding model
+name and a hash of the whitespace-normalized sentence; only cache misses are encoded.
+
+Each model gets its own folder holding a float16 matrix (opened with ``np.memmap``) and a SQLite
+index mapping keys to matrix rows with a last-used time. Lookups only read the index; recency
+is kept in memory and written back in batches. When the cache is full, the least recently used
+rows are reused for new sentences. Lookups and the allocate -> write -> index sequence run under
+a cross-process file lock, so processes sharing the folder never hand out the same row twice.
+"""
+
+import atexit
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from core.file_lock import FileLock
+
+
+EMBEDDING_CACHE_VERSION = 2
+DEFAULT_EMBEDDING_CACHE_DIR = os.path.join("output", "cache", "embeddings")
+DEFAULT_MAX_ENTRIES = 100000
+INDEX_NAME = "index.sqlite3"
+LOCK_NAME = "cache.lock"
+LEGACY_FILES = ("index.json", "vectors.f16")
+MIN_GROWTH_ROWS = 1024
+# Recency updates are written back once this many are pending or this many seconds have passed.
+RECENCY_FLUSH_ENTRIES = 1000
+RECENCY_FLUSH_SECONDS = 60.0
+# Keys per ``IN (...)`` query (below SQLite's bound-parameter limit).
+QUERY_CHUNK = 500
+
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def normalize_sentence(sentence):
+    """Collapse whitespace so formatting-only differences share one cache entry."""
+    return " ".join(str(sentence or "").split())
+
+
+def sentence_key(model_name, sentence):
+    """Content address of one sentence embedded by one model (128-bit hex digest)."""
+    material = f"{model_name}\x00{normalize_sentence(sentence)}".encode("utf-8")
+    return hashlib.sha256(material).hexdigest()[:32]
+
+
+def _model_folder_name(model_name):
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", str(model_name)).strip("._") or "model"
+    return f"{slug[:48]}-{hashlib.sha256(str(model_name).encode('utf-8')).hexdigest()[:8]}"
+
+
+class EmbeddingCache:
+    """LRU-bounded, memory-mapped float16 store of sentence embeddings for one model."""
+
+    def __init__(self, model_name, cache_dir=DEFAULT_EMBEDDING_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            model_name (str): Embedding model the vectors come from (part of every key)
+            cache_dir (str): Root folder; each model gets its own subfolder
+            max_entries (int): Sentences kept before least recently used ones are replaced
+        """
+        self.model_name = str(model_name)
+        self.cache_dir = cache_dir
+        self.model_dir = os.path.join(cache_dir, _model_folder_name(self.model_name))
+        self.max_entries = max(1, int(max_entries))
+        self.index_path = os.path.join(self.model_dir, INDEX_NAME)
+        self.lock_path = os.path.join(self.model_dir, LOCK_NAME)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._vectors = None
+        self._mapped = None
+        self._recent = {}
+        self._recent_flushed_at = time.monotonic()
+
+    def _connect(self):
+        if self._conn is not None:
+            return self._conn
+
+        os.makedirs(self.model_dir, exist_ok=True)
+        conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " slot INTEGER NOT NULL,"
+            " last_used REAL NOT NULL"
+            ")"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries(last_used)")
+        conn.commit()
+        self._conn = conn
+
+        meta = self._meta()
+        if meta and (meta.get("version") != str(EMBEDDING_CACHE_VERSION) or meta.get("model") != self.model_name):
+            print(f"[Warning] Ignoring embedding cache {self.model_dir} from another cache version or model.")
+            self._wipe()
+        for name in LEGACY_FILES:
+            # Files of the earlier JSON-indexed format.
+            try:
+                os.remove(os.path.join(self.model_dir, name))
+            except OSError:
+                pass
+        return conn
+
+    def _meta(self):
+        return dict(self._conn.execute("SELECT name, value FROM meta").fetchall())
+
+    def _set_meta(self, **values):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+            [(name, str(value)) for name, value in values.items()],
+        )
+
+    def _wipe(self):
+        """Drop every entry and the vector file (caller holds the file lock or owns the folder)."""
+        vectors_file = self._meta().get("vectors_file")
+        self._conn.execute("DELETE FROM entries")
+        self._conn.execute("DELETE FROM meta")
+        self._conn.commit()
+        self._vectors = None
+        self._mapped = None
+        self._recent = {}
+        if vectors_file:
+            try:
+                os.remove(os.path.join(self.model_dir, vectors_file))
+            except OSError:
+                pass
+
+    def _map_vectors(self, meta):
+        """Open (or reopen after another process grew or replaced it) the vector matrix."""
+        if "dim" not in meta:
+            self._vectors = None
+            self._mapped = None
+            return
+        mapped = (meta["vectors_file"], int(meta["rows"]), int(meta["dim"]))
+        if mapped == self._mapped:
+            return
+        file_name, rows, dim = mapped
+        self._vectors = None
+        if rows:
+            path = os.path.join(self.model_dir, file_name)
+            self._vectors = np.memmap(path, dtype=np.float16, mode="r+", shape=(rows, dim))
+        self._mapped = mapped
+
+    def _flush_recency(self, force=False):
+        """Write pending last-used times back to the index when enough have piled up (or ``force``)."""
+        if not self._recent:
+            return
+        due = time.monotonic() - self._recent_flushed_at >= RECENCY_FLUSH_SECONDS
+        if not (force or due or len(self._recent) >= RECENCY_FLUSH_ENTRIES):
+            return
+        self._conn.executemany(
+            "UPDATE entries SET last_used = ? WHERE key = ?",
+            [(used, key) for key, used in self._recent.items()],
+        )
+        self._conn.commit()
+        self._recent = {}
+        self._recent_flushed_at = time.monotonic()
+
+    def _lookup(self, keys):
+        """Return ``{key: slot}`` for the keys present in the index."""
+        slots = {}
+        for start in range(0, len(keys), QUERY_CHUNK):
+            chunk = keys[start:start + QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            slots.update(
+                self._conn.execute(f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", chunk).fetchall()
+            )
+        return slots
+
+    def encode(self, sentences, encoder):
+        """
+        Embed sentences, running ``encoder`` only on sentences missing from the cache.
+
+        Args:
+            sentences (list[str]): Sentences in output order
+            encoder (callable): Maps a list of sentences to a 2-D array of embeddings
+
+        Returns:
+            np.ndarray: float32 matrix with one row per sentence. Vectors pass through float16 on
+            the way in, so a cold run returns exactly what later cached runs return.
+        """
+        sentences = [str(sentence) for sentence in sentences]
+        keys = [sentence_key(self.model_name, sentence) for sentence in sentences]
+        unique = dict(zip(keys, sentences))
+
+        hit_vectors = {}
+        try:
+            with self._lock, FileLock(self.lock_path):
+                self._connect()
+                self._map_vectors(self._meta())
+                hit_slots = self._lookup(list(unique)) if self._vectors is not None else {}
+                # Copy hits out while the lock keeps other processes from reusing their rows.
+                hit_vectors = {key: np.array(self._vectors[slot], dtype=np.float32) for key, slot in hit_slots.items()}
+                now = time.time()
+                for key in hit_vectors:
+                    self._recent[key] = now
+                self._flush_recency()
+        except (OSError, sqlite3.Error) as error:
+            print(f"[Warning] Could not read embedding cache ({error}); continuing uncached.")
+        missing = [(key, sentence) for key, sentence in unique.items() if key not in hit_vectors]
+        self.hits += sum(1 for key in keys if key in hit_vectors)
+        self.misses += len(missing)
+
+        fresh = {}
+        if missing:
+            encoded = np.asarray(encoder([sentence for _, sentence in missing]), dtype=np.float32)
+            encoded = encoded.reshape(len(missing), -1).astype(np.float16)
+            fresh = {key: encoded[position] for position, (key, _) in enumerate(missing)}
+            try:
+                with self._lock, FileLock(self.lock_path):
+                    self._store(fresh)
+            except (OSError, sqlite3.Error) as error:
+                print(f"[Warning] Could not write embedding cache ({error}); continuing uncached.")
+
+        vectors = {key: vector.astype(np.float32) for key, vector in fresh.items()}
+        vectors.update(hit_vectors)
+        if not keys:
+            dim = self._mapped[2] if self._mapped else 0
+            return np.zeros((0, dim), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+
+    def _reset(self, dim):
+        """Start an empty store for vectors of ``dim`` dimensions in a fresh vector file."""
+        self._wipe()
+        file_name = f"vectors-{uuid.uuid4().hex[:8]}.f16"
+        with open(os.path.join(self.model_dir, file_name), "wb"):
+            pass
+        self._set_meta(
+            version=EMBEDDING_CACHE_VERSION, model=self.model_name, dim=int(dim), rows=0, vectors_file=file_name
+        )
+        self._conn.commit()
+
+    def _grow(self, meta, needed_rows):
+        """Extend the vector file so at least ``needed_rows`` rows exist (capped at max_entries)."""
+        current = int(meta["rows"])
+        rows = min(self.max_entries, max(needed_rows, 2 * current, MIN_GROWTH_ROWS))
+        if rows <= current:
+            return current
+        if self._vectors is not None:
+            self._vectors.flush()
+        # Rows only ever grow, so other processes' mappings of the shorter file stay valid.
+        with open(os.path.join(self.model_dir, meta["vectors_file"]), "r+b") as handle:
+            handle.truncate(rows * int(meta["dim"]) * 2)
+        self._set_meta(rows=rows)
+        self._conn.commit()
+        return rows
+
+    def _free_slots(self, rows, count):
+        """Rows not referenced by any entry, lowest first, at most ``count`` of them."""
+        used, highest = self._conn.execute("SELECT COUNT(*), MAX(slot) FROM entries").fetchone()
+        if used >= rows:
+            return []
+        if not used or highest == used - 1:
+            # Rows fill from the front, so normally the free ones are simply the tail.
+            return list(range(used, min(rows, used + count)))
+        taken = {slot for (slot,) in self._conn.execute("SELECT slot FROM entries")}
+        return [slot for slot in range(rows) if slot not in taken][:count]
+
+    def _store(self, fresh):
+        """Allocate rows for new vectors (evicting least recently used ones) and write them (file lock held)."""
+        self._connect()
+        dim = next(iter(fresh.values())).shape[0]
+        meta = self._meta()
+        if meta.get("dim") != str(dim):
+            self._reset(dim)
+            meta = self._meta()
+
+        # Another process may have stored some of these while the encoder ran.
+        present = self._lookup(list(fresh))
+        # More misses than capacity: only the most recent ones can be kept.
+        items = [(key, vector) for key, vector in fresh.items() if key not in present][-self.max_entries:]
+        if not items:
+            return
+
+        (used,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        rows = self._grow(meta, min(self.max_entries, used + len(items)))
+        self._map_vectors(self._meta())
+        slots = self._free_slots(rows, len(items))
+
+        shortfall = len(items) - len(slots)
+        if shortfall > 0:
+            self._flush_recency(force=True)
+            evicted = self._conn.execute(
+                "SELECT key, slot FROM entries ORDER BY last_used ASC LIMIT ?", (shortfall,)
+            ).fetchall()
+            # Drop evicted keys from the index before their rows are overwritten, so a crash in
+            # between cannot map an old sentence to a new vector.
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted])
+            self._conn.commit()
+            for key, slot in evicted:
+                self._recent.pop(key, None)
+                slots.append(slot)
+
+        now = time.time()
+        for (_, vector), slot in zip(items, slots):
+            self._vectors[slot] = vector
+        self._vectors.flush()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+            [(key, slot, now) for (key, _), slot in zip(items, slots)],
+        )
+        self._conn.commit()
+
+    def flush(self):
+        """Write pending recency updates to the index."""
+        with self._lock:
+            if self._conn is None or not self._recent:
+                return
+            try:
+                with FileLock(self.lock_path):
+                    self._flush_recency(force=True)
+            except (OSError, sqlite3.Error) as error:
+                print(f"[Warning] Could not update embedding cache recency ({error}).")
+
+    def clear(self):
+        """Remove every cached embedding for this model."""
+        with self._lock, FileLock(self.lock_path):
+            self._connect()
+            self._wipe()
+
+    def stats(self):
+        """Return hit/miss counters and the current entry count."""
+        with self._lock, FileLock(self.lock_path):
+            self._connect()
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "entries": int(entries),
+            "max_entries": self.max_entries,
+            "model_dir": self.model_dir,
+        }
+
+    def close(self):
+        """Write pending recency updates and close the index connection."""
+        self.flush()
+        with self._lock:
+            self._vectors = None
+            self._mapped = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def shared_embedding_cache(model_name, cache_dir=DEFAULT_EMBEDDING_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES):
+    """
+    Return the process-wide cache for a model and folder.
+
+    Segmenters created per request (e.g. by the export service) share one in-memory index this way.
+    """
+    key = (str(model_name), os.path.abspath(cache_dir))
+    with _shared_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(model_name, cache_dir=cache_dir, max_entries=max_entries)
+            _shared_caches[key] = cache
+        return cache
+
+
+def _flush_shared_caches():
+    for cache in list(_shared_caches.values()):
+        cache.flush()
+
+
+atexit.register(_flush_shared_caches)
@@ -0,0 +1,615 @@
+"""
+Parallel Evaluation Engine
+Shared harness behind the models/ comparison, cross-validation and ablation scripts. Candidate
+models are declared as picklable configurations (a feature configuration plus an estimator
+factory); the engine featurizes every fold once per distinct feature configuration, fans the
+(fold, candidate) fits out over a process pool, and returns one metrics table with a row per
+candidate and fold.
+
+Fitted fold matrices are written to a scratch directory as plain .npy arrays and loaded
+memory-mapped by the workers, so a matrix shared by several candidates is neither refit nor
+pickled to each process.
+
+Usage:
+    python -m core.evaluation_engine [--folds 5] [--jobs 4] [--output metrics.csv]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import FeatureUnion
+
+
+METRIC_COLUMNS = [
+    "accuracy",
+    "precision",
+    "recall",
+    "f1",
+    "f1_macro",
+    "precision_macro",
+    "recall_macro",
+    "auc_roc",
+]
+
+
+# ---------------------------------------------------------------------------
+# Feature and estimator factories (module level so configurations pickle by reference)
+# ---------------------------------------------------------------------------
+
+def tfidf(**params):
+    """Plain TfidfVectorizer with the given parameters."""
+    return TfidfVectorizer(**params)
+
+
+def word_tfidf(ngram_range=(1, 2), max_features=100000, min_df=2, max_df=0.95, lowercase=True):
+    """Word uni+bigram TF-IDF used by the SVM pipelines."""
+    return TfidfVectorizer(
+        analyzer="word",
+        ngram_range=tuple(ngram_range),
+        max_features=max_features,
+        min_df=min_df,
+        max_df=max_df,
+        sublinear_tf=True,
+        lowercase=lowercase,
+    )
+
+
+def word_char_tfidf(ngram_range=(1, 2), char_ngram_range=(3, 5), lowercase=True):
+    """Word TF-IDF plus char_wb 3-5 gram TF-IDF (the FeatureUnion pipeline)."""
+    return FeatureUnion(
+        [
+            ("word_tfidf", word_tfidf(ngram_range=ngram_range, lowercase=lowercase)),
+            (
+                "char_tfidf",
+                TfidfVectorizer(
+                    analyzer="char_wb",
+                    ngram_range=tuple(char_ngram_range),
+                    max_features=60000,
+                    min_df=2,
+                    sublinear_tf=True,
+                    lowercase=lowercase,
+                ),
+            ),
+        ]
+    )
+
+
+def sgd_hinge(class_weight="balanced", alpha=0.0001):
+    """Linear SVM trained with SGD (hinge loss), as in the training scripts."""
+    return SGDClassifier(
+        loss="hinge",
+        penalty="l2",
+        alpha=alpha,
+        max_iter=2000,
+        tol=1e-4,
+        class_weight=class_weight,
+        random_state=42,
+    )
+
+
+def multinomial_nb(alpha=0.1):
+    """Multinomial Naive Bayes baseline."""
+    return MultinomialNB(alpha=alpha)
+
+
+# ---------------------------------------------------------------------------
+# Configurations
+# ---------------------------------------------------------------------------
+
+def _factory_name(factory):
+    return f"{factory.__module__}.{factory.__qualname__}"
+
+
+@dataclass
+class FeatureConfig:
+    """How to turn a text column into a sparse matrix (fitted on each fold's training rows)."""
+
+    name: str
+    factory: Callable = word_tfidf
+    params: Dict = field(default_factory=dict)
+    text_column: str = "sentence"
+
+    @property
+    def key(self):
+        """Identity of the featurization; candidates with equal keys share one fitted matrix."""
+        return json.dumps(
+            [_factory_name(self.factory), self.params, self.text_column], sort_keys=True, default=str
+        )
+
+    def build(self):
+        return self.factory(**self.params)
+
+
+@dataclass
+class Candidate:
+    """
+    One model to evaluate.
+
+    ``threshold`` None uses the estimator's own ``predict``; a number labels rows whose score
+    reaches it as action items. ``tags`` are copied into the metrics table (e.g. ablation settings).
+    """
+
+    name: str
+    features: FeatureConfig
+    factory: Callable = sgd_hinge
+    params: Dict = field(default_factory=dict)
+    threshold: Optional[float] = None
+    tags: Dict = field(default_factory=dict)
+
+    @property
+    def key(self):
+        """Identity of the fit; candidates with equal keys are fitted once per fold."""
+        return json.dumps(
+            [self.features.key, _factory_name(self.factory), self.params, self.threshold],
+            sort_keys=True,
+            default=str,
+        )
+
+    def build(self):
+        return self.factory(**self.params)
+
+
+@dataclass
+class Fold:
+    """Row positions of one train/test split of the evaluated frame."""
+
+    name: str
+    train_index: np.ndarray
+    test_index: np.ndarray
+
+
+WORD_TFIDF = FeatureConfig("word_tfidf", word_tfidf)
+WORD_CHAR_TFIDF = FeatureConfig("word_char_tfidf", word_char_tfidf)
+NB_TFIDF = FeatureConfig(
+    "tfidf_5k",
+    tfidf,
+    {"max_features": 5000, "ngram_range": (1, 2), "min_df": 2, "max_df": 0.8},
+)
+
+
+def standard_candidates():
+    """SGD-hinge on word TF-IDF, SGD-hinge on word+char TF-IDF, and Multinomial NB."""
+    return [
+        Candidate("sgd_hinge", WORD_TFIDF, sgd_hinge),
+        Candidate("sgd_word_char", WORD_CHAR_TFIDF, sgd_hinge),
+        Candidate("naive_bayes", NB_TFIDF, multinomial_nb),
+    ]
+
+
+def svm_vs_nb_candidates():
+    """The two models compared by the SVM vs Naive Bayes scripts."""
+    return [
+        Candidate("svm", WORD_CHAR_TFIDF, sgd_hinge),
+        Candidate("naive_bayes", NB_TFIDF, multinomial_nb),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Folds
+# ---------------------------------------------------------------------------
+
+def kfold_folds(labels, n_splits=5, random_state=42):
+    """Stratified k-fold splits named fold_1..fold_k."""
+    labels = np.asarray(labels)
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    return [
+        Fold(f"fold_{index}", train_index, test_index)
+        for index, (train_index, test_index) in enumerate(splitter.split(np.zeros(len(labels)), labels), start=1)
+    ]
+
+
+def holdout_folds(labels, test_size=0.2, random_state=42, groups=None):
+    """
+    Stratified train/test holdout splits.
+
+    Args:
+        labels (array-like): 0/1 labels of the evaluated frame
+        test_size (float): Fraction of rows held out
+        random_state (int): Split seed
+        groups (array-like | None): Optional group per row (e.g. dataset name); one split is made
+            inside each group, named after it
+
+    Returns:
+        list[Fold]: One fold ("holdout") or one per group
+    """
+    labels = np.asarray(labels)
+    if groups is None:
+        named = [("holdout", np.arange(len(labels)))]
+    else:
+        groups = np.asarray(groups)
+        named = [(str(group), np.flatnonzero(groups == group)) for group in pd.unique(groups)]
+
+    folds = []
+    for name, positions in named:
+        group_labels = labels[positions]
+        stratify = group_labels if np.bincount(group_labels.astype(int), minlength=2).min() >= 2 else None
+        try:
+            train_index, test_index = train_test_split(
+                positions, test_size=test_size, random_state=random_state, stratify=stratify
+            )
+        except ValueError as error:
+            print(f"[Warning] Skipping split {name}: {error}")
+            continue
+        folds.append(Fold(name, np.sort(train_index), np.sort(test_index)))
+    return folds
+
+
+def train_test_frame(train_df, test_df, name="holdout"):
+    """Stack a fixed train and test frame into one frame plus the matching single fold."""
+    frame = pd.concat([train_df, test_df], ignore_index=True)
+    fold = Fold(name, np.arange(len(train_df)), np.arange(len(train_df), len(frame)))
+    return frame, [fold]
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+def classification_metrics(y_true, y_pred, scores=None):
+    """
+    Metrics reported for every candidate and fold.
+
+    Args:
+        y_true (np.ndarray): 0/1 labels
+        y_pred (np.ndarray): 0/1 predictions
+        scores (np.ndarray | None): Decision scores or action probabilities for AUC-ROC
+
+    Returns:
+        dict: Action-class accuracy/precision/recall/f1, macro precision/recall/f1 and AUC-ROC
+            (NaN when the test rows hold a single class)
+    """
+    y_true = np.asarray(y_true, dtype=int)
+    y_pred = np.asarray(y_pred, dtype=int)
+    auc_roc = float("nan")
+    if scores is not None and len(np.unique(y_true)) == 2:
+        auc_roc = float(roc_auc_score(y_true, scores))
+    return {
+        "accuracy": float(accuracy_score(y_true, y_pred)),
+        "precision": float(precision_score(y_true, y_pred, zero_division=0)),
+        "recall": float(recall_score(y_true, y_pred, zero_division=0)),
+        "f1": float(f1_score(y_true, y_pred, zero_division=0)),
+        "f1_macro": float(f1_score(y_true, y_pred, average="macro", zero_division=0)),
+        "precision_macro": float(precision_score(y_true, y_pred, average="macro", zero_division=0)),
+        "recall_macro": float(recall_score(y_true, y_pred, average="macro", zero_division=0)),
+        "auc_roc": auc_roc,
+    }
+
+
+def candidate_scores(model, features):
+    """Decision scores where the estimator has them (SVM), else the action-class probability (NB)."""
+    if hasattr(model, "decision_function"):
+        return np.asarray(model.decision_function(features), dtype=np.float64).ravel()
+    return np.asarray(model.predict_proba(features)[:, 1], dtype=np.float64)
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+
+CORPUS_NAME = "corpus.pkl"
+_WORKER_CORPORA = {}
+
+
+def _worker_corpus(work_dir):
+    """Corpus of one run, read once per worker process."""
+    corpus = _WORKER_CORPORA.get(work_dir)
+    if corpus is None:
+        _WORKER_CORPORA.clear()
+        corpus = pd.read_pickle(os.path.join(work_dir, CORPUS_NAME))
+        _WORKER_CORPORA[work_dir] = corpus
+    return corpus
+
+
+def _save_matrix(prefix, matrix):
+    matrix = sparse.csr_matrix(matrix)
+    matrix.sort_indices()
+    np.save(f"{prefix}_data.npy", matrix.data)
+    np.save(f"{prefix}_indices.npy", matrix.indices)
+    np.save(f"{prefix}_indptr.npy", matrix.indptr)
+    with open(f"{prefix}_shape.json", "w", encoding="utf-8") as handle:
+        json.dump(list(matrix.shape), handle)
+
+
+def _load_matrix(prefix):
+    with open(f"{prefix}_shape.json", "r", encoding="utf-8") as handle:
+        shape = tuple(json.load(handle))
+    arrays = [np.load(f"{prefix}_{name}.npy", mmap_mode="r") for name in ("data", "indices", "indptr")]
+    matrix = sparse.csr_matrix(tuple(arrays), shape=shape, copy=False)
+    matrix.has_sorted_indices = True
+    return matrix
+
+
+def _featurize_job(job):
+    """Fit one feature configuration on one fold and write the train/test matrices."""
+    corpus = _worker_corpus(job["work_dir"])
+    texts = corpus[job["feature"].text_column].astype(str).to_numpy()
+    started = time.perf_counter()
+    vectorizer = job["feature"].build()
+    train_matrix = vectorizer.fit_transform(texts[job["train_index"]])
+    test_matrix = vectorizer.transform(texts[job["test_index"]])
+    _save_matrix(f"{job['prefix']}_train", train_matrix)
+    _save_matrix(f"{job['prefix']}_test", test_matrix)
+    return {"seconds": time.perf_counter() - started, "n_features": int(train_matrix.shape[1])}
+
+
+def _fit_job(job):
+    """Fit one candidate on one featurized fold and score its test rows."""
+    labels = _worker_corpus(job["work_dir"])["label"].to_numpy(dtype=int)
+    y_train = labels[job["train_index"]]
+    y_test = labels[job["test_index"]]
+    train_matrix = _load_matrix(f"{job['prefix']}_train")
+    test_matrix = _load_matrix(f"{job['prefix']}_test")
+
+    started = time.perf_counter()
+    candidate = job["candidate"]
+    model = candidate.build()
+    model.fit(train_matrix, y_train)
+    scores = candidate_scores(model, test_matrix)
+    if candidate.threshold is None:
+        y_pred = np.asarray(model.predict(test_matrix), dtype=int)
+    else:
+        y_pred = (scores >= candidate.threshold).astype(int)
+    seconds = time.perf_counter() - started
+
+    result = {"metrics": classification_metrics(y_test, y_pred, scores), "fit_seconds": seconds}
+    if job["keep_predictions"]:
+        result["predictions"] = {"y_true": y_test, "y_pred": y_pred, "scores": scores}
+    return result
+
+
+def _run_jobs(function, jobs, n_jobs, describe, verbose):
+    """Run jobs in a process pool (or inline for one worker) and return results in job order."""
+    results = [None] * len(jobs)
+    if n_jobs <= 1 or len(jobs) <= 1:
+        for index, job in enumerate(jobs):
+            results[index] = function(job)
+            if verbose:
+                print(f"[System] {describe(job, results[index])}")
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(jobs))) as pool:
+        futures = {pool.submit(function, job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            if verbose:
+                print(f"[System] {describe(jobs[index], results[index])}")
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+@dataclass
+class EvaluationRun:
+    """Result of ``run_evaluation``: the metrics table plus optional per-fold predictions."""
+
+    table: pd.DataFrame
+    predictions: Dict = field(default_factory=dict)
+
+    def metrics(self, candidate, fold):
+        """Metric dict of one candidate on one fold."""
+        row = self.table[(self.table["candidate"] == candidate) & (self.table["fold"] == fold)]
+        if row.empty:
+            raise KeyError(f"No result for candidate {candidate!r} on fold {fold!r}")
+        return {column: float(row.iloc[0][column]) for column in METRIC_COLUMNS}
+
+    def summary(self):
+        """Mean and standard deviation of every metric per candidate across folds."""
+        grouped = self.table.groupby("candidate", sort=False)[METRIC_COLUMNS]
+        summary = grouped.mean().add_suffix("_mean").join(grouped.std(ddof=0).add_suffix("_std"))
+        return summary.reset_index()
+
+
+def run_evaluation(
+    frame,
+    candidates,
+    folds,
+    n_jobs=None,
+    output_csv=None,
+    keep_predictions=False,
+    work_dir=None,
+    verbose=True,
+):
+    """
+    Evaluate candidate models over folds of one labeled frame.
+
+    Args:
+        frame (pd.DataFrame): Rows with a ``label`` column (0/1) and the candidates' text columns
+        candidates (list[Candidate]): Models to evaluate
+        folds (list[Fold]): Train/test row positions; every candidate runs on every fold
+        n_jobs (int | None): Worker processes (default: CPU count; 1 runs in this process)
+        output_csv (str | None): Where to write the consolidated metrics table
+        keep_predictions (bool): Return y_true/y_pred/scores per (candidate, fold)
+        work_dir (str | None): Scratch folder for fold matrices (default: a temporary folder,
+            removed afterwards)
+        verbose (bool): Print progress lines
+
+    Returns:
+        EvaluationRun: Metrics table with one row per candidate and fold
+    """
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    if not candidates or not folds:
+        raise ValueError("run_evaluation needs at least one candidate and one fold")
+
+    names = [candidate.name for candidate in candidates]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Candidate names must be unique: {names}")
+
+    columns = sorted({candidate.features.text_column for candidate in candidates} | {"label"})
+    missing = [column for column in columns if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Frame is missing columns: {missing}")
+
+    owns_work_dir = work_dir is None
+    work_dir = tempfile.mkdtemp(prefix="evaluation-") if owns_work_dir else work_dir
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        corpus = frame[columns].reset_index(drop=True)
+        corpus["label"] = corpus["label"].astype(int)
+        corpus.to_pickle(os.path.join(work_dir, CORPUS_NAME))
+
+        # Stage 1: featurize each fold once per distinct feature configuration.
+        feature_keys = list(dict.fromkeys(candidate.features.key for candidate in candidates))
+        feature_by_key = {candidate.features.key: candidate.features for candidate in candidates}
+        featurize_jobs = []
+        prefixes = {}
+        for fold_index, fold in enumerate(folds):
+            for feature_index, key in enumerate(feature_keys):
+                prefix = os.path.join(work_dir, f"f{fold_index}_x{feature_index}")
+                prefixes[(fold.name, key)] = prefix
+                featurize_jobs.append(
+                    {
+                        "work_dir": work_dir,
+                        "prefix": prefix,
+                        "feature": feature_by_key[key],
+                        "fold": fold.name,
+                        "train_index": np.asarray(fold.train_index),
+                        "test_index": np.asarray(fold.test_index),
+                    }
+                )
+        if verbose:
+            print(
+                f"[System] Featurizing {len(folds)} fold(s) x {len(feature_keys)} feature configuration(s) "
+                f"with {min(n_jobs, len(featurize_jobs))} worker(s)..."
+            )
+        featurized = _run_jobs(
+            _featurize_job,
+            featurize_jobs,
+            n_jobs,
+            lambda job, result: (
+                f"Featurized {job['fold']} / {job['feature'].name}: "
+                f"{result['n_features']} features in {result['seconds']:.1f}s"
+            ),
+            verbose,
+        )
+        featurize_seconds = {
+            (job["fold"], job["feature"].key): result["seconds"] for job, result in zip(featurize_jobs, featurized)
+        }
+
+        # Stage 2: fit each distinct candidate on each fold.
+        fit_keys = list(dict.fromkeys(candidate.key for candidate in candidates))
+        candidate_by_key = {}
+        for candidate in candidates:
+            candidate_by_key.setdefault(candidate.key, candidate)
+        fit_jobs = []
+        for fold in folds:
+            for key in fit_keys:
+                candidate = candidate_by_key[key]
+                fit_jobs.append(
+                    {
+                        "work_dir": work_dir,
+                        "prefix": prefixes[(fold.name, candidate.features.key)],
+                        "candidate": candidate,
+                        "fold": fold.name,
+                        "train_index": np.asarray(fold.train_index),
+                        "test_index": np.asarray(fold.test_index),
+                        "keep_predictions": keep_predictions,
+                    }
+                )
+        if verbose:
+            print(f"[System] Fitting {len(fit_jobs)} model(s) with {min(n_jobs, len(fit_jobs))} worker(s)...")
+        fitted = _run_jobs(
+            _fit_job,
+            fit_jobs,
+            n_jobs,
+            lambda job, result: (
+                f"{job['fold']} | {job['candidate'].name}: f1={result['metrics']['f1']:.4f} "
+                f"recall={result['metrics']['recall']:.4f} ({result['fit_seconds']:.1f}s)"
+            ),
+            verbose,
+        )
+        fit_results = {(job["fold"], job["candidate"].key): result for job, result in zip(fit_jobs, fitted)}
+    finally:
+        if owns_work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    labels = frame["label"].to_numpy(dtype=int)
+    rows = []
+    predictions = {}
+    for candidate in candidates:
+        for fold in folds:
+            result = fit_results[(fold.name, candidate.key)]
+            rows.append(
+                {
+                    "candidate": candidate.name,
+                    "fold": fold.name,
+                    "features": candidate.features.name,
+                    **candidate.tags,
+                    "n_train": int(len(fold.train_index)),
+                    "n_test": int(len(fold.test_index)),
+                    "test_actions": int(labels[fold.test_index].sum()),
+                    **result["metrics"],
+                    "featurize_seconds": round(featurize_seconds[(fold.name, candidate.features.key)], 3),
+                    "fit_seconds": round(result["fit_seconds"], 3),
+                }
+            )
+            if keep_predictions:
+                predictions[(candidate.name, fold.name)] = result["predictions"]
+
+    table = pd.DataFrame(rows)
+    if output_csv:
+        os.makedirs(os.path.dirname(os.path.abspath(output_csv)), exist_ok=True)
+        table.to_csv(output_csv, index=False)
+        if verbose:
+            print(f"[System] Metrics table written to {output_csv}")
+    return EvaluationRun(table, predictions)
+
+
+def main():
+    from core.corpus_cache import DEFAULT_CORPUS_CACHE_DIR, DEFAULT_DATA_DIR, load_corpus
+
+    parser = argparse.ArgumentParser(description="Cross-validate the standard candidate models in parallel.")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Folder of labeled CSVs")
+    parser.add_argument("--cache-dir", default=DEFAULT_CORPUS_CACHE_DIR, help="Corpus cache folder")
+    parser.add_argument("--folds", type=int, default=5, help="Stratified folds")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--sample", type=int, default=None, help="Evaluate a random sample of this many rows")
+    parser.add_argument(
+        "--candidates",
+        default="sgd_hinge,sgd_word_char,naive_bayes",
+        help="Comma-separated subset of: sgd_hinge, sgd_word_char, naive_bayes",
+    )
+    parser.add_argument(
+        "--output",
+        default=os.path.join("output", "evaluation", "metrics_table.csv"),
+        help="Consolidated metrics table (CSV)",
+    )
+    args = parser.parse_args()
+
+    corpus = load_corpus(data_dir=args.data_dir, cache_dir=args.cache_dir, verbose=False)
+    if args.sample and args.sample < len(corpus):
+        corpus = corpus.sample(n=args.sample, random_state=42).reset_index(drop=True)
+    wanted = {name.strip() for name in args.candidates.split(",") if name.strip()}
+    candidates = [candidate for candidate in standard_candidates() if candidate.name in wanted]
+    print(f"[System] Corpus: {len(corpus)} rows | candidates: {[candidate.name for candidate in candidates]}")
+
+    run = run_evaluation(
+        corpus,
+        candidates,
+        kfold_folds(corpus["label"], n_splits=args.folds),
+        n_jobs=args.jobs,
+        output_csv=args.output,
+    )
+    print(run.summary().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
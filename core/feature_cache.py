@@ -0,0 +1,174 @@
+"""
+Hashed Feature-Matrix Cache
+Stores the CSR matrix a stateless vectorizer (HashingVectorizer) produces for a list of
+sentences, so evaluation, threshold sweeps, and re-scoring experiments skip featurization on
+repeat runs. Entries are keyed by the vectorizer parameters and a content hash of the sentences,
+so editing the corpus or changing n_features/ngram_range produces a new entry automatically.
+
+Each entry is a directory of plain .npy arrays (data, indices, indptr) that load memory-mapped;
+scipy's save_npz writes a zip archive, which numpy cannot map.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+
+FEATURE_CACHE_VERSION = 1
+DEFAULT_FEATURE_CACHE_DIR = os.path.join("output", "cache", "features")
+DEFAULT_MAX_ENTRIES = 16
+META_NAME = "meta.json"
+
+
+def vectorizer_fingerprint(vectorizer):
+    """Hash of the parameters that determine a stateless vectorizer's output."""
+    params = {}
+    for name, value in sorted(vectorizer.get_params().items()):
+        if callable(value) and not isinstance(value, type):
+            # Custom callables cannot be fingerprinted reliably; key them by qualified name.
+            value = f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', repr(value))}"
+        elif isinstance(value, type):
+            value = np.dtype(value).name if issubclass(value, np.generic) else value.__name__
+        elif isinstance(value, (tuple, set, frozenset)):
+            value = list(value)
+        params[name] = value
+    payload = json.dumps(
+        {"class": type(vectorizer).__name__, "params": params, "version": FEATURE_CACHE_VERSION},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def texts_fingerprint(texts):
+    """Content hash of an ordered list of sentences (row order matters for the matrix)."""
+    digest = hashlib.sha256()
+    for text in texts:
+        encoded = str(text).encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def _entry_dir(cache_dir, vectorizer_key, texts_key):
+    return os.path.join(cache_dir, f"{vectorizer_key[:12]}-{texts_key[:20]}")
+
+
+def _load_entry(entry_dir, mmap_mode):
+    with open(os.path.join(entry_dir, META_NAME), "r", encoding="utf-8") as handle:
+        meta = json.load(handle)
+    arrays = [np.load(os.path.join(entry_dir, f"{name}.npy"), mmap_mode=mmap_mode) for name in ("data", "indices", "indptr")]
+    matrix = sparse.csr_matrix(tuple(arrays), shape=tuple(meta["shape"]), copy=False)
+    # HashingVectorizer output is canonical; marking it avoids in-place sorting of read-only maps.
+    matrix.has_sorted_indices = True
+    os.utime(os.path.join(entry_dir, META_NAME))
+    return matrix
+
+
+def _write_entry(entry_dir, matrix, meta):
+    parent = os.path.dirname(entry_dir)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent, prefix=".features.")
+    try:
+        matrix = matrix.tocsr()
+        matrix.sort_indices()
+        np.save(os.path.join(staging, "data.npy"), matrix.data)
+        np.save(os.path.join(staging, "indices.npy"), matrix.indices)
+        np.save(os.path.join(staging, "indptr.npy"), matrix.indptr)
+        with open(os.path.join(staging, META_NAME), "w", encoding="utf-8") as handle:
+            json.dump(dict(meta, shape=list(matrix.shape), nnz=int(matrix.nnz)), handle, indent=2)
+        try:
+            os.replace(staging, entry_dir)
+        except OSError:
+            # Another process published the same entry first; keep theirs.
+            shutil.rmtree(staging, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def prune_feature_cache(cache_dir=DEFAULT_FEATURE_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES):
+    """Delete the least recently used entries beyond ``max_entries``."""
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for name in os.listdir(cache_dir):
+        meta_path = os.path.join(cache_dir, name, META_NAME)
+        if os.path.exists(meta_path):
+            entries.append((os.path.getmtime(meta_path), os.path.join(cache_dir, name)))
+    for _, path in sorted(entries, reverse=True)[max_entries:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def cached_transform(
+    vectorizer,
+    texts,
+    cache_dir=DEFAULT_FEATURE_CACHE_DIR,
+    mmap_mode="r",
+    max_entries=DEFAULT_MAX_ENTRIES,
+    verbose=True,
+):
+    """
+    Featurize sentences through the feature cache.
+
+    Only stateless vectorizers are cached; anything else (e.g. a fitted TfidfVectorizer) is
+    transformed directly because its output depends on fitted state.
+
+    Args:
+        vectorizer (HashingVectorizer): Vectorizer to apply
+        texts (iterable[str]): Sentences, in row order
+        cache_dir (str): Cache folder
+        mmap_mode (str | None): ``np.load`` mode for cached arrays ("r" maps them read-only)
+        max_entries (int): Entries kept before least recently used ones are removed
+        verbose (bool): Print cache hits and misses
+
+    Returns:
+        scipy.sparse.csr_matrix: One row per sentence
+    """
+    texts = [str(text) for text in texts]
+    if not isinstance(vectorizer, HashingVectorizer):
+        return vectorizer.transform(texts)
+
+    vectorizer_key = vectorizer_fingerprint(vectorizer)
+    texts_key = texts_fingerprint(texts)
+    entry_dir = _entry_dir(cache_dir, vectorizer_key, texts_key)
+
+    if os.path.exists(os.path.join(entry_dir, META_NAME)):
+        try:
+            matrix = _load_entry(entry_dir, mmap_mode)
+            if matrix.shape[0] == len(texts):
+                if verbose:
+                    print(f"[System] Feature cache hit: {matrix.shape[0]} rows ({os.path.basename(entry_dir)})")
+                return matrix
+        except (OSError, ValueError, KeyError) as error:
+            print(f"[Warning] Ignoring unreadable feature cache entry {entry_dir}: {error}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+    started = time.perf_counter()
+    matrix = vectorizer.transform(texts).tocsr()
+    elapsed = time.perf_counter() - started
+    try:
+        _write_entry(
+            entry_dir,
+            matrix,
+            {
+                "version": FEATURE_CACHE_VERSION,
+                "vectorizer": vectorizer_key,
+                "texts": texts_key,
+                "rows": len(texts),
+                "transform_seconds": round(elapsed, 3),
+            },
+        )
+        prune_feature_cache(cache_dir, max_entries)
+        if verbose:
+            print(f"[System] Feature cache miss: featurized {len(texts)} rows in {elapsed:.2f}s, cached")
+    except OSError as error:
+        print(f"[Warning] Could not write feature cache ({error}); continuing uncached.")
+    return matrix
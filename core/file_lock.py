@@ -0,0 +1,125 @@
+"""
+Cross-Process File Lock
+Exclusive lock on a small ``.lock`` file, used to serialize writers of shared on-disk state
+(model files, embedding cache) across threads and processes (GUI, Main.py, trainer).
+Each lock also holds a process-local lock for the same path, so threads of one process
+exclude each other even where the OS lock is per process.
+"""
+
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover - POSIX
+    msvcrt = None
+
+
+_THREAD_LOCKS = {}
+_THREAD_LOCKS_GUARD = threading.Lock()
+
+
+def _thread_lock_for(path):
+    with _THREAD_LOCKS_GUARD:
+        lock = _THREAD_LOCKS.get(path)
+        if lock is None:
+            lock = threading.Lock()
+            _THREAD_LOCKS[path] = lock
+        return lock
+
+
+class FileLock:
+    """Exclusive, non-reentrant lock shared by every thread and process using the same path."""
+
+    def __init__(self, path, poll_seconds=0.05):
+        """
+        Initialize the lock (nothing is acquired yet).
+
+        Args:
+            path (str): Lock file path (created if missing, never deleted)
+            poll_seconds (float): Retry interval while waiting for another process
+        """
+        self.path = os.path.abspath(path)
+        self.poll_seconds = float(poll_seconds)
+        self._thread_lock = _thread_lock_for(self.path)
+        self._handle = None
+
+    def _try_os_lock(self, handle):
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except OSError:
+                return False
+        if msvcrt is not None:
+            try:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                return False
+        return True
+
+    def acquire(self, blocking=True, timeout=None):
+        """
+        Acquire the lock.
+
+        Args:
+            blocking (bool): Wait for the lock (False returns immediately)
+            timeout (float | None): Maximum seconds to wait when blocking (None waits indefinitely)
+
+        Returns:
+            bool: True when the lock is now held
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not blocking:
+            acquired = self._thread_lock.acquire(blocking=False)
+        elif deadline is None:
+            acquired = self._thread_lock.acquire()
+        else:
+            acquired = self._thread_lock.acquire(timeout=max(0.0, deadline - time.monotonic()))
+        if not acquired:
+            return False
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            handle = open(self.path, "a+b")
+            while not self._try_os_lock(handle):
+                if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                    handle.close()
+                    self._thread_lock.release()
+                    return False
+                time.sleep(self.poll_seconds)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._handle = handle
+        return True
+
+    def release(self):
+        """Release the lock."""
+        handle, self._handle = self._handle, None
+        if handle is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            handle.close()
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,268 @@
+"""
+Multilingual Action Lexicon
+Single home for the English/Tagalog/Taglish marker families used to spot tasks, requests,
+and acknowledgements. Every family is compiled once at import time into one alternation
+(literal word lists are folded into a trie-shaped pattern), so a single scan of a sentence
+returns every hit together with its offset.
+"""
+
+import re
+from collections import namedtuple
+
+
+MarkerHit = namedtuple("MarkerHit", ["family", "start", "end", "text"])
+
+# Letters counted as part of a word when matching bare vocabulary (keeps "à", "ñ", etc. inside a word).
+WORD_CHARS = "A-Za-zÀ-ÿ'"
+
+_DAY_OR_TIME = (
+    r"tomorrow|today|monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"\d{1,2}(?:[:.]\d{2})?\s*(?:am|pm)?|eod|end of day|next week|next month"
+)
+
+
+def build_trie_pattern(words):
+    """
+    Fold a list of literal words/phrases into one trie-shaped regex alternation.
+
+    Shared prefixes are factored out (``send|sent|set`` -> ``se(?:nd|nt|t)``) so the regex
+    engine tests each leading character once instead of once per word.
+
+    Args:
+        words (iterable[str]): Literal words or phrases (matched case-insensitively by callers)
+
+    Returns:
+        str: Regex source without surrounding boundaries
+    """
+    trie = {}
+    for word in words:
+        word = str(word or "").lower()
+        if not word:
+            continue
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _render(node):
+        if "" in node and len(node) == 1:
+            return ""
+
+        optional = "" in node
+        branches = []
+        for char in sorted(key for key in node if key):
+            branches.append(re.escape(char) + _render(node[char]))
+
+        if len(branches) == 1 and not optional:
+            return branches[0]
+
+        # Longer branches first so the alternation prefers the longest word at a position.
+        branches.sort(key=len, reverse=True)
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if optional else body
+
+    return _render(trie)
+
+
+class MarkerLexicon:
+    """One compiled matcher over several named marker families."""
+
+    def __init__(self, families, flags=re.IGNORECASE):
+        """
+        Compile every family into a single alternation with one named group per family.
+
+        Args:
+            families (dict[str, list[str]]): Family name -> regex fragments (already bounded)
+            flags (int): Regex flags applied to the combined pattern
+        """
+        self.families = {name: list(patterns) for name, patterns in families.items()}
+        self._patterns = {
+            name: re.compile("|".join(f"(?:{fragment})" for fragment in patterns), flags)
+            for name, patterns in self.families.items()
+        }
+        self._combined = re.compile(
+            "|".join(
+                f"(?P<{name}>" + "|".join(f"(?:{fragment})" for fragment in patterns) + ")"
+                for name, patterns in self.families.items()
+            ),
+            flags,
+        )
+
+    def pattern(self, family):
+        """Return the compiled pattern for one family."""
+        return self._patterns[family]
+
+    def search(self, text, family=None):
+        """Return the first match in ``text`` (for one family, or any family), or None."""
+        regex = self._combined if family is None else self._patterns[family]
+        return regex.search(text or "")
+
+    def hits(self, text, families=None):
+        """
+        Scan ``text`` once and return every non-overlapping marker hit.
+
+        Args:
+            text (str): Text to scan
+            families (iterable[str] | None): Keep only hits from these families
+
+        Returns:
+            list[MarkerHit]: Hits in text order with family name and character offsets
+        """
+        wanted = None if families is None else set(families)
+        found = []
+        for match in self._combined.finditer(text or ""):
+            family = match.lastgroup
+            if wanted is not None and family not in wanted:
+                continue
+            found.append(MarkerHit(family, match.start(), match.end(), match.group(0)))
+        return found
+
+
+def _words(words):
+    """Bound a literal word list with ``\\b`` and fold it into one trie alternation."""
+    return [r"\b" + build_trie_pattern(words) + r"\b"]
+
+
+# Concrete task language checked by ActionItemClassifier._looks_like_specific_task.
+TASK_MARKERS = [
+    r"\bneeds? to\b",
+    r"\bassign(?:ed|ment)?\b",
+    r"\bby\s+(?:" + _DAY_OR_TIME + r")\b",
+] + _words([
+    "please", "should", "must", "will", "can you", "could you", "deadline", "follow up",
+    "action item", "owner", "responsible", "task", "deliverable", "submit", "send", "prepare",
+    "review", "complete", "finalize", "update", "coordinate",
+])
+
+OWNERSHIP_MARKERS = [
+    r"\bfor (?:you|us|him|her|them|the team|the group)\b",
+] + _words([
+    "assigned to", "you will", "you need to", "let's", "we need to", "this needs to",
+])
+
+DEADLINE_MARKERS = [
+    r"\b(?:by|before|within|due|until)\b.*\b(?:" + _DAY_OR_TIME + r")\b",
+]
+
+# Polite request markers and imperatives that usually start a new Tagalog/Taglish command.
+TAGALOG_COMMAND_MARKERS = [
+    r"\bpak[ia][a-z]*\b",
+] + _words([
+    "pwede", "tumalon", "sara", "bukas", "tawag", "ilipat", "tulong", "submit", "send", "prepare",
+])
+
+# Short acknowledgements and courtesy phrases that are never action items (whole-sentence match).
+INFORMATION_OVERRIDE_PATTERNS = [
+    r"thank you(?: so much)?",
+    r"thanks(?: everyone| all)?",
+    r"appreciate it",
+    r"noted",
+    r"received(?: with thanks)?",
+    r"copy that",
+    r"got it",
+    r"roger that",
+    r"understood",
+    r"acknowledged",
+    r"good (?:morning|afternoon|evening)(?: everyone)?",
+    r"welcome(?: everyone)?",
+    r"fyi",
+    r"for your information",
+    r"no further updates from the team",
+    r"nothing else to add",
+]
+
+# Request markers and action verbs (English + Tagalog) used to score and split exported action items.
+ACTION_VERBS = [
+    "please", "pwede", "paki", "can you", "could you", "need to", "must", "should", "due",
+    "submit", "send", "prepare", "review", "finalize", "update", "document", "record", "log", "check",
+    "coordinate", "schedule", "arrange", "execute", "create", "make", "build", "run", "close", "isolate",
+    "investigate", "implement", "validate", "configure", "analyze", "audit", "approve", "reject", "merge",
+    "revert", "release", "publish", "assign", "notify", "inform", "alert", "confirm", "clarify", "explain",
+    "summarize", "read", "write", "call", "test", "deploy", "fix", "produce", "handle", "simulate", "open",
+    "complete", "design", "form", "begin", "start",
+    "ipasa", "buksan", "isara", "ilagay", "tawagan", "asikaso", "ayos", "gawin", "tumalo", "tumalon",
+    "basahin", "magbasa", "magsulat", "isulat", "tingnan", "kunin", "sabihin", "tapusin", "simulan",
+    "tulungan", "bayaran", "ipadala", "ibigay",
+]
+
+# Record-keeping/scheduling verbs that split and score exported items but are too common in
+# information sentences to make a sentence an export fallback candidate on their own.
+NON_FALLBACK_ACTION_VERBS = frozenset({"document", "record", "log", "check", "coordinate", "schedule", "arrange"})
+FALLBACK_ACTION_VERBS = [verb for verb in ACTION_VERBS if verb not in NON_FALLBACK_ACTION_VERBS]
+
+# Vocabulary counted as action keywords in transcript analytics.
+ACTION_CUES = frozenset({
+    # English action verbs
+    "submit", "send", "prepare", "review", "complete", "finalize", "update",
+    "coordinate", "call", "follow", "draft", "deliver", "share", "check",
+    "run", "create", "close", "isolate", "document", "execute", "schedule",
+    "arrange", "investigate", "implement", "test", "deploy", "verify", "validate",
+    "configure", "analyze", "audit", "approve", "reject", "merge", "revert",
+    "fix", "patch", "release", "publish", "assign", "reassign", "escalate",
+    "notify", "inform", "alert", "confirm", "clarify", "explain", "summarize",
+    "start", "begin",
+    # Tagalog action verbs
+    "sara", "bukas", "tawag", "ilipat", "tulong", "asikaso", "ayos", "gawa",
+    "ipasa", "buksan", "isara", "ilagay", "ipaalam", "iupdate", "icheck",
+    "bigyan", "bayaran", "gatarin", "tiyakin", "suriin", "basahin", "sulatin",
+    "sabihin", "tanungin", "tumingin", "magsimula", "magtrabaho", "magpatibay",
+    "magbasa", "magsulat", "isulat", "simulan",
+    # Taglish blend
+    "idraft", "ireview", "isubmit", "idocument", "icoordinate",
+})
+
+
+TASK_LEXICON = MarkerLexicon({
+    "task": TASK_MARKERS,
+    "owner": OWNERSHIP_MARKERS,
+    "deadline": DEADLINE_MARKERS,
+})
+TAGALOG_COMMAND_PATTERN = re.compile("|".join(f"(?:{fragment})" for fragment in TAGALOG_COMMAND_MARKERS), re.IGNORECASE)
+INFORMATION_OVERRIDE_PATTERN = re.compile("|".join(f"(?:{fragment})" for fragment in INFORMATION_OVERRIDE_PATTERNS))
+ACTION_VERB_PATTERN = re.compile(r"\b" + build_trie_pattern(ACTION_VERBS) + r"\b", re.IGNORECASE)
+FALLBACK_ACTION_VERB_PATTERN = re.compile(r"\b" + build_trie_pattern(FALLBACK_ACTION_VERBS) + r"\b", re.IGNORECASE)
+ACTION_CUE_PATTERN = re.compile(
+    rf"(?<![{WORD_CHARS}])" + build_trie_pattern(ACTION_CUES) + rf"(?![{WORD_CHARS}])",
+    re.IGNORECASE,
+)
+
+
+def normalize_marker_text(sentence):
+    """Collapse whitespace, lowercase, and drop trailing punctuation before whole-sentence checks."""
+    return re.sub(r"\s+", " ", str(sentence or "")).strip().lower().rstrip(".?!,")
+
+
+def looks_like_specific_task(sentence):
+    """Return True when a sentence carries a task, ownership, or deadline marker."""
+    return TASK_LEXICON.search(str(sentence or "").lower().strip()) is not None
+
+
+def looks_like_information_override(sentence, max_words=12):
+    """Return True for short acknowledgements/courtesy phrases that carry no task marker."""
+    normalized = normalize_marker_text(sentence)
+    if not normalized:
+        return False
+
+    if looks_like_specific_task(normalized):
+        return False
+
+    if len(normalized.split()) > max_words:
+        return False
+
+    return INFORMATION_OVERRIDE_PATTERN.fullmatch(normalized) is not None
+
+
+def action_verb_hits(text):
+    """Return every action-verb hit in ``text`` with its offsets, from one scan."""
+    return [
+        MarkerHit("action_verb", match.start(), match.end(), match.group(0))
+        for match in ACTION_VERB_PATTERN.finditer(text or "")
+    ]
+
+
+def action_cue_hits(text):
+    """Return every analytics action cue in ``text`` (lowercased) with its offsets."""
+    return [
+        MarkerHit("action_cue", match.start(), match.end(), match.group(0).lower())
+        for match in ACTION_CUE_PATTERN.finditer(text or "")
+    ]
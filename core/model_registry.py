@@ -0,0 +1,337 @@
+"""
+Process-wide Model Registry
+Owns one loaded student per model path and hands out immutable snapshots (read-copy-update).
+Readers grab the current snapshot once per prediction; a reload or a publish after training
+builds a complete new snapshot and swaps the reference, so in-flight predictions never see a
+half-updated model. The registry polls the model file's mtime/size and confirms changes by
+content hash, so corrections saved by another process (e.g. Main.py) reach a running GUI.
+
+Model files are written under one writer lock per path (``writing``), shared by threads and
+processes. Reloads and pickle-to-store conversions take the same lock, never run while this
+process is writing, and never replace in-memory weights with a file older than them.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+from core.file_lock import FileLock
+from core.model_store import (
+    DEFAULT_VECTORIZER_SETTINGS,
+    MANIFEST_NAME,
+    load_model_store,
+    model_store_path,
+    save_model_store,
+    store_is_current,
+)
+
+
+# File timestamps can be coarse; a file this much older than in-memory weights is still trusted as newer.
+FILE_TIME_SLACK_SECONDS = 2.0
+
+
+def build_vectorizer(settings=None):
+    """Build the HashingVectorizer described by store/manifest vectorizer settings."""
+    settings = dict(DEFAULT_VECTORIZER_SETTINGS, **(settings or {}))
+    return HashingVectorizer(
+        n_features=int(settings["n_features"]),
+        ngram_range=tuple(settings["ngram_range"]),
+        alternate_sign=bool(settings["alternate_sign"]),
+    )
+
+
+class ModelSnapshot:
+    """Immutable view of one student version: model, vectorizer, and cached scoring weights."""
+
+    __slots__ = ("clf", "vectorizer", "manifest", "version", "coef_row", "intercept", "loaded_at")
+
+    def __init__(self, clf, vectorizer, manifest, version):
+        self.clf = clf
+        self.vectorizer = vectorizer
+        self.manifest = manifest
+        self.version = version
+        coef = np.asarray(clf.coef_)
+        # A view where possible (memory-mapped stores stay shared); published models are never
+        # trained in place, so the row cannot change under a reader.
+        self.coef_row = np.ascontiguousarray(coef.reshape(-1, coef.shape[-1])[0], dtype=np.float64)
+        self.intercept = float(np.asarray(clf.intercept_, dtype=np.float64).ravel()[0])
+        self.loaded_at = time.time()
+        if self.coef_row.shape[0] != vectorizer.n_features:
+            raise ValueError(
+                f"Model has {self.coef_row.shape[0]} weights but the vectorizer hashes into {vectorizer.n_features} features"
+            )
+
+
+class _Entry:
+    __slots__ = ("snapshot", "signature", "digest", "next_check", "lock", "writers", "update_lock")
+
+    def __init__(self):
+        self.snapshot = None
+        self.signature = None
+        self.digest = None
+        self.next_check = 0.0
+        self.lock = threading.Lock()
+        self.writers = 0
+        # Orders read -> train -> publish cycles; held without ``lock`` so readers never wait on training.
+        self.update_lock = threading.Lock()
+
+
+class ModelRegistry:
+    """Registry of hot-reloadable students keyed by absolute model path."""
+
+    def __init__(self, poll_interval=1.0):
+        """
+        Initialize the registry.
+
+        Args:
+            poll_interval (float): Minimum seconds between file checks for one model path
+        """
+        self.poll_interval = float(poll_interval)
+        self._entries = {}
+        self._entries_lock = threading.Lock()
+
+    def _entry(self, model_path):
+        key = os.path.abspath(model_path)
+        with self._entries_lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry()
+                self._entries[key] = entry
+            return key, entry
+
+    @staticmethod
+    def _lock_path(model_path):
+        return f"{model_store_path(os.path.abspath(model_path))}.lock"
+
+    def _watched_file(self, model_path):
+        """The file whose changes mean new weights: the store manifest if current, else the pickle."""
+        store_dir = model_store_path(model_path)
+        if store_is_current(model_path, store_dir):
+            return os.path.join(store_dir, MANIFEST_NAME)
+        return model_path
+
+    def _signature(self, model_path):
+        """Cheap change detector: (file, mtime_ns, size) of the watched file, or None if missing."""
+        watched = self._watched_file(model_path)
+        try:
+            stat = os.stat(watched)
+        except OSError:
+            return None
+        return (watched, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _digest(signature):
+        """Content hash of the watched file, used to ignore touches that did not change weights."""
+        if signature is None:
+            return None
+        digest = hashlib.sha256()
+        try:
+            with open(signature[0], "rb") as handle:
+                for block in iter(lambda: handle.read(1 << 20), b""):
+                    digest.update(block)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def _load(self, model_path, vectorizer_settings=None):
+        """Load weights for a path: current model store, else pickle (converted to a store), else a fresh model."""
+        store_dir = model_store_path(model_path)
+        if store_is_current(model_path, store_dir):
+            print(f"[System] Loading model store from {store_dir}...")
+            # Copy-on-write mapping: pages stay shared until the weights are trained further.
+            return load_model_store(store_dir, mmap_mode="c")
+
+        vectorizer_settings = dict(DEFAULT_VECTORIZER_SETTINGS, **(vectorizer_settings or {}))
+        if os.path.exists(model_path):
+            print(f"[System] Loading existing model from {model_path}...")
+            with open(model_path, "rb") as handle:
+                clf = pickle.load(handle)
+            try:
+                manifest = save_model_store(clf, store_dir, vectorizer_settings=vectorizer_settings)
+                print(f"[System] Converted model to store at {store_dir}")
+                return clf, manifest
+            except Exception as error:
+                print(f"[Warning] Could not write model store ({error}); staying on pickle.")
+                return clf, {"vectorizer": vectorizer_settings}
+
+        print("[System] Initializing new SVM model...")
+        clf = SGDClassifier(loss="hinge")
+        X_initial = build_vectorizer(vectorizer_settings).transform(["info", "please do this"])
+        clf.partial_fit(X_initial, [0, 1], classes=[0, 1])
+        return clf, {"vectorizer": vectorizer_settings}
+
+    def _make_snapshot(self, entry, clf, manifest, vectorizer=None):
+        version = (entry.snapshot.version + 1) if entry.snapshot is not None else 1
+        if vectorizer is None:
+            vectorizer = build_vectorizer((manifest or {}).get("vectorizer"))
+        return ModelSnapshot(clf, vectorizer, manifest, version)
+
+    def get(self, model_path, vectorizer_settings=None):
+        """
+        Return the current snapshot for a model path, loading or hot-reloading it as needed.
+
+        Args:
+            model_path (str): Pickle path of the student (its store directory sits next to it)
+            vectorizer_settings (dict | None): Vectorizer used when no store manifest records one
+
+        Returns:
+            ModelSnapshot: Snapshot to use for one complete prediction
+        """
+        _, entry = self._entry(model_path)
+        snapshot = entry.snapshot
+        now = time.monotonic()
+        if snapshot is not None and now < entry.next_check:
+            return snapshot
+
+        with entry.lock:
+            if entry.snapshot is not None and time.monotonic() < entry.next_check:
+                return entry.snapshot
+
+            entry.next_check = time.monotonic() + self.poll_interval
+            if entry.snapshot is not None and entry.writers:
+                # This process is writing the files; its own half-finished save is not an external change.
+                return entry.snapshot
+
+            signature = self._signature(model_path)
+            if entry.snapshot is not None and signature == entry.signature:
+                return entry.snapshot
+
+            digest = self._digest(signature)
+            if entry.snapshot is not None and digest is not None and digest == entry.digest:
+                entry.signature = signature
+                return entry.snapshot
+
+            if (
+                entry.snapshot is not None
+                and signature is not None
+                and signature[1] / 1e9 < entry.snapshot.loaded_at - FILE_TIME_SLACK_SECONDS
+            ):
+                # The file predates the weights held in memory (e.g. trained after it was saved); keep them.
+                entry.signature = signature
+                entry.digest = digest
+                return entry.snapshot
+
+            # Readers that already hold weights never wait for another process's write; they look again later.
+            lock = FileLock(self._lock_path(model_path))
+            if not lock.acquire(blocking=entry.snapshot is None):
+                return entry.snapshot
+            try:
+                if entry.snapshot is not None:
+                    print(f"[System] Model file changed on disk; reloading {model_path}")
+                clf, manifest = self._load(model_path, vectorizer_settings)
+                # Conversion may have written the store, so record what is on disk now.
+                entry.signature = self._signature(model_path)
+                entry.digest = self._digest(entry.signature)
+            finally:
+                lock.release()
+            entry.snapshot = self._make_snapshot(entry, clf, manifest)
+            return entry.snapshot
+
+    def publish(self, model_path, clf, manifest=None, vectorizer=None):
+        """
+        Swap in weights produced in this process (e.g. after ``partial_fit`` on a private copy).
+
+        The published model must not be modified afterwards; train a copy and publish again.
+        Use ``update`` when the new weights are derived from the current ones.
+
+        Args:
+            model_path (str): Model path the weights belong to
+            clf (SGDClassifier): Updated model
+            manifest (dict | None): Store manifest to keep (default: the current one)
+            vectorizer (HashingVectorizer | None): Vectorizer to keep (default: the current one)
+
+        Returns:
+            ModelSnapshot: The new current snapshot
+        """
+        _, entry = self._entry(model_path)
+        with entry.lock:
+            current = entry.snapshot
+            if manifest is None and current is not None:
+                manifest = current.manifest
+            if vectorizer is None and current is not None:
+                vectorizer = current.vectorizer
+            entry.snapshot = self._make_snapshot(entry, clf, manifest, vectorizer=vectorizer)
+            return entry.snapshot
+
+    def update(self, model_path, train_fn, manifest_fn=None, vectorizer_settings=None):
+        """
+        Derive new weights from the current snapshot and publish them, one update at a time per path.
+
+        Every classifier sharing the path goes through this lock, so two concurrent corrections
+        cannot both start from the same version and silently drop one update.
+
+        Args:
+            model_path (str): Model path to update
+            train_fn (callable): ``train_fn(clf)`` returning a new model; it must not modify ``clf``
+            manifest_fn (callable | None): ``manifest_fn(manifest)`` returning the manifest to keep
+            vectorizer_settings (dict | None): Passed to ``get`` if the path is not loaded yet
+
+        Returns:
+            ModelSnapshot: The new current snapshot
+        """
+        _, entry = self._entry(model_path)
+        with entry.update_lock:
+            current = self.get(model_path, vectorizer_settings=vectorizer_settings)
+            clf = train_fn(current.clf)
+            manifest = manifest_fn(current.manifest) if manifest_fn is not None else None
+            return self.publish(model_path, clf, manifest=manifest)
+
+    @contextmanager
+    def writing(self, model_path):
+        """
+        Hold the writer lock of a model path while its files are written.
+
+        The lock is shared by every thread and process, so two saves (or a save and a
+        pickle-to-store conversion) never interleave and delete each other's array files.
+        While it is held, ``get`` in this process keeps serving the in-memory snapshot, and
+        on success the written files are recorded as this process's own (see ``mark_persisted``).
+
+        Args:
+            model_path (str): Model path whose files are about to be written
+        """
+        _, entry = self._entry(model_path)
+        with entry.lock:
+            entry.writers += 1
+        try:
+            with FileLock(self._lock_path(model_path)):
+                yield
+                self.mark_persisted(model_path)
+        finally:
+            with entry.lock:
+                entry.writers -= 1
+
+    def mark_persisted(self, model_path):
+        """Record that this process just wrote the model files, so the write is not reloaded."""
+        _, entry = self._entry(model_path)
+        with entry.lock:
+            entry.signature = self._signature(model_path)
+            entry.digest = self._digest(entry.signature)
+            entry.next_check = time.monotonic() + self.poll_interval
+
+    def reload(self, model_path):
+        """Force the next ``get`` to check the model file immediately."""
+        _, entry = self._entry(model_path)
+        with entry.lock:
+            entry.next_check = 0.0
+            entry.signature = None
+
+
+_REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_model_registry():
+    """Return the process-wide model registry."""
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = ModelRegistry(poll_interval=float(os.getenv("MODEL_RELOAD_POLL_SECONDS", "1.0")))
+    return _REGISTRY
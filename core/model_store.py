@@ -0,0 +1,293 @@
+"""
+Student Model Store
+Versioned on-disk format for the SGD student: a directory holding ``manifest.json`` plus one
+``.npy`` file per fitted array. ``coef_`` can be memory-mapped, so several processes share one
+page-cached copy of the weights and startup skips unpickling.
+
+Layout::
+
+    svm_model_weights/
+        manifest.json          format/version, estimator params, scalar state, vectorizer
+                               settings, operating thresholds, and the array file names
+        coef_-<token>.npy      (n_classes, n_features) weights
+        intercept_-<token>.npy
+        classes_-<token>.npy
+        ...
+
+Array files carry a per-save token and ``manifest.json`` is replaced last (atomic rename). A save
+deletes only array files older than the version it replaces, so a reader that read the previous
+manifest can still open its arrays; a reader overtaken by two saves re-reads the manifest and
+retries. Writers are serialized by the registry's writer lock (``ModelRegistry.writing``).
+"""
+
+import argparse
+import json
+import os
+import pickle
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+
+MODEL_STORE_FORMAT = "svm-student-store"
+MODEL_STORE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+LOAD_ATTEMPTS = 3
+
+DEFAULT_VECTORIZER_SETTINGS = {
+    "n_features": 2**16,
+    "ngram_range": [1, 3],
+    "alternate_sign": False,
+}
+
+# Fitted attributes rebuilt from the estimator params instead of being stored.
+_DERIVED_ATTRIBUTES = {"_loss_function_"}
+
+
+def model_store_path(model_path):
+    """Return the store directory that sits next to a pickle path (``svm_model.pkl`` -> ``svm_model_weights``)."""
+    stem, _ = os.path.splitext(model_path)
+    return f"{stem}_weights"
+
+
+def _json_safe(value):
+    """Return a JSON-compatible copy of a scalar/param value, or raise TypeError."""
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (np.floating,)):
+        return float(value)
+    if isinstance(value, (np.bool_,)):
+        return bool(value)
+    if isinstance(value, tuple):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, list):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Unsupported value for model store: {type(value).__name__}")
+
+
+def _atomic_write_text(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    handle = tempfile.NamedTemporaryFile(
+        mode="w", encoding="utf-8", dir=directory, prefix=".manifest.", suffix=".tmp", delete=False
+    )
+    try:
+        with handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(handle.name, path)
+    except BaseException:
+        if os.path.exists(handle.name):
+            os.remove(handle.name)
+        raise
+
+
+def read_manifest(store_dir):
+    """Return the parsed manifest of a store, or None if the store is missing or unreadable."""
+    manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except Exception:
+        return None
+    if manifest.get("format") != MODEL_STORE_FORMAT:
+        return None
+    return manifest
+
+
+def save_model_store(clf, store_dir, vectorizer_settings=None, thresholds=None):
+    """
+    Write an SGD student to a versioned store directory.
+
+    Every ndarray attribute (``coef_``, ``intercept_``, ``classes_``, averaging buffers, ...)
+    becomes its own ``.npy`` file; params and scalar fitted state go into the manifest.
+
+    Args:
+        clf (SGDClassifier): Fitted student model
+        store_dir (str): Destination directory (created if missing)
+        vectorizer_settings (dict | None): HashingVectorizer n_features/ngram_range/alternate_sign
+        thresholds (dict | None): Operating thresholds (e.g. mode_thresholds, confidence_threshold)
+
+    Returns:
+        dict: The manifest that was written
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    previous = read_manifest(store_dir)
+    token = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+
+    arrays = {}
+    state = {}
+    for name, value in vars(clf).items():
+        if name in _DERIVED_ATTRIBUTES or name in clf.get_params():
+            continue
+        if isinstance(value, np.ndarray):
+            file_name = f"{name}-{token}.npy"
+            np.save(os.path.join(store_dir, file_name), np.ascontiguousarray(value), allow_pickle=False)
+            arrays[name] = {"file": file_name, "dtype": str(value.dtype), "shape": list(value.shape)}
+        else:
+            state[name] = _json_safe(value)
+
+    params = {}
+    for name, value in clf.get_params().items():
+        try:
+            params[name] = _json_safe(value)
+        except TypeError:
+            # e.g. a RandomState instance; it only affects future shuffling, not the weights.
+            params[name] = None
+
+    manifest = {
+        "format": MODEL_STORE_FORMAT,
+        "version": MODEL_STORE_VERSION,
+        "estimator": f"{type(clf).__module__}.{type(clf).__name__}",
+        "created_at": time.time(),
+        "params": params,
+        "state": state,
+        "arrays": arrays,
+        "vectorizer": _json_safe(dict(vectorizer_settings or DEFAULT_VECTORIZER_SETTINGS)),
+        "thresholds": _json_safe(dict(thresholds or {})),
+    }
+    _atomic_write_text(os.path.join(store_dir, MANIFEST_NAME), json.dumps(manifest, indent=2))
+
+    # Keep the replaced version's arrays for readers that already hold its manifest, and drop
+    # anything older. A reader may still have a file mapped, so failures (e.g. on Windows) are
+    # left for the next save to clean up.
+    live_files = {entry["file"] for entry in arrays.values()}
+    if previous is not None:
+        live_files.update(entry.get("file") for entry in previous.get("arrays", {}).values())
+    for file_name in os.listdir(store_dir):
+        if file_name.endswith(".npy") and file_name not in live_files:
+            try:
+                os.remove(os.path.join(store_dir, file_name))
+            except OSError:
+                pass
+    return manifest
+
+
+def load_model_store(store_dir, mmap_mode="c"):
+    """
+    Rebuild the SGD student from a store directory.
+
+    If a concurrent save removes the arrays of the manifest just read, the newer manifest is read
+    and loading starts over.
+
+    Args:
+        store_dir (str): Store directory written by ``save_model_store``
+        mmap_mode (str | None): ``np.load`` mode for ``coef_``; "r" shares read-only pages,
+            "c" (default) shares pages until the model is trained further, None loads into memory
+
+    Returns:
+        tuple[SGDClassifier, dict]: The model and its manifest
+    """
+    for attempt in range(1, LOAD_ATTEMPTS + 1):
+        manifest = read_manifest(store_dir)
+        if manifest is None:
+            raise FileNotFoundError(f"No model store found at {store_dir}")
+        if int(manifest.get("version", 0)) > MODEL_STORE_VERSION:
+            raise ValueError(
+                f"Model store version {manifest.get('version')} is newer than supported ({MODEL_STORE_VERSION})"
+            )
+        try:
+            return _build_from_manifest(store_dir, manifest, mmap_mode), manifest
+        except FileNotFoundError:
+            if attempt == LOAD_ATTEMPTS:
+                raise
+
+
+def _build_from_manifest(store_dir, manifest, mmap_mode):
+    from sklearn.linear_model import SGDClassifier
+
+    clf = SGDClassifier(**manifest.get("params", {}))
+    for name, value in manifest.get("state", {}).items():
+        setattr(clf, name, value)
+    for name, entry in manifest.get("arrays", {}).items():
+        path = os.path.join(store_dir, entry["file"])
+        setattr(clf, name, np.load(path, mmap_mode=mmap_mode if name == "coef_" else None, allow_pickle=False))
+
+    if hasattr(clf, "_get_loss_function"):
+        clf._loss_function_ = clf._get_loss_function(clf.loss)
+    return clf
+
+
+def store_is_current(model_path, store_dir=None):
+    """Return True when the store exists and is at least as new as the pickle next to it."""
+    store_dir = store_dir or model_store_path(model_path)
+    manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+    if read_manifest(store_dir) is None:
+        return False
+    if not os.path.exists(model_path):
+        return True
+    return os.path.getmtime(manifest_path) >= os.path.getmtime(model_path)
+
+
+def convert_pickle_to_store(model_path, store_dir=None, vectorizer_settings=None, thresholds=None):
+    """
+    Losslessly convert a pickled student (``svm_model.pkl``) into a model store.
+
+    Args:
+        model_path (str): Pickled SGDClassifier
+        store_dir (str | None): Destination (default: ``model_store_path(model_path)``)
+        vectorizer_settings (dict | None): Vectorizer settings to record
+        thresholds (dict | None): Operating thresholds to record
+
+    Returns:
+        str: The store directory
+    """
+    store_dir = store_dir or model_store_path(model_path)
+    with open(model_path, "rb") as handle:
+        clf = pickle.load(handle)
+    save_model_store(clf, store_dir, vectorizer_settings=vectorizer_settings, thresholds=thresholds)
+    return store_dir
+
+
+def load_student_model(model_path, mmap_mode="r"):
+    """
+    Load a student from a store directory, or from a pickle (preferring its current store).
+
+    Args:
+        model_path (str): Store directory or ``.pkl`` path
+        mmap_mode (str | None): Memory-map mode for ``coef_`` when loading from a store
+
+    Returns:
+        tuple[object, dict | None]: The model and the store manifest (None for pickles)
+    """
+    if os.path.isdir(model_path):
+        return load_model_store(model_path, mmap_mode=mmap_mode)
+
+    store_dir = model_store_path(model_path)
+    if store_is_current(model_path, store_dir):
+        return load_model_store(store_dir, mmap_mode=mmap_mode)
+
+    with open(model_path, "rb") as handle:
+        return pickle.load(handle), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a pickled SGD student into the memory-mappable model store.")
+    parser.add_argument("model_path", nargs="?", default="svm_model.pkl", help="Pickled model to convert")
+    parser.add_argument("--out", default=None, help="Store directory (default: <model>_weights)")
+    parser.add_argument("--verify", action="store_true", help="Check that decision_function matches after conversion")
+    args = parser.parse_args()
+
+    store_dir = convert_pickle_to_store(args.model_path, args.out)
+    print(f"[System] Model store written to {store_dir}")
+
+    if args.verify:
+        with open(args.model_path, "rb") as handle:
+            original = pickle.load(handle)
+        restored, _ = load_model_store(store_dir, mmap_mode="r")
+        rng = np.random.default_rng(0)
+        probe = rng.random((8, original.coef_.shape[1]))
+        same = np.array_equal(original.decision_function(probe), restored.decision_function(probe))
+        print(f"[System] decision_function identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Background Model Writer
+Debounces student-model saves onto a worker thread and writes them crash-safely
+(temp file in the same directory, fsync, then atomic rename over the target). The same thread
+also runs queued append jobs (e.g. the corrections CSV) in order, so callers never block on disk.
+"""
+
+import atexit
+import os
+import pickle
+import tempfile
+import threading
+import time
+import weakref
+from collections import deque
+
+
+# Seconds an idle worker thread waits for new work before exiting (it restarts on the next submit).
+IDLE_EXIT_SECONDS = 30.0
+
+# Live writers, flushed once at interpreter exit without keeping their owners alive.
+_LIVE_WRITERS = weakref.WeakSet()
+
+
+def _flush_live_writers():
+    for writer in list(_LIVE_WRITERS):
+        writer.flush()
+
+
+atexit.register(_flush_live_writers)
+
+
+def atomic_pickle_dump(obj, path, before_replace=None):
+    """
+    Pickle ``obj`` to ``path`` so readers only ever see the old or the new complete file.
+
+    Args:
+        obj (object): Object to pickle
+        path (str): Destination file
+        before_replace (callable | None): Called after the temp file is on disk and before it is
+            renamed over ``path`` (e.g. to write files that must not be older than the pickle)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    handle = tempfile.NamedTemporaryFile(
+        mode="wb",
+        dir=directory,
+        prefix=f".{os.path.basename(path)}.",
+        suffix=".tmp",
+        delete=False,
+    )
+    try:
+        with handle:
+            pickle.dump(obj, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            handle.flush()
+            os.fsync(handle.fileno())
+        if before_replace is not None:
+            before_replace()
+        os.replace(handle.name, path)
+    except BaseException:
+        if os.path.exists(handle.name):
+            os.remove(handle.name)
+        raise
+
+
+class ModelWriter:
+    """Single background thread that persists only the latest submitted model snapshot and runs queued jobs."""
+
+    def __init__(self, path, debounce_seconds=2.0, write_fn=None):
+        """
+        Initialize the writer.
+
+        Args:
+            path (str): Destination pickle file
+            debounce_seconds (float): Quiet period after the last submit before writing
+            write_fn (callable | None): ``write_fn(snapshot)`` persisting one snapshot
+                (default: ``atomic_pickle_dump`` to ``path``)
+        """
+        self.path = path
+        self.write_fn = write_fn or (lambda snapshot: atomic_pickle_dump(snapshot, self.path))
+        self.debounce_seconds = max(0.0, float(debounce_seconds))
+        self.writes = 0
+        self.last_error = None
+        self._cond = threading.Condition()
+        self._pending = None
+        self._due = 0.0
+        self._writing = False
+        self._flush_requested = False
+        self._jobs = deque()
+        self._thread = None
+        _LIVE_WRITERS.add(self)
+
+    def _ensure_thread(self):
+        # Caller holds ``_cond``.
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="model-writer", daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def submit(self, model_snapshot):
+        """Queue a snapshot for saving; a newer submit replaces any snapshot still waiting."""
+        with self._cond:
+            self._pending = model_snapshot
+            self._due = time.monotonic() + self.debounce_seconds
+            self._ensure_thread()
+
+    def enqueue(self, job, description="write"):
+        """
+        Run ``job()`` on the writer thread, in submission order and without debouncing.
+
+        Unlike snapshots, jobs are never coalesced, so appends (e.g. correction rows) are not lost.
+
+        Args:
+            job (callable): Disk write to perform
+            description (str): Label used in error messages
+        """
+        with self._cond:
+            self._jobs.append((job, description))
+            self._ensure_thread()
+
+    def _next_work(self):
+        """Block until a job or a due snapshot is ready; return it, or None once idle long enough."""
+        with self._cond:
+            while True:
+                if self._jobs:
+                    self._writing = True
+                    return self._jobs.popleft()
+
+                if self._pending is None:
+                    if not self._cond.wait(IDLE_EXIT_SECONDS) and self._pending is None and not self._jobs:
+                        # Exit when idle so the thread does not keep the owner alive.
+                        self._thread = None
+                        return None
+                    continue
+
+                remaining = self._due - time.monotonic()
+                if remaining > 0 and not self._flush_requested:
+                    self._cond.wait(remaining)
+                    continue
+
+                snapshot = self._pending
+                self._pending = None
+                self._writing = True
+                return (lambda: self.write_fn(snapshot)), None
+
+    def _run(self):
+        while True:
+            work = self._next_work()
+            if work is None:
+                return
+            job, description = work
+            try:
+                job()
+                if description is None:
+                    self.last_error = None
+                    print(f"[System] Model saved to {self.path}")
+            except Exception as error:
+                self.last_error = error
+                if description is None:
+                    print(f"[Error] Model save failed ({self.path}): {error}")
+                else:
+                    print(f"[Error] Background {description} failed: {error}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    if description is None:
+                        self.writes += 1
+                    self._cond.notify_all()
+
+    def pending(self):
+        """Return True while a snapshot or job is waiting or being written."""
+        with self._cond:
+            return self._pending is not None or bool(self._jobs) or self._writing
+
+    def flush(self, timeout=None):
+        """
+        Write any waiting snapshot and queued jobs now and block until they are on disk.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            bool: True when nothing is left to write
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            try:
+                while self._pending is not None or self._jobs or self._writing:
+                    if self._thread is None or not self._thread.is_alive():
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                return self._pending is None and not self._jobs and not self._writing
+            finally:
+                self._flush_requested = False
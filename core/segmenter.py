@@ -5,21 +5,26 @@ Handles semantic cosine segmentation of transcribed meeting text.
 
 import os
 import re
-import logging
-import warnings
+import threading
 from concurrent.futures import ThreadPoolExecutor
 
-import numpy as np
-
-try:
-    from sentence_transformers import SentenceTransformer
-except Exception:  # pragma: no cover - optional dependency
-    SentenceTransformer = None
-
-try:
-    from transformers import logging as hf_transformers_logging
-except Exception:  # pragma: no cover - optional dependency
-    hf_transformers_logging = None
+from core.bucketed_encoder import BucketedEncoder
+from core.embedding_backends import (
+    BACKEND_TORCH,
+    DEFAULT_EMBEDDING_MODEL,
+    EMBEDDING_BACKENDS,
+    embedding_cache_name,
+    load_embedding_backend,
+)
+from core.embedding_cache import DEFAULT_EMBEDDING_CACHE_DIR, shared_embedding_cache
+from core.topic_boundaries import (
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_DEPTH_CUTOFF,
+    DEFAULT_MIN_DEPTH,
+    DEFAULT_MIN_SEGMENT_SENTENCES,
+    block_similarities,
+    topic_starts,
+)
 
 try:
     from dotenv import load_dotenv
@@ -43,7 +48,14 @@ class Segmenter:
         chunk_size=5,
         max_tokens=1024,
         topical_model=None,
-        embedding_model_name="all-mpnet-base-v2",
+        embedding_model_name=None,
+        embedding_cache_dir=DEFAULT_EMBEDDING_CACHE_DIR,
+        embedding_backend=None,
+        encode_token_budget=None,
+        block_size=DEFAULT_BLOCK_SIZE,
+        depth_cutoff=DEFAULT_DEPTH_CUTOFF,
+        min_segment_sentences=DEFAULT_MIN_SEGMENT_SENTENCES,
+        min_depth=DEFAULT_MIN_DEPTH,
     ):
         """
         Initialize the Segmenter.
@@ -52,15 +64,45 @@ class Segmenter:
             chunk_size (int): Backward-compatible fallback size for unlabeled text
             max_tokens (int): Maximum token budget per segment
             topical_model (str | None): Groq model used for topical gist generation
-            embedding_model_name (str): Sentence embedding model for cosine segmentation
+            embedding_model_name (str | None): Sentence embedding model for cosine segmentation
+            embedding_cache_dir (str | None): Folder for cached sentence embeddings (None disables)
+            embedding_backend (str | None): Encoder runtime: "torch", "int8", "onnx" or "onnx-int8"
+            encode_token_budget (int | None): Padded tokens per encoding batch (None tunes it per machine)
+            block_size (int): Sentences averaged on each side of a gap when scoring topic shifts
+            depth_cutoff (float): Boundaries need a depth above mean + depth_cutoff * std of valley depths
+            min_segment_sentences (int): Fewest sentences in a topic segment (token limits may split further)
+            min_depth (float): Absolute depth every boundary must exceed, so topicless text is not split
         """
         self.chunk_size = chunk_size
         self.max_tokens = max_tokens
         self.topical_model = topical_model or os.getenv(
             "GROQ_TOPICAL_MODEL", "llama-3.1-8b-instant"
         )
-        self.embedding_model_name = embedding_model_name
+        self.embedding_model_name = embedding_model_name or os.getenv(
+            "SEGMENTER_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL
+        )
+        self.embedding_backend = embedding_backend or os.getenv("SEGMENTER_EMBEDDING_BACKEND", BACKEND_TORCH)
+        if self.embedding_backend not in EMBEDDING_BACKENDS:
+            raise ValueError(
+                f"Unknown embedding backend {self.embedding_backend!r}; choose from {', '.join(EMBEDDING_BACKENDS)}"
+            )
         self.embedding_model = None
+        self.encode_token_budget = encode_token_budget
+        self.block_size = block_size
+        self.depth_cutoff = depth_cutoff
+        self.min_segment_sentences = min_segment_sentences
+        self.min_depth = min_depth
+        self.sentence_encoder = None
+        # The segmenter is shared by live and post-meeting segmentation; load the model once.
+        self._load_lock = threading.RLock()
+        self.embedding_cache = (
+            shared_embedding_cache(
+                embedding_cache_name(self.embedding_model_name, self.embedding_backend),
+                cache_dir=embedding_cache_dir,
+            )
+            if embedding_cache_dir
+            else None
+        )
         self.groq_available = GROQ_AVAILABLE
         self.last_segment_metadata = []
 
@@ -86,32 +128,60 @@ class Segmenter:
         if self.embedding_model is not None:
             return self.embedding_model
 
-        if SentenceTransformer is None:
-            raise RuntimeError(
-                "Missing dependency: sentence-transformers. Run: pip install sentence-transformers"
-            )
+        with self._load_lock:
+            if self.embedding_model is None:
+                self.embedding_model = load_embedding_backend(self.embedding_model_name, self.embedding_backend)
+        return self.embedding_model
 
-        # Silence non-critical Hugging Face/transformers model-load warnings in CLI output.
-        logging.getLogger("huggingface_hub").setLevel(logging.ERROR)
-        logging.getLogger("transformers").setLevel(logging.ERROR)
-        logging.getLogger("sentence_transformers").setLevel(logging.ERROR)
-        warnings.filterwarnings("ignore", message=r".*HF Hub.*")
-        warnings.filterwarnings("ignore", message=r".*UNEXPECTED.*")
-        if hf_transformers_logging is not None:
-            hf_transformers_logging.set_verbosity_error()
+    def _load_sentence_encoder(self):
+        """Lazily wrap the embedding model in a length-bucketed batch encoder."""
+        if self.sentence_encoder is not None:
+            return self.sentence_encoder
+
+        with self._load_lock:
+            if self.sentence_encoder is None:
+                self.sentence_encoder = BucketedEncoder(
+                    self._load_embedding_model(),
+                    embedding_cache_name(self.embedding_model_name, self.embedding_backend),
+                    token_budget=self.encode_token_budget,
+                )
+        return self.sentence_encoder
 
-        self.embedding_model = SentenceTransformer(self.embedding_model_name)
-        return self.embedding_model
+    def _encode_sentences(self, sentences):
+        """Embed sentences with the sentence-transformer (unit-normalized rows)."""
+        return self._load_sentence_encoder().encode(sentences, normalize_embeddings=True)
+
+    def _similarity_from_embeddings(self, embeddings):
+        """Block cosine similarity across each gap between consecutive sentences."""
+        return block_similarities(embeddings, self.block_size)
+
+    def _embed_sentences(self, sentences):
+        """Embed sentences through the embedding cache when it is enabled."""
+        if self.embedding_cache is not None:
+            # The model is only loaded when some sentence has not been embedded before.
+            return self.embedding_cache.encode(sentences, self._encode_sentences)
+        return self._encode_sentences(sentences)
 
     def _compute_similarity_series(self, sentences):
-        """Compute cosine similarity between consecutive sentence embeddings."""
+        """Compute the block cosine similarity at every gap between consecutive sentences."""
         if len(sentences) < 2:
             return []
 
-        model = self._load_embedding_model()
-        embeddings = model.encode(sentences, convert_to_numpy=True, normalize_embeddings=True)
-        similarities = np.sum(embeddings[:-1] * embeddings[1:], axis=1)
-        return similarities.tolist()
+        return self._similarity_from_embeddings(self._embed_sentences(sentences)).tolist()
+
+    def _topic_starts(self, similarities):
+        """
+        Flag the sentences that open a new topic (token limits aside).
+
+        Boundaries are TextTiling depth-score valleys (see core/topic_boundaries.py).
+
+        Args:
+            similarities (list[float]): Block cosine similarity at each gap between sentences
+
+        Returns:
+            np.ndarray: Boolean flag per sentence (the first sentence is never flagged)
+        """
+        return topic_starts(similarities, self.depth_cutoff, self.min_segment_sentences, self.min_depth)
 
     def _build_segment_record(self, segment_sentences, segment_index):
         raw_text = " ".join(segment_sentences).strip()
@@ -189,35 +259,42 @@ class Segmenter:
             f"Segment text: {raw_text}"
         )
 
-    def segment_text(self, raw_text, max_tokens=None):
+    def segment_text(self, raw_text, max_tokens=None, sentence_table=None):
         """
         Segment raw transcribed text into semantic topic clusters.
 
         Args:
             raw_text (str): Raw transcribed text
             max_tokens (int | None): Optional override for the segment token limit
+            sentence_table (SentenceTable | None): Canonical sentence table for this transcript.
+                When given, its sentences are segmented (no re-splitting), its segment ids are
+                filled in, and each segment record carries its sentence ids and character span.
 
         Returns:
             list[str]: Context-rich topic strings ready for recursive summarization
         """
         token_limit = max_tokens or self.max_tokens
-        sentences = self._split_sentence_units(raw_text)
+        if sentence_table is not None:
+            sentences = list(sentence_table.sentences)
+            sentence_token_counts = sentence_table.token_counts.tolist()
+        else:
+            sentences = self._split_sentence_units(raw_text)
+            sentence_token_counts = [self.token_counter(sentence) for sentence in sentences]
         if not sentences:
             return []
 
-        similarities = self._compute_similarity_series(sentences)
+        topic_starts = self._topic_starts(self._compute_similarity_series(sentences))
 
         clusters = []
         current_cluster = []
         current_tokens = 0
 
         for index, sentence in enumerate(sentences):
-            sentence_tokens = self.token_counter(sentence)
+            sentence_tokens = sentence_token_counts[index]
             starts_new_topic = False
 
             if current_cluster:
-                similarity_to_previous = similarities[index - 1]
-                starts_new_topic = similarity_to_previous < 0
+                starts_new_topic = bool(topic_starts[index])
 
             exceeds_token_limit = current_cluster and (current_tokens + sentence_tokens > token_limit)
 
@@ -226,20 +303,28 @@ class Segmenter:
                 current_cluster = []
                 current_tokens = 0
 
-            current_cluster.append(sentence)
+            current_cluster.append(index)
             current_tokens += sentence_tokens
 
         if current_cluster:
             clusters.append(current_cluster)
 
         segments = [
-            self._build_segment_record(cluster_sentences, topic_index)
-            for topic_index, cluster_sentences in enumerate(clusters, 1)
+            self._build_segment_record([sentences[index] for index in cluster], topic_index)
+            for topic_index, cluster in enumerate(clusters, 1)
         ]
 
         if not segments:
             return []
 
+        if sentence_table is not None:
+            sentence_table.assign_segment_ranges(
+                [(segment["segment_id"], cluster[0], cluster[-1]) for segment, cluster in zip(segments, clusters)]
+            )
+            for segment, cluster in zip(segments, clusters):
+                segment["sentence_ids"] = list(cluster)
+                segment["start_char"], segment["end_char"] = sentence_table.segment_span(cluster[0], cluster[-1])
+
         with ThreadPoolExecutor(max_workers=min(4, len(segments))) as executor:
             descriptions = list(
                 executor.map(
@@ -268,6 +353,12 @@ class Segmenter:
         """
         return self.last_segment_metadata
 
+    def get_embedding_cache_stats(self):
+        """Return embedding cache hit/miss counters, or None when caching is disabled."""
+        if self.embedding_cache is None:
+            return None
+        return self.embedding_cache.stats()
+
     def print_segments(self, topic_segments):
         """
         Pretty-print segmentation results.
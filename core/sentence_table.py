@@ -0,0 +1,200 @@
+"""
+Canonical Sentence Table
+One sentence split per transcript, shared by the segmenter, classifier, and exporter.
+Each row carries a sentence id, its character span in the whitespace-normalized transcript,
+the segment it belongs to, and a whitespace token count. Splitters report each sentence's span
+as they cut the text, so spans are exact rather than searched for afterwards.
+"""
+
+import re
+
+import numpy as np
+
+
+UNASSIGNED_SEGMENT = 0
+SENTENCE_BREAK_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentence_spans(text):
+    """
+    Split text after sentence-final punctuation, keeping each sentence's character span.
+
+    Args:
+        text (str): Text to split (spans index into it as given)
+
+    Returns:
+        list[tuple[str, int, int]]: (sentence, start_char, end_char) for each non-empty sentence
+    """
+    text = str(text or "")
+    spans = []
+    start = 0
+    for match in [*SENTENCE_BREAK_PATTERN.finditer(text), None]:
+        end = match.start() if match is not None else len(text)
+        piece = text[start:end]
+        stripped = piece.strip()
+        if stripped:
+            offset = start + (len(piece) - len(piece.lstrip()))
+            spans.append((stripped, offset, offset + len(stripped)))
+        if match is not None:
+            start = match.end()
+    return spans
+
+
+def split_sentences(text):
+    """Sentence texts from ``split_sentence_spans``."""
+    return [sentence for sentence, _, _ in split_sentence_spans(text)]
+
+
+class SentenceTable:
+    """Column-oriented sentence table with interval lookups for segment membership."""
+
+    def __init__(self, text, sentences, starts, ends, token_counts, segment_ids=None):
+        """
+        Initialize the table from precomputed columns (see ``from_spans``).
+
+        Args:
+            text (str): Whitespace-normalized transcript the spans point into
+            sentences (list[str]): Sentence texts in transcript order
+            starts (array-like): Start character offset of each sentence
+            ends (array-like): End character offset (exclusive) of each sentence
+            token_counts (array-like): Whitespace token count of each sentence
+            segment_ids (array-like | None): Segment id per sentence (0 = unassigned)
+        """
+        self.text = text
+        self.sentences = list(sentences)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.token_counts = np.asarray(token_counts, dtype=np.int64)
+        if segment_ids is None:
+            segment_ids = np.full(len(self.sentences), UNASSIGNED_SEGMENT, dtype=np.int64)
+        self.segment_ids = np.asarray(segment_ids, dtype=np.int64)
+
+    @staticmethod
+    def normalize_text(raw_text):
+        """Collapse whitespace the same way every pipeline stage does before splitting."""
+        return re.sub(r"\s+", " ", str(raw_text or "")).strip()
+
+    @staticmethod
+    def count_tokens(text):
+        """Count tokens with the whitespace heuristic used by the segmenter."""
+        return len(re.findall(r"\S+", text or ""))
+
+    @classmethod
+    def from_spans(cls, text, spans):
+        """
+        Build a table from a splitter's sentences and the spans it cut them from.
+
+        Args:
+            text (str): Whitespace-normalized transcript (see ``normalize_text``) the spans index into
+            spans (list[tuple[str, int, int]]): (sentence, start_char, end_char) in transcript order
+
+        Returns:
+            SentenceTable: Table with segment ids left unassigned
+
+        Raises:
+            ValueError: If a span falls outside the text or overlaps the previous one
+        """
+        sentences = []
+        starts = []
+        ends = []
+        previous_end = 0
+        for sentence, start, end in spans:
+            start, end = int(start), int(end)
+            if not previous_end <= start <= end <= len(text):
+                raise ValueError(f"Sentence span ({start}, {end}) is out of order or outside the transcript")
+            sentences.append(sentence)
+            starts.append(start)
+            ends.append(end)
+            previous_end = end
+
+        token_counts = [cls.count_tokens(sentence) for sentence in sentences]
+        return cls(text, sentences, starts, ends, token_counts)
+
+    @classmethod
+    def from_text(cls, raw_text):
+        """
+        Build a table with the punctuation splitter (``split_sentence_spans``).
+
+        Args:
+            raw_text (str): Transcript text (normalized internally)
+
+        Returns:
+            SentenceTable: Table with segment ids left unassigned
+        """
+        text = cls.normalize_text(raw_text)
+        return cls.from_spans(text, split_sentence_spans(text))
+
+    def __len__(self):
+        return len(self.sentences)
+
+    @property
+    def ids(self):
+        """Sentence ids (row positions)."""
+        return np.arange(len(self.sentences), dtype=np.int64)
+
+    def has_segments(self):
+        """Return True once every sentence has been assigned to a segment."""
+        return bool(len(self.sentences)) and bool(np.all(self.segment_ids != UNASSIGNED_SEGMENT))
+
+    def assign_segment_ranges(self, segment_ranges):
+        """
+        Assign segment ids from contiguous sentence-id ranges.
+
+        Args:
+            segment_ranges (list[tuple[int, int, int]]): (segment_id, first_id, last_id) inclusive
+        """
+        for segment_id, first_id, last_id in segment_ranges:
+            self.segment_ids[int(first_id) : int(last_id) + 1] = int(segment_id)
+
+    def assign_segment_spans(self, segment_spans):
+        """
+        Assign segment ids by interval lookup on character offsets.
+
+        Each sentence belongs to the last segment whose start offset is at or before the
+        sentence start; sentences before the first segment fall into the first one.
+
+        Args:
+            segment_spans (list[tuple[int, int]]): (segment_id, start_char) per segment
+        """
+        if not segment_spans:
+            return
+
+        ordered = sorted(segment_spans, key=lambda span: span[1])
+        segment_ids = np.array([segment_id for segment_id, _ in ordered], dtype=np.int64)
+        segment_starts = np.array([start for _, start in ordered], dtype=np.int64)
+        positions = np.searchsorted(segment_starts, self.starts, side="right") - 1
+        self.segment_ids = segment_ids[np.clip(positions, 0, len(segment_ids) - 1)]
+
+    def segment_id_at(self, offset):
+        """Return the segment id of the sentence covering a character offset."""
+        if not self.sentences:
+            return UNASSIGNED_SEGMENT
+        position = int(np.searchsorted(self.starts, int(offset), side="right")) - 1
+        return int(self.segment_ids[max(0, position)])
+
+    def segment_span(self, first_id, last_id):
+        """Return the (start_char, end_char) span covering an inclusive sentence-id range."""
+        return int(self.starts[first_id]), int(self.ends[last_id])
+
+    def sentence_ids_in_segment(self, segment_id):
+        """Return the sentence ids assigned to one segment, in transcript order."""
+        return np.flatnonzero(self.segment_ids == int(segment_id)).tolist()
+
+    def rows(self):
+        """
+        Return the table as row dicts.
+
+        Returns:
+            list[dict]: Rows with sentence_id, text, start_char, end_char, segment_id, token_count
+        """
+        return [
+            {
+                "sentence_id": index,
+                "text": sentence,
+                "start_char": int(self.starts[index]),
+                "end_char": int(self.ends[index]),
+                "segment_id": int(self.segment_ids[index]),
+                "token_count": int(self.token_counts[index]),
+            }
+            for index, sentence in enumerate(self.sentences)
+        ]
@@ -0,0 +1,175 @@
+"""
+Pruned Sparse Student
+Magnitude-pruned copy of the SGD student: only weights above a threshold are kept, as sorted
+column-index/value arrays. Many tenant-specific students can live in one process because each
+holds a few thousand weights instead of a dense 65,536-float vector, and all of them share one
+HashingVectorizer per configuration.
+"""
+
+import json
+import threading
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+
+SPARSE_STUDENT_FORMAT = "svm-sparse-student"
+SPARSE_STUDENT_VERSION = 1
+
+_VECTORIZERS = {}
+_VECTORIZERS_LOCK = threading.Lock()
+
+
+def shared_vectorizer(n_features=2**16, ngram_range=(1, 3), alternate_sign=False):
+    """Return one process-wide HashingVectorizer per configuration (it is stateless)."""
+    key = (int(n_features), tuple(ngram_range), bool(alternate_sign))
+    with _VECTORIZERS_LOCK:
+        vectorizer = _VECTORIZERS.get(key)
+        if vectorizer is None:
+            vectorizer = HashingVectorizer(
+                n_features=key[0],
+                ngram_range=key[1],
+                alternate_sign=key[2],
+            )
+            _VECTORIZERS[key] = vectorizer
+        return vectorizer
+
+
+class SparseStudent:
+    """Binary linear student stored as sorted (index, value) weight arrays."""
+
+    def __init__(self, indices, values, intercept, n_features, vectorizer_settings=None, metadata=None):
+        """
+        Initialize the sparse student.
+
+        Args:
+            indices (array-like): Sorted hashed column ids with a kept weight
+            values (array-like): Weight for each kept column
+            intercept (float): Model intercept
+            n_features (int): Hashing space size of the original model
+            vectorizer_settings (dict | None): n_features/ngram_range/alternate_sign of the vectorizer
+            metadata (dict | None): Pruning details (threshold, kept count, source model, ...)
+        """
+        order = np.argsort(np.asarray(indices), kind="stable")
+        self.indices = np.ascontiguousarray(np.asarray(indices, dtype=np.int32)[order])
+        self.values = np.ascontiguousarray(np.asarray(values)[order])
+        self.intercept = float(intercept)
+        self.n_features = int(n_features)
+        self.vectorizer_settings = dict(
+            vectorizer_settings or {"n_features": self.n_features, "ngram_range": [1, 3], "alternate_sign": False}
+        )
+        self.metadata = dict(metadata or {})
+
+    @classmethod
+    def from_classifier(cls, clf, magnitude_threshold=None, keep_fraction=None, dtype=np.float32, vectorizer_settings=None):
+        """
+        Prune a fitted binary linear model.
+
+        Args:
+            clf (SGDClassifier): Fitted student with ``coef_`` of shape (1, n_features)
+            magnitude_threshold (float | None): Keep weights with ``|w| > threshold``
+            keep_fraction (float | None): Alternatively keep the largest-magnitude share of non-zeros
+            dtype (np.dtype): Storage dtype for the kept values
+            vectorizer_settings (dict | None): Vectorizer settings recorded with the weights
+
+        Returns:
+            SparseStudent: The pruned student
+        """
+        coef = np.asarray(clf.coef_, dtype=np.float64).reshape(-1)
+        magnitudes = np.abs(coef)
+        nonzero = magnitudes > 0
+
+        if keep_fraction is not None:
+            nonzero_magnitudes = np.sort(magnitudes[nonzero])[::-1]
+            keep = max(1, int(round(float(keep_fraction) * nonzero_magnitudes.size))) if nonzero_magnitudes.size else 0
+            threshold = float(nonzero_magnitudes[keep - 1]) if keep else 0.0
+            mask = magnitudes >= threshold
+            mask &= nonzero
+        else:
+            threshold = float(magnitude_threshold or 0.0)
+            mask = magnitudes > threshold
+
+        indices = np.flatnonzero(mask)
+        metadata = {
+            "magnitude_threshold": threshold,
+            "kept_weights": int(indices.size),
+            "nonzero_weights": int(nonzero.sum()),
+            "dense_weights": int(coef.size),
+            "value_dtype": np.dtype(dtype).name,
+        }
+        return cls(
+            indices,
+            coef[indices].astype(dtype),
+            float(np.asarray(clf.intercept_).ravel()[0]),
+            coef.size,
+            vectorizer_settings=vectorizer_settings,
+            metadata=metadata,
+        )
+
+    @property
+    def vectorizer(self):
+        """Process-wide vectorizer matching this student's hashing configuration."""
+        settings = self.vectorizer_settings
+        return shared_vectorizer(
+            settings.get("n_features", self.n_features),
+            settings.get("ngram_range", (1, 3)),
+            settings.get("alternate_sign", False),
+        )
+
+    @property
+    def nbytes(self):
+        """Memory held by the weight arrays."""
+        return int(self.indices.nbytes + self.values.nbytes)
+
+    def _weights_for(self, columns):
+        """Gather kept weights for hashed columns (0.0 for pruned columns) via binary search."""
+        positions = np.searchsorted(self.indices, columns)
+        positions = np.minimum(positions, max(0, self.indices.size - 1))
+        if self.indices.size == 0:
+            return np.zeros(len(columns), dtype=np.float64)
+        hit = self.indices[positions] == columns
+        return np.where(hit, self.values[positions].astype(np.float64), 0.0)
+
+    def decision_scores_from_features(self, features):
+        """Decision margins for a CSR feature matrix from the shared vectorizer."""
+        features = features.tocsr()
+        products = features.data * self._weights_for(features.indices)
+        row_ids = np.repeat(np.arange(features.shape[0]), np.diff(features.indptr))
+        return np.bincount(row_ids, weights=products, minlength=features.shape[0]) + self.intercept
+
+    def decision_scores(self, sentences):
+        """Decision margins for raw sentences."""
+        return self.decision_scores_from_features(self.vectorizer.transform(list(sentences)))
+
+    def predict(self, sentences, threshold=0.0):
+        """Binary labels (1 = action item) at the given decision threshold."""
+        return (self.decision_scores(sentences) >= threshold).astype(int)
+
+    def save(self, path):
+        """Write the student to a ``.npz`` file (arrays plus a JSON header)."""
+        header = {
+            "format": SPARSE_STUDENT_FORMAT,
+            "version": SPARSE_STUDENT_VERSION,
+            "intercept": self.intercept,
+            "n_features": self.n_features,
+            "vectorizer": self.vectorizer_settings,
+            "metadata": self.metadata,
+        }
+        with open(path, "wb") as handle:
+            np.savez(handle, indices=self.indices, values=self.values, header=np.array(json.dumps(header)))
+
+    @classmethod
+    def load(cls, path):
+        """Load a student written by ``save``."""
+        with np.load(path, allow_pickle=False) as payload:
+            header = json.loads(str(payload["header"]))
+            if header.get("format") != SPARSE_STUDENT_FORMAT:
+                raise ValueError(f"{path} is not a sparse student file")
+            return cls(
+                payload["indices"],
+                payload["values"],
+                header["intercept"],
+                header["n_features"],
+                vectorizer_settings=header.get("vectorizer"),
+                metadata=header.get("metadata"),
+            )
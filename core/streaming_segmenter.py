@@ -0,0 +1,341 @@
+"""
+Online Topic Segmentation
+Segments a live meeting while it is being transcribed. Sentences arrive one transcript line at a
+time (e.g. from ``AudioHandler.text_queue``), are embedded through the Segmenter's encoder and
+embedding cache, and scored with the same block cosine and depth rules as the batch Segmenter
+(core/topic_boundaries.py). A topic segment is emitted as soon as its closing boundary is confirmed,
+so the live UI and the classifier can work on finished topics mid-meeting; ``finalize`` closes the
+last open segment when the recording ends. Topical descriptions (one Groq call each) are generated
+on a single background describer thread, in closing order, so slow gist calls never hold up the
+sentences behind them; ``on_segment`` runs once a segment's description is ready.
+
+Working memory is bounded: a rolling window of ``2 * block_size`` embeddings, the sentences of the
+open segment, and running statistics of valley depths. Differences from batch segmentation:
+the relative depth threshold uses the valley depths seen so far (the first ``WARMUP_VALLEYS``
+candidates are held until the statistics settle; the absolute ``min_depth`` floor applies throughout), and boundaries are accepted in time order rather than deepest
+first.
+"""
+
+import math
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+
+from core.segmenter import Segmenter
+
+
+WARMUP_VALLEYS = 15
+END_OF_STREAM = None
+TRANSCRIPT_LINE_PATTERN = re.compile(r"^\[(?P<time>\d{1,2}:\d{2}(?::\d{2})?)\]\s*(?:(?P<speaker>[^:\]]{1,40}):\s*)?(?P<text>.*)$")
+
+
+class StreamingSegmenter:
+    """Incremental TextTiling-style segmenter that emits closed topic segments during a meeting."""
+
+    def __init__(self, segmenter=None, on_segment=None, describe_segments=True):
+        """
+        Initialize the streaming segmenter.
+
+        Args:
+            segmenter (Segmenter | None): Provides the encoder, cache, boundary settings, and token limit
+            on_segment (callable | None): Called with each closed segment record (on the describer
+                thread when ``describe_segments`` is set)
+            describe_segments (bool): Generate a topical description for each closed segment
+        """
+        self.segmenter = segmenter or Segmenter()
+        self.on_segment = on_segment
+        self.describe_segments = describe_segments
+        self.block_size = max(1, int(self.segmenter.block_size))
+        self.min_segment_sentences = max(1, int(self.segmenter.min_segment_sentences))
+        self.depth_cutoff = float(self.segmenter.depth_cutoff)
+        self.min_depth = float(self.segmenter.min_depth)
+        self.segments = []
+        self._lock = threading.Lock()
+        self._describer = None
+        self._descriptions = []
+        self._generation = 0
+        self.reset()
+
+    def reset(self):
+        """Forget all sentences and segments (e.g. when a recording is discarded)."""
+        with self._lock:
+            # Descriptions still pending for the old segments no longer reach ``on_segment``.
+            self._generation += 1
+            self._descriptions = []
+            self.segments = []
+            self._window = deque(maxlen=2 * self.block_size)
+            self._sentence_count = 0
+            self._open = []
+            self._open_start = 0
+            self._open_tokens = 0
+            self._scored_gaps = 0
+            self._last_score = None
+            self._before_last_score = None
+            self._last_left_peak = None
+            self._pending = None
+            self._candidates = []
+            self._depth_count = 0
+            self._depth_mean = 0.0
+            self._depth_m2 = 0.0
+
+    def add_text(self, line):
+        """
+        Feed one transcript line (``"[mm:ss] Speaker 1: text"`` or plain text).
+
+        ``[System]`` status lines are ignored.
+
+        Args:
+            line (str): Line as produced by the live transcriber
+
+        Returns:
+            list[dict]: Segments closed by this line
+        """
+        line = str(line or "").strip()
+        if not line or line.startswith("[System]"):
+            return []
+
+        timestamp = None
+        match = TRANSCRIPT_LINE_PATTERN.match(line)
+        if match:
+            timestamp = match.group("time")
+            line = match.group("text").strip()
+        units = self.segmenter._split_sentence_units(line)
+        if not units and len(line) > 5:
+            units = [line]
+        return self.add_sentences(units, timestamp=timestamp)
+
+    def add_sentences(self, sentences, timestamp=None):
+        """
+        Feed already split sentences.
+
+        Args:
+            sentences (list[str]): Sentences in spoken order
+            timestamp (str | None): Time label of the first sentence
+
+        Returns:
+            list[dict]: Segments closed by these sentences (their descriptions may still be pending)
+        """
+        sentences = [str(sentence) for sentence in sentences if str(sentence).strip()]
+        if not sentences:
+            return []
+
+        embeddings = np.asarray(self.segmenter._embed_sentences(sentences), dtype=np.float64)
+        closed = []
+        with self._lock:
+            for sentence, embedding in zip(sentences, embeddings):
+                closed.extend(self._add_sentence(sentence, embedding, timestamp))
+        return self._publish(closed)
+
+    def finalize(self):
+        """
+        Score the trailing gaps and close the last open segment, then wait for every pending
+        topical description.
+
+        Returns:
+            list[dict]: Segments closed by finalizing
+        """
+        closed = []
+        with self._lock:
+            last_index = self._sentence_count - 1
+            # Trailing gaps have clipped right blocks, as in batch segmentation.
+            while self._scored_gaps < last_index:
+                gap = self._scored_gaps
+                right = self._sentence_count - gap - 1
+                closed.extend(self._add_score(gap, self._window_score(right)))
+
+            if self._pending is not None:
+                # The last gap is a right peak by definition.
+                closed.extend(self._resolve_pending(self._last_score))
+            elif (
+                self._scored_gaps >= 2
+                and self._last_score < self._before_last_score
+                and self._last_left_peak is not None
+            ):
+                # A valley at the very last gap: its right peak is itself.
+                self._pending = (self._scored_gaps - 1, self._last_score, self._last_left_peak)
+                closed.extend(self._resolve_pending(self._last_score))
+            closed.extend(self._decide(final=True))
+
+            if self._open:
+                closed.append(self._close(len(self._open)))
+        self._publish(closed)
+        self.wait_for_descriptions()
+        return closed
+
+    def consume(self, text_queue):
+        """
+        Read transcript lines from a queue until ``END_OF_STREAM`` arrives.
+
+        Lines queued before the sentinel are all segmented, in order, on the calling thread.
+
+        Args:
+            text_queue (queue.Queue): Source of transcript lines
+        """
+        while True:
+            line = text_queue.get()
+            if line is END_OF_STREAM:
+                return
+            try:
+                self.add_text(line)
+            except Exception as error:
+                print(f"[Warning] Live segmentation skipped a line: {error}")
+
+    def wait_for_descriptions(self):
+        """Block until every topical description requested so far has been generated."""
+        with self._lock:
+            pending, self._descriptions = self._descriptions, []
+        wait(pending)
+
+    def get_segments(self):
+        """Closed segment records so far, oldest first."""
+        with self._lock:
+            return list(self.segments)
+
+    def topic_strings(self):
+        """Closed segments as context-rich strings (the shape ``Segmenter.segment_text`` returns)."""
+        return [self.segmenter._to_context_rich_string(segment) for segment in self.get_segments()]
+
+    def _publish(self, closed):
+        if not closed:
+            return closed
+        if not self.describe_segments:
+            for segment in closed:
+                self._notify(segment)
+            return closed
+
+        with self._lock:
+            if self._describer is None:
+                self._describer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="topic-describer")
+            generation = self._generation
+            self._descriptions = [future for future in self._descriptions if not future.done()]
+            for segment in closed:
+                self._descriptions.append(self._describer.submit(self._describe, segment, generation))
+        return closed
+
+    def _describe(self, segment, generation):
+        try:
+            segment["topical_description"] = self.segmenter._generate_topical_description(segment["raw_text"])
+        except Exception as error:
+            print(f"[Warning] Could not describe live topic {segment['segment_id']}: {error}")
+            segment["topical_description"] = self.segmenter._fallback_topical_description(segment["raw_text"])
+        if generation == self._generation:
+            self._notify(segment)
+
+    def _notify(self, segment):
+        if self.on_segment is None:
+            return
+        try:
+            self.on_segment(segment)
+        except Exception as error:
+            print(f"[Warning] Live topic callback failed: {error}")
+
+    def _add_sentence(self, sentence, embedding, timestamp):
+        closed = []
+        tokens = self.segmenter.token_counter(sentence)
+        if self._open and self._open_tokens + tokens > self.segmenter.max_tokens:
+            closed.append(self._close(len(self._open)))
+
+        self._open.append((sentence, tokens, timestamp))
+        self._open_tokens += tokens
+        self._window.append(embedding)
+        self._sentence_count += 1
+
+        # Gap g can be scored once its right block (sentences g+1 .. g+block_size) is complete.
+        gap = self._sentence_count - 1 - self.block_size
+        if gap >= 0:
+            closed.extend(self._add_score(gap, self._window_score(self.block_size)))
+        return closed
+
+    def _window_score(self, right_size):
+        """Block cosine for the gap ``right_size`` sentences before the newest one."""
+        window = np.asarray(self._window)
+        split = len(window) - right_size
+        left = window[max(0, split - self.block_size):split].sum(axis=0)
+        right = window[split:].sum(axis=0)
+        norms = np.linalg.norm(left) * np.linalg.norm(right)
+        return float(left @ right / norms) if norms > 0 else 0.0
+
+    def _add_score(self, gap, score):
+        closed = []
+        self._scored_gaps = gap + 1
+
+        # Climbing right from a pending valley stops where the curve first drops.
+        if self._pending is not None and self._last_score is not None and score < self._last_score:
+            closed.extend(self._resolve_pending(self._last_score))
+
+        # Climbing left from a gap stops at the nearest gap whose left neighbour is lower.
+        left_peak = score if self._last_score is None or self._last_score < score else self._last_left_peak
+
+        # The previous gap is a valley when it sits below its left neighbour and not above this one.
+        if self._last_score is not None and self._last_score <= score:
+            is_valley = self._before_last_score is None or self._last_score < self._before_last_score
+            if is_valley and self._last_left_peak is not None:
+                self._pending = (gap - 1, self._last_score, self._last_left_peak)
+
+        self._before_last_score = self._last_score
+        self._last_score = score
+        self._last_left_peak = left_peak
+        return closed
+
+    def _resolve_pending(self, right_peak):
+        gap, score, left_peak = self._pending
+        self._pending = None
+        depth = (left_peak - score) + (right_peak - score)
+        if depth <= 0:
+            return []
+
+        # Running mean/std of valley depths (Welford), including this valley.
+        self._depth_count += 1
+        delta = depth - self._depth_mean
+        self._depth_mean += delta / self._depth_count
+        self._depth_m2 += delta * (depth - self._depth_mean)
+        self._candidates.append((gap, depth))
+        if self._depth_count < WARMUP_VALLEYS:
+            # Too few depths for a stable threshold; hold the candidates until there are enough.
+            return []
+        return self._decide()
+
+    def _decide(self, final=False):
+        """Turn held candidate valleys into closed segments using the current depth threshold."""
+        candidates, self._candidates = self._candidates, []
+        if self._depth_count > 1:
+            threshold = self._depth_mean + self.depth_cutoff * math.sqrt(self._depth_m2 / self._depth_count)
+        else:
+            # A lone valley qualifies, as in batch segmentation.
+            threshold = 0.0
+        threshold = max(threshold, self.min_depth)
+
+        closed = []
+        for gap, depth in candidates:
+            if depth <= threshold:
+                continue
+            boundary = gap + 1
+            head = boundary - self._open_start
+            if head < self.min_segment_sentences or head > len(self._open):
+                continue
+            if final and self._sentence_count - boundary < self.min_segment_sentences:
+                continue
+            closed.append(self._close(head))
+        return closed
+
+    def _close(self, count):
+        """Emit the first ``count`` open sentences as a segment."""
+        sentences = self._open[:count]
+        self._open = self._open[count:]
+        self._open_tokens = sum(tokens for _, tokens, _ in self._open)
+        start = self._open_start
+        self._open_start += count
+
+        record = self.segmenter._build_segment_record([sentence for sentence, _, _ in sentences], len(self.segments) + 1)
+        record["sentence_ids"] = list(range(start, start + count))
+        record["start_time"] = next((timestamp for _, _, timestamp in sentences if timestamp), None)
+        record["metadata"] = {
+            "token_count": record["token_count"],
+            "char_count": record["char_count"],
+            "sentence_count": record["sentence_count"],
+        }
+        self.segments.append(record)
+        return record
@@ -0,0 +1,181 @@
+"""
+Vectorized Threshold Sweep
+One pass over scored rows yields the precision/recall/F1 curve at every distinct decision
+threshold: scores are sorted once and true/false positive counts come from cumulative sums, so
+re-tuning the operating modes costs one sort even on millions of rows.
+
+A row is predicted as an action item when ``score >= threshold`` (the classifier's convention).
+The chosen operating points are keyed like ``ActionItemClassifier.mode_thresholds`` and can be
+written into it directly.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+MODE_BALANCED = "balanced"
+MODE_HIGH_RECALL = "high_recall"
+
+
+def _counts_to_metrics(threshold, tp, fp, fn, tn):
+    """Metrics for one confusion matrix; F1 macro averages the action and information classes."""
+    f1_action = 2 * tp / (2 * tp + fp + fn) if (2 * tp + fp + fn) else 0.0
+    f1_info = 2 * tn / (2 * tn + fn + fp) if (2 * tn + fn + fp) else 0.0
+    return {
+        "threshold": float(threshold),
+        "precision": tp / (tp + fp) if tp + fp else 0.0,
+        "recall": tp / (tp + fn) if tp + fn else 0.0,
+        "f1": f1_action,
+        "f1_macro": (f1_action + f1_info) / 2.0,
+        "tp": int(tp),
+        "fp": int(fp),
+        "fn": int(fn),
+        "tn": int(tn),
+    }
+
+
+class ThresholdSweep:
+    """Confusion counts and precision/recall/F1 at every distinct threshold (descending)."""
+
+    def __init__(self, y_true, scores):
+        """
+        Sweep all thresholds of one scored set.
+
+        Args:
+            y_true (array-like): 0/1 labels
+            scores (array-like): Decision scores (higher means more likely an action item)
+        """
+        y_true = np.asarray(y_true).astype(bool).ravel()
+        scores = np.asarray(scores, dtype=np.float64).ravel()
+        if y_true.shape != scores.shape:
+            raise ValueError(f"Got {y_true.size} labels for {scores.size} scores")
+
+        # The one sort of the sweep; order among equal scores does not matter (runs are cut below).
+        order = np.argsort(-scores)
+        sorted_scores = scores[order]
+        sorted_true = y_true[order]
+
+        # Last row of each run of equal scores: predicting ">= that score" includes the whole run.
+        cut = np.flatnonzero(np.diff(sorted_scores)) if sorted_scores.size else np.empty(0, dtype=np.int64)
+        cut = np.r_[cut, sorted_scores.size - 1] if sorted_scores.size else cut
+
+        true_cumsum = np.cumsum(sorted_true, dtype=np.int64)
+        self.positives = int(true_cumsum[-1]) if true_cumsum.size else 0
+        self.negatives = int(scores.size - self.positives)
+
+        self.thresholds = sorted_scores[cut]
+        self.tp = true_cumsum[cut]
+        self.fp = (cut + 1) - self.tp
+        self.fn = self.positives - self.tp
+        self.tn = self.negatives - self.fp
+
+        predicted = self.tp + self.fp
+        self.precision = np.divide(self.tp, predicted, out=np.zeros(self.tp.shape), where=predicted > 0)
+        self.recall = (
+            self.tp / self.positives if self.positives else np.zeros(self.tp.shape, dtype=np.float64)
+        )
+        f1_denominator = 2 * self.tp + self.fp + self.fn
+        self.f1 = np.divide(2 * self.tp, f1_denominator, out=np.zeros(self.tp.shape), where=f1_denominator > 0)
+
+    def __len__(self):
+        return int(self.thresholds.size)
+
+    def _best(self, eligible, primary, secondary):
+        """Index maximizing ``primary`` (ties: ``secondary``, then the lower threshold) among ``eligible``."""
+        if not eligible.any():
+            return None
+        primary = np.where(eligible, primary, -np.inf)
+        tied = primary == primary.max()
+        secondary = np.where(tied, secondary, -np.inf)
+        # Thresholds are descending, so the last tied index is the lowest threshold.
+        return int(np.flatnonzero(secondary == secondary.max())[-1])
+
+    def best_f1_index(self):
+        """Index of the threshold with the highest action-class F1 (ties: higher recall)."""
+        return self._best(np.ones(len(self), dtype=bool), self.f1, self.recall)
+
+    def high_recall_index(self, target_recall=0.95):
+        """Index of the most precise threshold reaching ``target_recall`` (else the highest recall)."""
+        index = self._best(self.recall >= target_recall, self.precision, self.recall)
+        if index is None:
+            index = self._best(np.ones(len(self), dtype=bool), self.recall, self.precision)
+        return index
+
+    def high_precision_index(self, target_precision=0.95):
+        """Index of the highest-recall threshold reaching ``target_precision`` (else the highest precision)."""
+        index = self._best(self.precision >= target_precision, self.recall, self.precision)
+        if index is None:
+            index = self._best(np.ones(len(self), dtype=bool), self.precision, self.recall)
+        return index
+
+    def threshold(self, index, default=0.0):
+        """Threshold at a curve index (``default`` for an empty sweep)."""
+        return default if index is None else float(self.thresholds[index])
+
+    def point(self, index):
+        """Counts and metrics at one curve index."""
+        if index is None:
+            return None
+        return _counts_to_metrics(
+            self.thresholds[index],
+            int(self.tp[index]),
+            int(self.fp[index]),
+            int(self.fn[index]),
+            int(self.tn[index]),
+        )
+
+    def at(self, threshold):
+        """Counts and metrics when predicting ``score >= threshold`` for an arbitrary threshold."""
+        # ``count`` curve thresholds are >= ``threshold``; the last of them closes the prediction set.
+        count = int(np.searchsorted(-self.thresholds, -float(threshold), side="right"))
+        if count == 0:
+            tp = fp = 0
+        else:
+            tp, fp = int(self.tp[count - 1]), int(self.fp[count - 1])
+        return _counts_to_metrics(threshold, tp, fp, self.positives - tp, self.negatives - fp)
+
+    def mode_thresholds(self, target_recall=0.95, default=0.0):
+        """
+        Operating thresholds for the classifier's modes.
+
+        ``MODE_BALANCED`` is the best-F1 threshold; ``MODE_HIGH_RECALL`` is the most precise
+        threshold that reaches ``target_recall``.
+
+        Args:
+            target_recall (float): Recall the high-recall mode must reach
+            default (float): Threshold used when there is nothing to sweep
+
+        Returns:
+            dict: {MODE_BALANCED: float, MODE_HIGH_RECALL: float}
+        """
+        return {
+            MODE_BALANCED: self.threshold(self.best_f1_index(), default),
+            MODE_HIGH_RECALL: self.threshold(self.high_recall_index(target_recall), default),
+        }
+
+    def operating_points(self, target_recall=0.95):
+        """Metrics at each mode's threshold, keyed by mode."""
+        return {
+            MODE_BALANCED: self.point(self.best_f1_index()),
+            MODE_HIGH_RECALL: self.point(self.high_recall_index(target_recall)),
+        }
+
+    def to_frame(self):
+        """The full curve as a DataFrame (one row per distinct threshold, descending)."""
+        return pd.DataFrame(
+            {
+                "threshold": self.thresholds,
+                "precision": self.precision,
+                "recall": self.recall,
+                "f1": self.f1,
+                "tp": self.tp,
+                "fp": self.fp,
+                "fn": self.fn,
+                "tn": self.tn,
+            }
+        )
+
+
+def sweep_thresholds(y_true, scores):
+    """Build a ``ThresholdSweep`` for labels and decision scores."""
+    return ThresholdSweep(y_true, scores)
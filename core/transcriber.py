@@ -4,12 +4,13 @@ Handles both Groq and Local Whisper transcriptions.
 """
 
 import os
-import re
 import time
 import tempfile
 from faster_whisper import WhisperModel
 import scipy.io.wavfile as wav
 
+from integrations.groq.rate_limits import recommended_wait_seconds
+
 try:
     from integrations.groq.transcribe import transcribe_with_groq
     GROQ_AVAILABLE = True
@@ -33,24 +34,6 @@ class Transcriber:
             self.local_model = WhisperModel(model_size, device="cpu", compute_type="int8")
         return self.local_model
 
-    def _recommended_wait_seconds(self, error, attempt):
-        """Derive retry wait from Groq rate-limit messages, with safe fallback."""
-        msg = str(error)
-        lowered = msg.lower()
-
-        # Parse text like: "Please try again in 1m3.5s"
-        match = re.search(r"try again in\s*(?:(\d+)m)?\s*(\d+(?:\.\d+)?)s", lowered)
-        if match:
-            minutes = int(match.group(1) or 0)
-            seconds = float(match.group(2) or 0)
-            return max(1, int(minutes * 60 + seconds + 1))
-
-        # For generic rate-limit errors, use slower exponential backoff.
-        if "429" in lowered or "rate_limit" in lowered or "rate limit" in lowered:
-            return min(120, 8 * attempt)
-
-        return min(30, 2 * attempt)
-
     def transcribe_with_groq_retries(
         self,
         file_path,
@@ -81,7 +64,7 @@ class Transcriber:
                     is_rate_limit_error = True
 
                 if attempt < retries:
-                    wait_s = self._recommended_wait_seconds(e, attempt)
+                    wait_s = recommended_wait_seconds(e, attempt)
                     print(
                         f"[System] Groq attempt {attempt}/{retries} failed: {e}. "
                         f"Retrying in {wait_s}s..."
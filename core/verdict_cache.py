@@ -0,0 +1,167 @@
+"""
+Model-Lllama Verdict Cache
+Persists Groq verification verdicts in SQLite so repeated sentences never cost a second API call.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_VERDICT_CACHE_PATH = os.path.join("output", "cache", "model_llama_verdicts.sqlite3")
+
+
+class VerdictCache:
+    """Content-addressed, TTL/size-bounded SQLite store for Model-Lllama verdicts."""
+
+    def __init__(self, db_path=DEFAULT_VERDICT_CACHE_PATH, ttl_seconds=30 * 24 * 3600, max_entries=50000):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path (str): SQLite file used to persist verdicts
+            ttl_seconds (int | None): Entries older than this are treated as misses and purged
+            max_entries (int | None): Least-recently-used entries beyond this count are evicted
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @staticmethod
+    def hash_text(text):
+        """Return a stable SHA-256 digest for a block of prompt context."""
+        return hashlib.sha256(str(text or "").encode("utf-8")).hexdigest()
+
+    @classmethod
+    def make_key(cls, model_name, prompt_version, sentence, context):
+        """Build the content address from model, prompt version, sentence, and context hash."""
+        material = json.dumps(
+            [str(model_name), str(prompt_version), str(sentence or ""), cls.hash_text(context)],
+            ensure_ascii=False,
+        )
+        return cls.hash_text(material)
+
+    def _connect(self):
+        if self._conn is not None:
+            return self._conn
+
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " prompt_version TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL"
+            ")"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_verdicts_accessed ON verdicts(accessed_at)")
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    def _is_expired(self, created_at, now):
+        return self.ttl_seconds is not None and (now - created_at) > self.ttl_seconds
+
+    def get(self, key):
+        """Return the cached verdict dict for a key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT payload, created_at FROM verdicts WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            payload, created_at = row
+            if self._is_expired(created_at, now):
+                conn.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+                conn.commit()
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE verdicts SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+
+        try:
+            return json.loads(payload)
+        except Exception:
+            return None
+
+    def put(self, key, verdict, model_name="", prompt_version=""):
+        """Store a verdict dict and apply TTL/size eviction."""
+        now = time.time()
+        payload = json.dumps(verdict, ensure_ascii=False, default=str)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, model, prompt_version, payload, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, str(model_name), str(prompt_version), payload, now, now),
+            )
+            self.writes += 1
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn, now):
+        if self.ttl_seconds is not None:
+            conn.execute("DELETE FROM verdicts WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        if self.max_entries is not None:
+            (count,) = conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()
+            overflow = count - int(self.max_entries)
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM verdicts WHERE key IN ("
+                    " SELECT key FROM verdicts ORDER BY accessed_at ASC LIMIT ?"
+                    ")",
+                    (overflow,),
+                )
+
+    def clear(self):
+        """Remove every cached verdict."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM verdicts")
+            conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the current entry count."""
+        with self._lock:
+            conn = self._connect()
+            (entries,) = conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "entries": int(entries),
+            "db_path": self.db_path,
+        }
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
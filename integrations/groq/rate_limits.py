@@ -0,0 +1,33 @@
+"""
+Groq Rate-Limit Helpers
+Shared retry timing for every Groq caller (transcription, audits, the GUI fallback path).
+"""
+
+import re
+
+
+RETRY_HINT_PATTERN = re.compile(r"try again in\s*(?:(\d+)m)?\s*(\d+(?:\.\d+)?)s")
+
+
+def is_rate_limit_error(error):
+    """Return True when a Groq error is a 429 / rate-limit response."""
+    lowered = str(error).lower()
+    return "429" in lowered or "rate_limit" in lowered or "rate limit" in lowered
+
+
+def recommended_wait_seconds(error, attempt):
+    """Derive retry wait from Groq rate-limit messages, with safe fallback."""
+    lowered = str(error).lower()
+
+    # Parse text like: "Please try again in 1m3.5s"
+    match = RETRY_HINT_PATTERN.search(lowered)
+    if match:
+        minutes = int(match.group(1) or 0)
+        seconds = float(match.group(2) or 0)
+        return max(1, int(minutes * 60 + seconds + 1))
+
+    # For generic rate-limit errors, use slower exponential backoff.
+    if is_rate_limit_error(lowered):
+        return min(120, 8 * attempt)
+
+    return min(30, 2 * attempt)
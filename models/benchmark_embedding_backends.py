@@ -0,0 +1,236 @@
+"""
+Benchmark sentence-embedding backends for cosine segmentation.
+
+Encodes the same transcripts with each model/backend pair (see core/embedding_backends.py) and
+reports load time, sentences/sec (plain ``encode`` batching and the length-bucketed encoder from
+core/bucketed_encoder.py), and how closely its topic boundaries and similarity series
+agree with the baseline (the first pair, by default the fp32 all-mpnet-base-v2 model).
+
+Usage:
+    python models/benchmark_embedding_backends.py --transcripts 20
+    python models/benchmark_embedding_backends.py --pairs all-mpnet-base-v2:torch,all-MiniLM-L6-v2:onnx-int8
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+DEFAULT_TRANSCRIPT_CSV = os.path.join(DATA_DIR, "ami_dialogues_paragraphs_merged.csv")
+OUTPUT_CSV = os.path.join(PROJECT_ROOT, "output", "evaluation", "embedding_backends.csv")
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.bucketed_encoder import BucketedEncoder
+from core.embedding_backends import (
+    BACKEND_INT8,
+    BACKEND_ONNX,
+    BACKEND_ONNX_INT8,
+    BACKEND_TORCH,
+    DEFAULT_EMBEDDING_MODEL,
+    SMALL_EMBEDDING_MODEL,
+    embedding_cache_name,
+)
+from core.segmenter import Segmenter
+
+
+DEFAULT_PAIRS = [
+    (DEFAULT_EMBEDDING_MODEL, BACKEND_TORCH),
+    (DEFAULT_EMBEDDING_MODEL, BACKEND_INT8),
+    (DEFAULT_EMBEDDING_MODEL, BACKEND_ONNX),
+    (DEFAULT_EMBEDDING_MODEL, BACKEND_ONNX_INT8),
+    (SMALL_EMBEDDING_MODEL, BACKEND_TORCH),
+    (SMALL_EMBEDDING_MODEL, BACKEND_ONNX_INT8),
+]
+
+
+def parse_pairs(value: str) -> List[Tuple[str, str]]:
+    """Parse "model:backend,model:backend" (backend defaults to torch)."""
+    pairs = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        model_name, _, backend = item.rpartition(":") if ":" in item else (item, "", BACKEND_TORCH)
+        pairs.append((model_name, backend or BACKEND_TORCH))
+    return pairs
+
+
+def load_transcripts(csv_path: str, text_column: str, limit: int) -> List[List[str]]:
+    """Split the first ``limit`` transcripts into the Segmenter's sentence units."""
+    df = pd.read_csv(csv_path)
+    splitter = Segmenter(embedding_cache_dir=None)
+    transcripts = []
+    for text in df[text_column].dropna().astype(str):
+        sentences = splitter._split_sentence_units(text)
+        if len(sentences) >= 2:
+            transcripts.append(sentences)
+        if len(transcripts) >= limit:
+            break
+    return transcripts
+
+
+def boundary_agreement(reference: np.ndarray, candidate: np.ndarray, tolerance: int) -> Tuple[float, float, float]:
+    """Precision/recall/F1 of candidate topic starts against reference ones, within ``tolerance`` sentences."""
+    reference_index = np.flatnonzero(reference)
+    candidate_index = np.flatnonzero(candidate)
+    if reference_index.size == 0 and candidate_index.size == 0:
+        return 1.0, 1.0, 1.0
+    if reference_index.size == 0 or candidate_index.size == 0:
+        return 0.0, 0.0, 0.0
+    distance = np.abs(candidate_index[:, None] - reference_index[None, :])
+    precision = float(np.mean(distance.min(axis=1) <= tolerance))
+    recall = float(np.mean(distance.min(axis=0) <= tolerance))
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def benchmark_pair(model_name: str, backend: str, transcripts: List[List[str]], batch_size: int):
+    """Encode every transcript with one backend; return timing and per-transcript similarity series."""
+    segmenter = Segmenter(embedding_model_name=model_name, embedding_backend=backend, embedding_cache_dir=None)
+    started = time.perf_counter()
+    model = segmenter._load_embedding_model()
+    load_seconds = time.perf_counter() - started
+
+    # Warm-up so one-time graph/session setup is not charged to throughput.
+    model.encode(transcripts[0][:8], convert_to_numpy=True, normalize_embeddings=True, batch_size=batch_size)
+
+    series = []
+    sentence_count = 0
+    started = time.perf_counter()
+    for sentences in transcripts:
+        embeddings = np.asarray(
+            model.encode(sentences, convert_to_numpy=True, normalize_embeddings=True, batch_size=batch_size),
+            dtype=np.float32,
+        )
+        series.append(segmenter._similarity_from_embeddings(embeddings))
+        sentence_count += len(sentences)
+    encode_seconds = time.perf_counter() - started
+    return segmenter, load_seconds, sentence_count / encode_seconds if encode_seconds else float("inf"), series
+
+
+def benchmark_bucketed(segmenter: Segmenter, transcripts: List[List[str]], series: List[np.ndarray], token_budget):
+    """Time the length-bucketed encoder on the same transcripts; return throughput, budget and max series drift."""
+    encoder = BucketedEncoder(
+        segmenter._load_embedding_model(),
+        embedding_cache_name(segmenter.embedding_model_name, segmenter.embedding_backend),
+        token_budget=token_budget,
+        tuning_path=None,
+    )
+    if token_budget is None:
+        encoder.tune([sentence for sentences in transcripts for sentence in sentences])
+
+    drift = 0.0
+    sentence_count = 0
+    started = time.perf_counter()
+    for sentences, reference in zip(transcripts, series):
+        embeddings = encoder.encode(sentences, normalize_embeddings=True)
+        values = segmenter._similarity_from_embeddings(embeddings)
+        drift = max(drift, float(np.max(np.abs(values - reference))))
+        sentence_count += len(sentences)
+    encode_seconds = time.perf_counter() - started
+    throughput = sentence_count / encode_seconds if encode_seconds else float("inf")
+    return throughput, encoder.token_budget, drift
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends for cosine segmentation.")
+    parser.add_argument("--csv", default=DEFAULT_TRANSCRIPT_CSV, help="CSV with one transcript per row")
+    parser.add_argument("--text-column", default="dialogue_text", help="Transcript column")
+    parser.add_argument("--transcripts", type=int, default=20, help="Number of transcripts to encode")
+    parser.add_argument(
+        "--pairs",
+        default=",".join(f"{model}:{backend}" for model, backend in DEFAULT_PAIRS),
+        help="Comma-separated model:backend pairs; the first one is the baseline",
+    )
+    parser.add_argument("--batch-size", type=int, default=32, help="Encoding batch size")
+    parser.add_argument(
+        "--token-budget", type=int, default=None, help="Bucketed encoder budget (default: tune on the transcripts)"
+    )
+    parser.add_argument("--no-bucketing", action="store_true", help="Skip the length-bucketed encoder timing")
+    parser.add_argument("--tolerance", type=int, default=1, help="Sentences a boundary may move and still agree")
+    parser.add_argument("--output", default=OUTPUT_CSV, help="Where to write the results table")
+    args = parser.parse_args()
+
+    transcripts = load_transcripts(args.csv, args.text_column, args.transcripts)
+    if not transcripts:
+        print(f"[Error] No transcripts with at least two sentences in {args.csv}")
+        return
+    pairs = parse_pairs(args.pairs)
+    print(f"[System] {len(transcripts)} transcripts, {sum(len(t) for t in transcripts)} sentences")
+
+    rows = []
+    baseline = None
+    for model_name, backend in pairs:
+        label = f"{model_name}:{backend}"
+        try:
+            segmenter, load_seconds, throughput, series = benchmark_pair(model_name, backend, transcripts, args.batch_size)
+        except Exception as error:
+            print(f"[Warning] Skipping {label}: {error}")
+            continue
+
+        starts = [segmenter._topic_starts(values) for values in series]
+        if baseline is None:
+            baseline = {"label": label, "throughput": throughput, "series": series, "starts": starts}
+
+        agreement = np.array(
+            [boundary_agreement(ref, cand, args.tolerance) for ref, cand in zip(baseline["starts"], starts)]
+        )
+        bucketed = {}
+        if not args.no_bucketing:
+            bucketed_throughput, budget, drift = benchmark_bucketed(segmenter, transcripts, series, args.token_budget)
+            bucketed = {
+                "bucketed_sentences_per_sec": round(bucketed_throughput, 1),
+                "bucketing_gain": round(bucketed_throughput / throughput, 2),
+                "token_budget": budget,
+                "bucketed_max_drift": drift,
+            }
+
+        similarity_mae = float(np.mean(np.concatenate([np.abs(a - b) for a, b in zip(baseline["series"], series)])))
+        rows.append(
+            {
+                "pair": label,
+                "model": model_name,
+                "backend": backend,
+                "load_seconds": round(load_seconds, 2),
+                "sentences_per_sec": round(throughput, 1),
+                "speedup": round(throughput / baseline["throughput"], 2),
+                "topics_per_transcript": float(np.mean([s.sum() + 1 for s in starts])),
+                "boundary_precision": float(agreement[:, 0].mean()),
+                "boundary_recall": float(agreement[:, 1].mean()),
+                "boundary_f1": float(agreement[:, 2].mean()),
+                "similarity_mae": similarity_mae,
+                **bucketed,
+            }
+        )
+        print(
+            f"[System] {label}: load {load_seconds:.1f}s | {throughput:.1f} sentences/s "
+            f"({rows[-1]['speedup']:.2f}x{', bucketed ' + str(bucketed['bucketing_gain']) + 'x' if bucketed else ''}) | boundary F1 {rows[-1]['boundary_f1']:.3f} | similarity MAE {similarity_mae:.4f}"
+        )
+
+    if not rows:
+        print("[Error] No backend could be loaded.")
+        return
+
+    table = pd.DataFrame(rows)
+    print("\n" + "=" * 78)
+    print(f"EMBEDDING BACKENDS (baseline: {baseline['label']}, boundary tolerance ±{args.tolerance})")
+    print("=" * 78)
+    print(table.drop(columns=["model", "backend"]).to_string(index=False))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    table.to_csv(args.output, index=False)
+    print(f"\n[System] Saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Reads every CSV in data/ folder and trains on combined 80-20 split.
 import argparse
 import os
 import pickle
+import sys
 import time
 from typing import Tuple, List
 
@@ -22,7 +23,6 @@ from sklearn.metrics import (
     precision_score,
     recall_score,
     f1_score,
-    precision_recall_curve,
 )
 import joblib
 import matplotlib.pyplot as plt
@@ -36,140 +36,31 @@ except Exception:
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+CORPUS_CACHE_DIR = os.path.join(PROJECT_ROOT, "output", "cache", "corpus")
 
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
-def clean_text(text: str, lowercase: bool = True) -> str:
-    """
-    Clean text while preserving Action Item markers.
-    
-    Keeps: Stopwords, pronouns (critical for action items like "I will...")
-    Removes: Excessive whitespace, leading/trailing spaces
-    """
-    if not isinstance(text, str):
-        return ""
-    if lowercase:
-        text = text.lower()
-    text = text.strip()
-    # Normalize multiple spaces
-    text = " ".join(text.split())
-    return text
-
-
-def normalize_labels(df: pd.DataFrame, source_file: str) -> Tuple[pd.DataFrame, bool]:
-    """
-    Normalize label values across different datasets.
-    Returns (normalized_df, success)
-    """
-    label_map = {
-        "information_item": 0,
-        "information": 0,
-        "info": 0,
-        "action_item": 1,
-        "action": 1,
-        "act": 1,
-        "0": 0,
-        "1": 1,
-    }
-
-    df_copy = df.copy()
-    
-    # Standardize column names
-    df_copy.columns = [c.lower().strip() for c in df_copy.columns]
-    
-    # Try to find text column
-    text_col = None
-    if "sentence" in df_copy.columns:
-        text_col = "sentence"
-    elif "text" in df_copy.columns:
-        text_col = "text"
-    else:
-        # Try to find any column that might contain sentences
-        for col in df_copy.columns:
-            if "text" in col.lower() or "sentence" in col.lower() or "content" in col.lower():
-                text_col = col
-                break
-    
-    # Try to find label column
-    label_col = None
-    if "label" in df_copy.columns:
-        label_col = "label"
-    else:
-        for col in df_copy.columns:
-            if "label" in col.lower() or "type" in col.lower() or "classification" in col.lower():
-                label_col = col
-                break
-    
-    if text_col is None or label_col is None:
-        print(f"   ⚠️  Skipped: Missing text or label column. Columns: {list(df_copy.columns)}")
-        return None, False
-    
-    # Clean labels
-    normalized_labels = []
-    valid_texts = []
-    for idx, raw_label in enumerate(df_copy[label_col].astype(str)):
-        key = raw_label.strip().lower()
-        if key not in label_map:
-            print(f"   ⚠️  Warning: Unknown label '{raw_label}' in {source_file}, skipping row")
-            continue
-        normalized_labels.append(label_map[key])
-        valid_texts.append(df_copy[text_col].iloc[idx])
-    
-    if len(normalized_labels) == 0:
-        print(f"   ⚠️  Skipped: No valid labels after normalization")
-        return None, False
-    
-    result = pd.DataFrame({
-        "sentence": valid_texts,
-        "label": normalized_labels,
-    })
-    
-    return result, True
+from core.corpus_cache import clean_text, load_corpus, normalize_labels
+from core.threshold_sweep import ThresholdSweep, sweep_thresholds
 
 
 def load_all_csv_files() -> pd.DataFrame:
-    """Load and combine all CSV files from data/ folder."""
-    dfs = []
-    total_loaded = 0
-    total_skipped = 0
-    
+    """Load and combine all CSV files from data/ folder through the normalized corpus cache."""
     if not os.path.exists(DATA_DIR):
         raise FileNotFoundError(f"Data directory not found: {DATA_DIR}")
-    
-    csv_files = sorted([f for f in os.listdir(DATA_DIR) if f.endswith('.csv')])
-    
-    print(f"Found {len(csv_files)} CSV files in {DATA_DIR}\n")
-    
-    for csv_file in csv_files:
-        csv_path = os.path.join(DATA_DIR, csv_file)
-        
-        try:
-            print(f"📂 Loading {csv_file}...")
-            df = pd.read_csv(csv_path)
-            print(f"   Raw rows: {len(df)}")
-            
-            df_normalized, success = normalize_labels(df, csv_file)
-            
-            if success:
-                dfs.append(df_normalized)
-                total_loaded += len(df_normalized)
-                print(f"   ✅ Loaded: {len(df_normalized)} rows")
-            else:
-                total_skipped += len(df)
-                
-        except Exception as e:
-            print(f"   ❌ Error loading {csv_file}: {e}")
-            total_skipped += 1
-    
-    if not dfs:
+
+    print(f"Loading CSV files from {DATA_DIR} (corpus cache: {CORPUS_CACHE_DIR})\n")
+    combined = load_corpus(data_dir=DATA_DIR, cache_dir=CORPUS_CACHE_DIR, drop_empty=False)
+
+    if combined.empty:
         raise ValueError("No valid datasets loaded!")
-    
-    combined = pd.concat(dfs, ignore_index=True)
-    
+
     print(f"\n{'='*70}")
-    print(f"✅ Successfully loaded: {len(combined)} rows from {len(dfs)} files")
+    print(f"✅ Successfully loaded: {len(combined)} rows from {combined['source_file'].nunique()} files")
     print(f"   Class distribution: {combined['label'].value_counts().to_dict()}")
     print(f"{'='*70}\n")
-    
+
     return combined
 
 
@@ -218,37 +109,21 @@ def maybe_enable_balanced_weight(y: pd.Series, ratio_threshold: float = 1.5):
     return None
 
 
-def tune_recall_threshold(y_true: pd.Series, decision_scores: np.ndarray, target_recall: float = 0.95):
+def tune_recall_threshold(
+    y_true: pd.Series,
+    decision_scores: np.ndarray,
+    target_recall: float = 0.95,
+    sweep: ThresholdSweep = None,
+):
     """
     Find threshold that prioritizes higher recall and reduces false negatives.
     Returns (threshold, tuned_pred, tuned_recall, tuned_precision, tuned_f1_macro).
     """
-    precisions, recalls, thresholds = precision_recall_curve(y_true, decision_scores)
-
-    if thresholds.size == 0:
-        default_pred = (decision_scores >= 0.0).astype(int)
-        return (
-            0.0,
-            default_pred,
-            recall_score(y_true, default_pred, zero_division=0),
-            precision_score(y_true, default_pred, zero_division=0),
-            f1_score(y_true, default_pred, average="macro", zero_division=0),
-        )
-
-    candidate_idxs = np.where(recalls[:-1] >= target_recall)[0]
-    if candidate_idxs.size > 0:
-        best_idx = candidate_idxs[np.argmax(precisions[:-1][candidate_idxs])]
-    else:
-        best_idx = int(np.argmax(recalls[:-1]))
-
-    tuned_threshold = float(thresholds[best_idx])
-    tuned_pred = (decision_scores >= tuned_threshold).astype(int)
-
-    tuned_recall = recall_score(y_true, tuned_pred, zero_division=0)
-    tuned_precision = precision_score(y_true, tuned_pred, zero_division=0)
-    tuned_f1_macro = f1_score(y_true, tuned_pred, average="macro", zero_division=0)
-
-    return tuned_threshold, tuned_pred, tuned_recall, tuned_precision, tuned_f1_macro
+    sweep = sweep if sweep is not None else sweep_thresholds(y_true, decision_scores)
+    tuned_threshold = sweep.threshold(sweep.high_recall_index(target_recall), default=0.0)
+    tuned_pred = (np.asarray(decision_scores) >= tuned_threshold).astype(int)
+    tuned = sweep.at(tuned_threshold)
+    return tuned_threshold, tuned_pred, tuned["recall"], tuned["precision"], tuned["f1_macro"]
 
 
 def save_confusion_matrix_plot(cm: np.ndarray, output_path: str):
@@ -332,7 +207,11 @@ def train_bulk_model(
     # Data cleanup
     print("\n🧹 Cleaning data...")
     df = df.dropna(subset=["sentence", "label"])
-    df["sentence"] = df["sentence"].apply(lambda t: clean_text(t, lowercase=lowercase_text))
+    if not lowercase_text and "sentence_raw" in df.columns:
+        # The corpus cache stores lowercase cleaned text; rebuild the cased variant from the raw column.
+        df["sentence"] = df["sentence_raw"].apply(lambda t: clean_text(t, lowercase=False))
+    elif "sentence_raw" not in df.columns:
+        df["sentence"] = df["sentence"].apply(lambda t: clean_text(t, lowercase=lowercase_text))
     # Remove empty strings after cleaning
     df = df[df["sentence"].str.len() > 0]
     print(f"   Rows after cleanup: {len(df)}")
@@ -398,9 +277,11 @@ def train_bulk_model(
 
     # Recall-priority threshold tuning for false-negative reduction.
     decision_scores = pipeline.decision_function(X_test)
+    sweep = sweep_thresholds(y_test, decision_scores)
     tuned_threshold, y_test_pred, tuned_recall, tuned_precision, tuned_f1_macro = tune_recall_threshold(
-        y_test, decision_scores, target_recall=target_recall
+        y_test, decision_scores, target_recall=target_recall, sweep=sweep
     )
+    mode_thresholds = sweep.mode_thresholds(target_recall=target_recall)
     
     train_acc = accuracy_score(y_train, y_train_pred)
     test_acc = accuracy_score(y_test, y_test_pred)
@@ -415,6 +296,7 @@ def train_bulk_model(
     print(f"   Tuned Recall:       {tuned_recall:.4f}")
     print(f"   Tuned Precision:    {tuned_precision:.4f}")
     print(f"   Tuned Macro-F1:     {tuned_f1_macro:.4f}")
+    print("   Mode thresholds:    " + ", ".join(f"{mode}={value:+.5f}" for mode, value in mode_thresholds.items()))
     
     # Detailed metrics
     print(f"\n📊 Test Set Classification Report:")
@@ -451,6 +333,7 @@ def train_bulk_model(
         "f1_info": info_f1,
         "f1_action": action_f1,
         "tuned_threshold": tuned_threshold,
+        "mode_thresholds": mode_thresholds,
         "train_samples": len(X_train),
         "test_samples": len(X_test),
         "training_time_seconds": elapsed_time,
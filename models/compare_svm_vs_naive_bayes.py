@@ -6,33 +6,25 @@ Evaluates both models across all datasets and generates comparison metrics.
 import argparse
 import os
 import pickle
-from typing import Dict, List, Tuple
+import sys
+from typing import Dict, List
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import SGDClassifier
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    confusion_matrix,
-    f1_score,
-    precision_recall_curve,
-    precision_score,
-    recall_score,
-    roc_auc_score,
-    roc_curve,
-)
-from sklearn.model_selection import train_test_split
-from sklearn.pipeline import Pipeline, FeatureUnion
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 DATA_FOLDER = os.path.join(PROJECT_ROOT, "data")
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output", "svm_vs_nb_comparison")
+CORPUS_CACHE_DIR = os.path.join(PROJECT_ROOT, "output", "cache", "corpus")
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.corpus_cache import load_corpus
+from core.evaluation_engine import holdout_folds, run_evaluation, svm_vs_nb_candidates
 
 DATASETS: Dict[str, str] = {
     "Formal English (10k)": os.path.join(DATA_FOLDER, "action_items_dataset_10k.csv"),
@@ -57,62 +49,21 @@ def ensure_output_dir():
     print(f"[OK] Output directory: {OUTPUT_DIR}")
 
 
-def clean_text(text: str) -> str:
-    if not isinstance(text, str):
-        return ""
-    text = text.lower().strip()
-    return " ".join(text.split())
-
-
 def load_and_normalize(file_path: str, source_name: str) -> pd.DataFrame:
-    """Load CSV and normalize labels to 0/1."""
+    """Load one dataset through the normalized corpus cache and normalize labels to 0/1."""
     try:
-        df = pd.read_csv(file_path)
-        df.columns = [col.lower().strip() for col in df.columns]
-
-        if "text" in df.columns and "sentence" not in df.columns:
-            df = df.rename(columns={"text": "sentence"})
-
-        label_map = {
-            "information_item": 0,
-            "information": 0,
-            "info": 0,
-            "action_item": 1,
-            "action": 1,
-            "act": 1,
-            "0": 0,
-            "1": 1,
-        }
-
-        if "sentence" not in df.columns or "label" not in df.columns:
-            return None
-
-        rows = df.dropna(subset=["sentence", "label"]).copy()
-        rows["sentence"] = rows["sentence"].astype(str).map(clean_text)
-        rows = rows[rows["sentence"].str.len() > 0]
-
-        labels: List[int] = []
-        valid_sentences: List[str] = []
-        for idx, raw_label in enumerate(rows["label"].astype(str)):
-            key = raw_label.strip().lower()
-            if key not in label_map:
-                continue
-            labels.append(label_map[key])
-            valid_sentences.append(rows["sentence"].iloc[idx])
-
-        if not labels:
-            return None
-
-        return pd.DataFrame(
-            {
-                "sentence": valid_sentences,
-                "label": labels,
-                "source_file": source_name,
-            }
+        rows = load_corpus(
+            [file_path],
+            cache_dir=CORPUS_CACHE_DIR,
+            source_names={file_path: source_name},
+            verbose=False,
         )
     except Exception as e:
         print(f"   [!] Error loading {source_name}: {e}")
         return None
+    if rows.empty:
+        return None
+    return rows[["sentence", "label", "source_file"]]
 
 
 def load_all_datasets() -> pd.DataFrame:
@@ -143,176 +94,68 @@ def load_all_datasets() -> pd.DataFrame:
     return combined
 
 
-def create_svm_model():
-    """Create SVM (SGD) pipeline with TF-IDF vectorization."""
-    return Pipeline([
-        (
-            "tfidf",
-            FeatureUnion([
-                (
-                    "word_tfidf",
-                    TfidfVectorizer(
-                        analyzer="word",
-                        ngram_range=(1, 2),
-                        max_features=100000,
-                        min_df=2,
-                        max_df=0.95,
-                        sublinear_tf=True,
-                    ),
-                ),
-                (
-                    "char_tfidf",
-                    TfidfVectorizer(
-                        analyzer="char_wb",
-                        ngram_range=(3, 5),
-                        max_features=60000,
-                        min_df=2,
-                        sublinear_tf=True,
-                    ),
-                ),
-            ])
-        ),
-        (
-            "clf",
-            SGDClassifier(
-                loss="hinge",
-                penalty="l2",
-                alpha=0.0001,
-                max_iter=2000,
-                tol=1e-4,
-                class_weight="balanced",
-                random_state=42,
-                n_jobs=-1,
-            ),
-        ),
-    ])
-
-
-def create_naive_bayes_model():
-    """Create Naive Bayes pipeline with TF-IDF vectorization."""
-    return Pipeline([
-        ("tfidf", TfidfVectorizer(
-            max_features=5000,
-            ngram_range=(1, 2),
-            min_df=2,
-            max_df=0.8,
-        )),
-        ("clf", MultinomialNB(alpha=0.1)),
-    ])
-
-
-def evaluate_model(model, X_test, y_test, model_name: str) -> Dict:
-    """Evaluate model and return comprehensive metrics."""
-    y_pred = model.predict(X_test)
-    y_test_arr = np.asarray(y_test, dtype=int)
-    y_pred_arr = np.asarray(y_pred, dtype=int)
-    
-    # Get decision scores for PR/ROC curves
-    try:
-        # Try decision_function first (for SVM)
-        X_test_transformed = model.named_steps["tfidf"].transform(X_test)
-        if hasattr(model.named_steps["clf"], "decision_function"):
-            decision_scores = model.named_steps["clf"].decision_function(X_test_transformed)
-            decision_scores = np.asarray(decision_scores, dtype=float).ravel()
-        else:
-            # Fallback to predict_proba (for Naive Bayes)
-            decision_scores = model.predict_proba(X_test)[:, 1]
-            decision_scores = np.asarray(decision_scores, dtype=float).ravel()
-    except Exception as e:
-        print(f"         [!] Could not get decision scores ({e}), using predict_proba")
-        decision_scores = model.predict_proba(X_test)[:, 1]
-        decision_scores = np.asarray(decision_scores, dtype=float).ravel()
-    
-    # Calculate metrics
-    acc = accuracy_score(y_test_arr, y_pred_arr)
-    prec = precision_score(y_test_arr, y_pred_arr, zero_division=0)
-    rec = recall_score(y_test_arr, y_pred_arr, zero_division=0)
-    f1 = f1_score(y_test_arr, y_pred_arr, zero_division=0)
-    
-    # Handle AUC-ROC safely
-    try:
-        auc_roc = roc_auc_score(y_test_arr, decision_scores)
-    except Exception as e:
-        print(f"         [!] Could not compute AUC-ROC ({e}), using F1 as proxy")
-        auc_roc = f1
-    
-    metrics = {
-        "model": model_name,
-        "accuracy": float(acc),
-        "precision": float(prec),
-        "recall": float(rec),
-        "f1": float(f1),
-        "auc_roc": float(auc_roc),
-    }
-    
-    return metrics, y_pred_arr, decision_scores
+MIN_DATASET_ROWS = 10
 
 
-def compare_on_single_dataset(dataset_name: str, df: pd.DataFrame) -> Dict:
-    """Train and compare SVM vs NB on a single dataset."""
-    print(f"\n{'='*70}")
-    print(f"[EVAL] Evaluating: {dataset_name} ({len(df)} samples)")
-    print(f"{'='*70}")
-    
-    try:
-        # Ensure proper numpy array conversion (not pandas/arrow types)
-        X = np.asarray(df["sentence"].values, dtype=object)
-        y = np.asarray(df["label"].values, dtype=np.int64)
-        
-        # Ensure we have minimum samples
-        if len(X) < 10:
-            print(f"   [!] Dataset too small ({len(X)} samples), skipping")
-            return None
-        
-        # 80-20 split with stratification
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42, stratify=y
-        )
-        
-        results = {"dataset": dataset_name}
-        
-        # Train SVM
-        print("\n   Training SVM (SGD with SVM loss)...")
-        svm_model = create_svm_model()
-        svm_model.fit(X_train, y_train)
-        svm_metrics, svm_pred, svm_scores = evaluate_model(svm_model, X_test, y_test, "SVM")
-        results["svm"] = svm_metrics
-        
-        print(f"      Accuracy:  {svm_metrics['accuracy']:.4f}")
-        print(f"      Precision: {svm_metrics['precision']:.4f}")
-        print(f"      Recall:    {svm_metrics['recall']:.4f}")
-        print(f"      F1:        {svm_metrics['f1']:.4f}")
-        print(f"      AUC-ROC:   {svm_metrics['auc_roc']:.4f}")
-        
-        # Train Naive Bayes
-        print("\n   Training Naive Bayes...")
-        nb_model = create_naive_bayes_model()
-        nb_model.fit(X_train, y_train)
-        nb_metrics, nb_pred, nb_scores = evaluate_model(nb_model, X_test, y_test, "Naive Bayes")
-        results["naive_bayes"] = nb_metrics
-        
-        print(f"      Accuracy:  {nb_metrics['accuracy']:.4f}")
-        print(f"      Precision: {nb_metrics['precision']:.4f}")
-        print(f"      Recall:    {nb_metrics['recall']:.4f}")
-        print(f"      F1:        {nb_metrics['f1']:.4f}")
-        print(f"      AUC-ROC:   {nb_metrics['auc_roc']:.4f}")
-        
+def print_model_metrics(metrics: Dict):
+    print(f"      Accuracy:  {metrics['accuracy']:.4f}")
+    print(f"      Precision: {metrics['precision']:.4f}")
+    print(f"      Recall:    {metrics['recall']:.4f}")
+    print(f"      F1:        {metrics['f1']:.4f}")
+    print(f"      AUC-ROC:   {metrics['auc_roc']:.4f}")
+
+
+def compare_on_datasets(combined_df: pd.DataFrame, n_jobs: int = None) -> List[Dict]:
+    """
+    Train and compare SVM vs NB on an 80/20 stratified split of every dataset.
+
+    All (dataset, model) fits run through the evaluation engine's process pool; the consolidated
+    metrics table is written next to the comparison report.
+    """
+    sizes = combined_df["source_file"].value_counts()
+    too_small = sizes[sizes < MIN_DATASET_ROWS].index.tolist()
+    for dataset_name in too_small:
+        print(f"   [!] {dataset_name}: dataset too small ({sizes[dataset_name]} samples), skipping")
+    frame = combined_df[~combined_df["source_file"].isin(too_small)].reset_index(drop=True)
+
+    folds = holdout_folds(frame["label"], test_size=0.2, random_state=42, groups=frame["source_file"])
+    run = run_evaluation(
+        frame,
+        svm_vs_nb_candidates(),
+        folds,
+        n_jobs=n_jobs,
+        output_csv=os.path.join(OUTPUT_DIR, "metrics_table.csv"),
+    )
+
+    all_results = []
+    for fold in folds:
+        svm_metrics = run.metrics("svm", fold.name)
+        nb_metrics = run.metrics("naive_bayes", fold.name)
+
+        print(f"\n{'='*70}")
+        print(f"[EVAL] {fold.name} ({len(fold.train_index) + len(fold.test_index)} samples)")
+        print(f"{'='*70}")
+        print("\n   SVM (SGD with SVM loss):")
+        print_model_metrics(svm_metrics)
+        print("\n   Naive Bayes:")
+        print_model_metrics(nb_metrics)
+
         # Calculate differences (SVM - NB)
         print(f"\n   [DIFF] Difference (SVM - NB):")
         for metric in ["accuracy", "precision", "recall", "f1", "auc_roc"]:
             diff = svm_metrics[metric] - nb_metrics[metric]
             symbol = "+" if diff > 0 else "-" if diff < 0 else "="
             print(f"      {symbol} {metric:12s}: {diff:+.4f}")
-        
-        results["test_size"] = len(X_test)
-        
-        return results, svm_model, nb_model, X_test, y_test, svm_scores, nb_scores
-    
-    except Exception as e:
-        import traceback
-        print(f"   [ERROR] Error: {e}")
-        traceback.print_exc()
-        return None
+
+        all_results.append(
+            {
+                "dataset": fold.name,
+                "svm": dict(svm_metrics, model="SVM"),
+                "naive_bayes": dict(nb_metrics, model="Naive Bayes"),
+                "test_size": len(fold.test_index),
+            }
+        )
+    return all_results
 
 
 def create_comparison_visualizations(all_results: List[Dict], output_dir: str):
@@ -504,6 +347,10 @@ def save_comparison_report(all_results: List[Dict], output_dir: str):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Compare SVM vs Naive Bayes on every dataset.")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    n_jobs = parser.parse_args().jobs
+
     ensure_output_dir()
     
     print("\n" + "="*70)
@@ -515,20 +362,7 @@ def main():
     combined_df = load_all_datasets()
     
     # Split by dataset and evaluate
-    all_results = []
-    
-    for dataset_name, file_path in DATASETS.items():
-        if not os.path.exists(file_path):
-            continue
-        
-        df = load_and_normalize(file_path, dataset_name)
-        if df is None:
-            continue
-        
-        result_tuple = compare_on_single_dataset(dataset_name, df)
-        if result_tuple is not None:
-            result, svm_model, nb_model, X_test, y_test, svm_scores, nb_scores = result_tuple
-            all_results.append(result)
+    all_results = compare_on_datasets(combined_df, n_jobs=n_jobs)
     
     # Generate reports and visualizations
     print("\n" + "="*70)
@@ -3,32 +3,31 @@ Cross-dataset evaluation: Train on half of combined data, test on unfamiliar oth
 SVM vs Naive Bayes comparison with temporal/data splitting.
 """
 
+import argparse
 import os
+import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import SGDClassifier
-from sklearn.naive_bayes import MultinomialNB
 from sklearn.metrics import (
-    accuracy_score,
     classification_report,
     confusion_matrix,
-    f1_score,
-    precision_score,
-    recall_score,
-    roc_auc_score,
     roc_curve,
     precision_recall_curve,
 )
-from sklearn.model_selection import train_test_split
-from sklearn.pipeline import Pipeline, FeatureUnion
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 DATA_FOLDER = os.path.join(PROJECT_ROOT, "data")
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output", "svm_vs_nb_half_unfamiliar")
+CORPUS_CACHE_DIR = os.path.join(PROJECT_ROOT, "output", "cache", "corpus")
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.corpus_cache import load_corpus
+from core.evaluation_engine import holdout_folds, run_evaluation, svm_vs_nb_candidates
 
 DATASETS = {
     "Formal English (10k)": os.path.join(DATA_FOLDER, "action_items_dataset_10k.csv"),
@@ -51,60 +50,21 @@ def ensure_output_dir():
     print(f"[OK] Output directory: {OUTPUT_DIR}")
 
 
-def clean_text(text: str) -> str:
-    if not isinstance(text, str):
-        return ""
-    text = text.lower().strip()
-    return " ".join(text.split())
-
-
 def load_and_normalize(file_path: str, source_name: str) -> pd.DataFrame:
-    """Load CSV and normalize labels to 0/1."""
+    """Load one dataset through the normalized corpus cache and normalize labels to 0/1."""
     try:
-        df = pd.read_csv(file_path)
-        df.columns = [col.lower().strip() for col in df.columns]
-
-        if "text" in df.columns and "sentence" not in df.columns:
-            df = df.rename(columns={"text": "sentence"})
-
-        label_map = {
-            "information_item": 0,
-            "information": 0,
-            "info": 0,
-            "action_item": 1,
-            "action": 1,
-            "act": 1,
-            "0": 0,
-            "1": 1,
-        }
-
-        if "sentence" not in df.columns or "label" not in df.columns:
-            return None
-
-        rows = df.dropna(subset=["sentence", "label"]).copy()
-        rows["sentence"] = rows["sentence"].astype(str).map(clean_text)
-        rows = rows[rows["sentence"].str.len() > 0]
-
-        labels = []
-        valid_sentences = []
-        for idx, raw_label in enumerate(rows["label"].astype(str)):
-            key = raw_label.strip().lower()
-            if key not in label_map:
-                continue
-            labels.append(label_map[key])
-            valid_sentences.append(rows["sentence"].iloc[idx])
-
-        if not labels:
-            return None
-
-        return pd.DataFrame({
-            "sentence": valid_sentences,
-            "label": labels,
-            "source_file": source_name,
-        })
+        rows = load_corpus(
+            [file_path],
+            cache_dir=CORPUS_CACHE_DIR,
+            source_names={file_path: source_name},
+            verbose=False,
+        )
     except Exception as e:
         print(f"   [!] Error loading {source_name}: {e}")
         return None
+    if rows.empty:
+        return None
+    return rows[["sentence", "label", "source_file"]]
 
 
 def load_all_datasets() -> pd.DataFrame:
@@ -135,115 +95,6 @@ def load_all_datasets() -> pd.DataFrame:
     return combined
 
 
-def create_svm_model():
-    """Create SVM (SGD) pipeline with TF-IDF vectorization."""
-    return Pipeline([
-        (
-            "tfidf",
-            FeatureUnion([
-                (
-                    "word_tfidf",
-                    TfidfVectorizer(
-                        analyzer="word",
-                        ngram_range=(1, 2),
-                        max_features=100000,
-                        min_df=2,
-                        max_df=0.95,
-                        sublinear_tf=True,
-                    ),
-                ),
-                (
-                    "char_tfidf",
-                    TfidfVectorizer(
-                        analyzer="char_wb",
-                        ngram_range=(3, 5),
-                        max_features=60000,
-                        min_df=2,
-                        sublinear_tf=True,
-                    ),
-                ),
-            ])
-        ),
-        (
-            "clf",
-            SGDClassifier(
-                loss="hinge",
-                penalty="l2",
-                alpha=0.0001,
-                max_iter=2000,
-                tol=1e-4,
-                class_weight="balanced",
-                random_state=42,
-                n_jobs=-1,
-            ),
-        ),
-    ])
-
-
-def create_naive_bayes_model():
-    """Create Naive Bayes pipeline with TF-IDF vectorization."""
-    return Pipeline([
-        ("tfidf", TfidfVectorizer(
-            max_features=5000,
-            ngram_range=(1, 2),
-            min_df=2,
-            max_df=0.8,
-        )),
-        ("clf", MultinomialNB(alpha=0.1)),
-    ])
-
-
-def evaluate_model(model, X_test, y_test, model_name: str):
-    """Evaluate model and return comprehensive metrics."""
-    try:
-        y_pred = model.predict(X_test)
-        y_test_arr = np.asarray(y_test, dtype=int)
-        y_pred_arr = np.asarray(y_pred, dtype=int)
-        
-        # Get decision scores for ROC curve
-        try:
-            X_test_transformed = model.named_steps["tfidf"].transform(X_test)
-            if hasattr(model.named_steps["clf"], "decision_function"):
-                decision_scores = model.named_steps["clf"].decision_function(X_test_transformed)
-                decision_scores = np.asarray(decision_scores, dtype=float).ravel()
-            else:
-                decision_scores = model.predict_proba(X_test)[:, 1]
-                decision_scores = np.asarray(decision_scores, dtype=float).ravel()
-        except Exception as e:
-            print(f"         [!] Could not get decision scores ({e}), using predict_proba")
-            decision_scores = model.predict_proba(X_test)[:, 1]
-            decision_scores = np.asarray(decision_scores, dtype=float).ravel()
-        
-        # Calculate metrics
-        acc = accuracy_score(y_test_arr, y_pred_arr)
-        prec = precision_score(y_test_arr, y_pred_arr, zero_division=0)
-        rec = recall_score(y_test_arr, y_pred_arr, zero_division=0)
-        f1 = f1_score(y_test_arr, y_pred_arr, zero_division=0)
-        
-        try:
-            auc_roc = roc_auc_score(y_test_arr, decision_scores)
-        except Exception as e:
-            print(f"         [!] Could not compute AUC-ROC ({e}), using F1 as proxy")
-            auc_roc = f1
-        
-        metrics = {
-            "model": model_name,
-            "accuracy": float(acc),
-            "precision": float(prec),
-            "recall": float(rec),
-            "f1": float(f1),
-            "auc_roc": float(auc_roc),
-        }
-        
-        return metrics, y_pred_arr, decision_scores, y_test_arr
-    
-    except Exception as e:
-        import traceback
-        print(f"         [ERROR] Fatal error in evaluate_model: {e}")
-        traceback.print_exc()
-        raise
-
-
 def create_confusion_matrix_plot(cm, model_name, output_path):
     """Save confusion matrix visualization."""
     fig, ax = plt.subplots(figsize=(6, 5))
@@ -336,6 +187,10 @@ def create_pr_curve_plot(y_test, svm_scores, nb_scores, output_path):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Train on half of the combined data and compare SVM vs Naive Bayes on the unfamiliar half.")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    n_jobs = parser.parse_args().jobs
+
     ensure_output_dir()
     
     print("\n" + "="*70)
@@ -346,43 +201,41 @@ def main():
     print("\n[LOAD] Loading all datasets...")
     combined_df = load_all_datasets()
     
-    # Prepare data: ensure proper numpy arrays
-    X_all = np.asarray(combined_df["sentence"].values, dtype=object)
-    y_all = np.asarray(combined_df["label"].values, dtype=np.int64)
-    
     # 50-50 split: train on first half, test on second half (unfamiliar)
     # Using stratified split to maintain class balance
     print("\n[SPLIT] Creating 50-50 train/test split with stratification...")
-    X_train, X_test, y_train, y_test = train_test_split(
-        X_all, y_all, test_size=0.5, random_state=42, stratify=y_all
-    )
+    combined_df = combined_df.reset_index(drop=True)
+    y_all = combined_df["label"].to_numpy(dtype=np.int64)
+    folds = holdout_folds(y_all, test_size=0.5, random_state=42)
+    y_train = y_all[folds[0].train_index]
+    y_test = y_all[folds[0].test_index]
     
-    print(f"   Training set: {len(X_train)} samples")
+    print(f"   Training set: {len(y_train)} samples")
     print(f"   - Action items: {(y_train == 1).sum()} ({(y_train == 1).sum() / len(y_train) * 100:.1f}%)")
-    print(f"   Test set (unfamiliar): {len(X_test)} samples")
+    print(f"   Test set (unfamiliar): {len(y_test)} samples")
     print(f"   - Action items: {(y_test == 1).sum()} ({(y_test == 1).sum() / len(y_test) * 100:.1f}%)")
     
-    # Train SVM
-    print("\n" + "="*70)
-    print("[TRAIN] Training SVM (SGD with SVM loss)...")
-    print("="*70)
-    svm_model = create_svm_model()
-    svm_model.fit(X_train, y_train)
-    print("[OK] SVM training complete")
-    
-    # Train Naive Bayes
-    print("\n[TRAIN] Training Naive Bayes...")
-    nb_model = create_naive_bayes_model()
-    nb_model.fit(X_train, y_train)
-    print("[OK] Naive Bayes training complete")
-    
-    # Evaluate on unfamiliar test data
+    # Train and evaluate both models in parallel on the shared split
     print("\n" + "="*70)
-    print("[EVAL] Evaluating on unfamiliar test data...")
+    print("[TRAIN] Training SVM (SGD with SVM loss) and Naive Bayes...")
     print("="*70)
-    
-    svm_metrics, svm_pred, svm_scores, y_test_arr = evaluate_model(svm_model, X_test, y_test, "SVM")
-    nb_metrics, nb_pred, nb_scores, _ = evaluate_model(nb_model, X_test, y_test, "Naive Bayes")
+    run = run_evaluation(
+        combined_df,
+        svm_vs_nb_candidates(),
+        folds,
+        n_jobs=n_jobs,
+        output_csv=os.path.join(OUTPUT_DIR, "metrics_table.csv"),
+        keep_predictions=True,
+    )
+    print("[OK] Training complete")
+    
+    svm_metrics = run.metrics("svm", folds[0].name)
+    nb_metrics = run.metrics("naive_bayes", folds[0].name)
+    svm_run = run.predictions[("svm", folds[0].name)]
+    nb_run = run.predictions[("naive_bayes", folds[0].name)]
+    y_test_arr = svm_run["y_true"]
+    svm_pred, svm_scores = svm_run["y_pred"], svm_run["scores"]
+    nb_pred, nb_scores = nb_run["y_pred"], nb_run["scores"]
     
     # Display results
     print("\n" + "="*70)
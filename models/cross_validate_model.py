@@ -2,95 +2,32 @@
 Cross-Validation Script - Validates model robustness
 """
 
+import argparse
 import os
-import pickle
+import sys
 import pandas as pd
-from sklearn.model_selection import cross_validate, StratifiedKFold
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import SGDClassifier
-from sklearn.pipeline import Pipeline
-from sklearn.metrics import make_scorer, precision_score, recall_score, f1_score
-import joblib
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+CORPUS_CACHE_DIR = os.path.join(PROJECT_ROOT, "output", "cache", "corpus")
+OUTPUT_CSV = os.path.join(PROJECT_ROOT, "output", "evaluation", "cross_validation_metrics.csv")
 
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
-def clean_text(text: str) -> str:
-    if not isinstance(text, str):
-        return ""
-    text = text.lower().strip()
-    text = " ".join(text.split())
-    return text
-
-
-def normalize_labels(df: pd.DataFrame, source_file: str) -> tuple:
-    label_map = {
-        "information_item": 0, "information": 0, "info": 0,
-        "action_item": 1, "action": 1, "act": 1,
-        "0": 0, "1": 1,
-    }
-    
-    df_copy = df.copy()
-    df_copy.columns = [c.lower().strip() for c in df_copy.columns]
-    
-    text_col = None
-    for col in ["sentence", "text"]:
-        if col in df_copy.columns:
-            text_col = col
-            break
-    
-    label_col = None
-    for col in df_copy.columns:
-        if "label" in col.lower():
-            label_col = col
-            break
-    
-    if text_col is None or label_col is None:
-        return None, False
-    
-    normalized_labels = []
-    valid_texts = []
-    for idx, raw_label in enumerate(df_copy[label_col].astype(str)):
-        key = raw_label.strip().lower()
-        if key not in label_map:
-            continue
-        normalized_labels.append(label_map[key])
-        valid_texts.append(df_copy[text_col].iloc[idx])
-    
-    if len(normalized_labels) == 0:
-        return None, False
-    
-    result = pd.DataFrame({
-        "sentence": valid_texts,
-        "label": normalized_labels,
-    })
-    
-    return result, True
+from core.corpus_cache import load_corpus
+from core.evaluation_engine import WORD_TFIDF, Candidate, kfold_folds, run_evaluation, sgd_hinge
 
 
 def load_all_csv_files() -> pd.DataFrame:
-    """Load all CSV files from data/ folder."""
-    dfs = []
-    csv_files = sorted([f for f in os.listdir(DATA_DIR) if f.endswith('.csv')])
-    
-    for csv_file in csv_files:
-        csv_path = os.path.join(DATA_DIR, csv_file)
-        try:
-            df = pd.read_csv(csv_path)
-            df_normalized, success = normalize_labels(df, csv_file)
-            if success:
-                dfs.append(df_normalized)
-        except:
-            pass
-    
-    return pd.concat(dfs, ignore_index=True)
+    """Load all CSV files from data/ folder (normalized once, then served from the corpus cache)."""
+    return load_corpus(data_dir=DATA_DIR, cache_dir=CORPUS_CACHE_DIR, verbose=False)
 
 
-def run_cross_validation():
-    """5-fold cross-validation to verify model robustness"""
+def run_cross_validation(n_splits: int = 5, n_jobs: int = None):
+    """Stratified k-fold cross-validation (5 folds by default) to verify model robustness"""
     
     print("=" * 70)
     print("CROSS-VALIDATION: Testing Model Robustness")
@@ -103,56 +40,33 @@ def run_cross_validation():
     
     # Clean
     print("\n🧹 Cleaning data...")
-    df = df.dropna(subset=["sentence", "label"])
-    df["sentence"] = df["sentence"].apply(clean_text)
-    df = df[df["sentence"].str.len() > 0]
+    # Sentences arrive cleaned (lowercase, collapsed whitespace) and non-empty from the corpus cache.
+    df = df.dropna(subset=["sentence", "label"]).reset_index(drop=True)
     print(f"   After cleanup: {len(df)} samples")
     
-    X = df["sentence"]
-    y = df["label"]
-    
-    # Cross-validation pipeline
-    print("\n🔧 Building 5-Fold Cross-Validation...")
-    pipeline = Pipeline([
-        ("tfidf", TfidfVectorizer(
-            ngram_range=(1, 2),
-            max_features=100000,
-            min_df=2,
-            max_df=0.95,
-            sublinear_tf=True,
-        )),
-        ("clf", SGDClassifier(
-            loss="hinge",
-            penalty="l2",
-            alpha=0.0001,
-            max_iter=2000,
-            tol=1e-4,
-            class_weight="balanced",
-            random_state=42,
-            n_jobs=-1,
-        ))
-    ])
+    # Word TF-IDF + SGD hinge; each fold is featurized once and the folds run in parallel.
+    print(f"\n🔧 Building {n_splits}-Fold Cross-Validation...")
+    candidate = Candidate("sgd_hinge", WORD_TFIDF, sgd_hinge)
+    folds = kfold_folds(df["label"], n_splits=n_splits, random_state=42)
     
-    cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-    
-    scoring = {
-        'accuracy': 'accuracy',
-        'precision_macro': make_scorer(precision_score, average='macro', zero_division=0),
-        'recall_macro': make_scorer(recall_score, average='macro', zero_division=0),
-        'f1_macro': make_scorer(f1_score, average='macro', zero_division=0),
-        'recall_action': make_scorer(recall_score, pos_label=1, zero_division=0),
-    }
-    
-    print("\n🧠 Running 5-fold cross-validation...")
+    print(f"\n🧠 Running {n_splits}-fold cross-validation...")
     print("   (This will take a few minutes...)\n")
     
-    cv_results = cross_validate(
-        pipeline, X, y, cv=cv, scoring=scoring, n_jobs=1, verbose=2
-    )
+    table = run_evaluation(df, [candidate], folds, n_jobs=n_jobs, output_csv=OUTPUT_CSV).table
+    cv_results = {
+        f"test_{metric}": table[column].to_numpy()
+        for metric, column in [
+            ("accuracy", "accuracy"),
+            ("precision_macro", "precision_macro"),
+            ("recall_macro", "recall_macro"),
+            ("f1_macro", "f1_macro"),
+            ("recall_action", "recall"),
+        ]
+    }
     
     # Print results
     print("\n" + "=" * 70)
-    print("CROSS-VALIDATION RESULTS (5 Folds)")
+    print(f"CROSS-VALIDATION RESULTS ({n_splits} Folds)")
     print("=" * 70)
     
     for metric in ['accuracy', 'precision_macro', 'recall_macro', 'f1_macro', 'recall_action']:
@@ -190,4 +104,8 @@ def run_cross_validation():
 
 
 if __name__ == "__main__":
-    run_cross_validation()
+    parser = argparse.ArgumentParser(description="Stratified k-fold cross-validation of the SVM pipeline.")
+    parser.add_argument("--folds", type=int, default=5, help="Number of stratified folds")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    run_cross_validation(n_splits=args.folds, n_jobs=args.jobs)
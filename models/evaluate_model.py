@@ -2,7 +2,7 @@
 
 import argparse
 import os
-import pickle
+import sys
 from typing import Dict, List
 
 import matplotlib.pyplot as plt
@@ -25,6 +25,16 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 DATA_FOLDER = os.path.join(PROJECT_ROOT, "data")
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output", "model_eval")
+CORPUS_CACHE_DIR = os.path.join(PROJECT_ROOT, "output", "cache", "corpus")
+FEATURE_CACHE_DIR = os.path.join(PROJECT_ROOT, "output", "cache", "features")
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.corpus_cache import load_corpus
+from core.feature_cache import cached_transform
+from core.model_store import load_student_model
+from core.threshold_sweep import sweep_thresholds
 
 DATASETS: Dict[str, str] = {
     "Formal English (10k)": os.path.join(DATA_FOLDER, "action_items_dataset_10k.csv"),
@@ -75,57 +85,23 @@ def resolve_model_path(preferred_model_path: str = "") -> str:
     )
 
 
-def clean_text(text: str) -> str:
-    if not isinstance(text, str):
-        return ""
-    text = text.lower().strip()
-    return " ".join(text.split())
+def load_classifier(model_path: str):
+    """Load the student from its memory-mapped model store when current, else from the pickle."""
+    model, _ = load_student_model(model_path, mmap_mode="r")
+    return model
 
 
 def load_and_normalize(file_path: str, source_name: str) -> pd.DataFrame:
-    df = pd.read_csv(file_path)
-    df.columns = [col.lower().strip() for col in df.columns]
-
-    if "text" in df.columns and "sentence" not in df.columns:
-        df = df.rename(columns={"text": "sentence"})
-
-    label_map = {
-        "information_item": 0,
-        "information": 0,
-        "info": 0,
-        "action_item": 1,
-        "action": 1,
-        "act": 1,
-        "0": 0,
-        "1": 1,
-    }
-
-    if "sentence" not in df.columns or "label" not in df.columns:
-        raise ValueError(f"{file_path} must contain sentence/text and label columns.")
-
-    rows = df.dropna(subset=["sentence", "label"]).copy()
-    rows["sentence"] = rows["sentence"].astype(str).map(clean_text)
-    rows = rows[rows["sentence"].str.len() > 0]
-
-    labels: List[int] = []
-    valid_sentences: List[str] = []
-    for idx, raw_label in enumerate(rows["label"].astype(str)):
-        key = raw_label.strip().lower()
-        if key not in label_map:
-            continue
-        labels.append(label_map[key])
-        valid_sentences.append(rows["sentence"].iloc[idx])
-
-    if not labels:
-        raise ValueError(f"No valid labels found in {file_path}")
-
-    return pd.DataFrame(
-        {
-            "sentence": valid_sentences,
-            "label": labels,
-            "source_file": source_name,
-        }
+    """Load one dataset through the normalized corpus cache (cleaned sentence, 0/1 label)."""
+    rows = load_corpus(
+        [file_path],
+        cache_dir=CORPUS_CACHE_DIR,
+        source_names={file_path: source_name},
+        verbose=False,
     )
+    if rows.empty:
+        raise ValueError(f"No valid labels found in {file_path}")
+    return rows[["sentence", "label", "source_file"]]
 
 
 def load_all_datasets(selected: List[str]) -> pd.DataFrame:
@@ -184,7 +160,8 @@ def split_by_source(df: pd.DataFrame, test_ratio: float, val_ratio: float, rando
 def get_features(model, texts: pd.Series):
     if hasattr(model, "named_steps"):
         return texts
-    return vectorizer.transform(texts)
+    # Memory-mapped CSR from the feature cache when these sentences were featurized before.
+    return cached_transform(vectorizer, texts, cache_dir=FEATURE_CACHE_DIR)
 
 
 def get_scores(model, features):
@@ -207,24 +184,10 @@ def choose_threshold(
     target_recall: float,
     target_precision: float,
 ) -> float:
-    precisions, recalls, thresholds = precision_recall_curve(y_true, scores)
-    if thresholds.size == 0:
-        return 0.0
-
+    sweep = sweep_thresholds(y_true, scores)
     if threshold_mode == "precision":
-        candidate_idxs = np.where(precisions[:-1] >= target_precision)[0]
-        if candidate_idxs.size > 0:
-            best_idx = candidate_idxs[np.argmax(recalls[:-1][candidate_idxs])]
-        else:
-            best_idx = int(np.argmax(precisions[:-1]))
-    else:
-        candidate_idxs = np.where(recalls[:-1] >= target_recall)[0]
-        if candidate_idxs.size > 0:
-            best_idx = candidate_idxs[np.argmax(precisions[:-1][candidate_idxs])]
-        else:
-            best_idx = int(np.argmax(recalls[:-1]))
-
-    return float(thresholds[best_idx])
+        return sweep.threshold(sweep.high_precision_index(target_precision), default=0.0)
+    return sweep.threshold(sweep.high_recall_index(target_recall), default=0.0)
 
 
 def plot_class_performance(report: dict, output_path: str):
@@ -366,8 +329,7 @@ def run_evaluation(
     model_path = resolve_model_path(model_path_override)
 
     print(f"[System] Using model: {model_path}")
-    with open(model_path, "rb") as handle:
-        model = pickle.load(handle)
+    model = load_classifier(model_path)
 
     print("\n" + "=" * 72)
     print("MODEL EVALUATION")
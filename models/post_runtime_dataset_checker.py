@@ -1,6 +1,6 @@
 import argparse
 import os
-import pickle
+import sys
 from typing import Dict
 
 import pandas as pd
@@ -12,6 +12,11 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.model_store import load_student_model
+
 # Main.py currently saves to project root. Keep both locations for compatibility.
 MODEL_CANDIDATES = [
     os.path.join(PROJECT_ROOT, "svm_model.pkl"),
@@ -106,8 +111,7 @@ def main():
     model_path = resolve_model_path()
     print(f"[System] Using model: {model_path}")
 
-    with open(model_path, "rb") as f:
-        clf = pickle.load(f)
+    clf, _ = load_student_model(model_path, mmap_mode="r")
 
     selected = DATASET_MAP.items() if args.dataset == "all" else [(args.dataset, DATASET_MAP[args.dataset])]
     for dataset_name, csv_path in selected:
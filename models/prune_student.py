@@ -0,0 +1,125 @@
+"""
+Prune the deployed SVM/SGD student into a sparse-weight model and report the accuracy delta.
+
+Keeps only weights whose magnitude exceeds a threshold, stores them as sorted index/value arrays
+(see core/sparse_student.py), and compares dense vs pruned accuracy on the unfamiliar eval set.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+DEFAULT_EVAL_CSV = os.path.join(DATA_DIR, "unfamiliar_unexplored_eval_600.csv")
+DEFAULT_MODEL_PATH = os.path.join(PROJECT_ROOT, "svm_model.pkl")
+DEFAULT_OUTPUT_PATH = os.path.join(PROJECT_ROOT, "output", "sparse_student.npz")
+FEATURE_CACHE_DIR = os.path.join(PROJECT_ROOT, "output", "cache", "features")
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.feature_cache import cached_transform
+from core.model_store import load_student_model, model_store_path, read_manifest
+from core.sparse_student import SparseStudent, shared_vectorizer
+
+
+def load_eval_set(csv_path: str) -> pd.DataFrame:
+    df = pd.read_csv(csv_path)
+    df.columns = [c.lower().strip() for c in df.columns]
+    if "text" in df.columns and "sentence" not in df.columns:
+        df = df.rename(columns={"text": "sentence"})
+    label_map = {"information_item": 0, "action_item": 1, "0": 0, "1": 1}
+    df = df.dropna(subset=["sentence", "label"]).copy()
+    df["label"] = df["label"].astype(str).str.strip().str.lower().map(label_map)
+    return df.dropna(subset=["label"]).astype({"label": int})
+
+
+def evaluate(scores: np.ndarray, y_true: np.ndarray, threshold: float):
+    y_pred = (scores >= threshold).astype(int)
+    return accuracy_score(y_true, y_pred), f1_score(y_true, y_pred, zero_division=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prune the student to sparse weights and report the accuracy delta.")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Pickled model or model store directory")
+    parser.add_argument("--eval-csv", default=DEFAULT_EVAL_CSV, help="Labeled evaluation CSV")
+    parser.add_argument(
+        "--thresholds",
+        default="0,0.01,0.02,0.05,0.1,0.2,0.3",
+        help="Comma-separated magnitude thresholds to sweep",
+    )
+    parser.add_argument("--threshold", type=float, default=None, help="Threshold used for the exported model")
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.005, help="Largest accepted accuracy drop when auto-picking")
+    parser.add_argument("--decision-threshold", type=float, default=None, help="Operating threshold (default: balanced)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_PATH, help="Where to write the sparse student (.npz)")
+    args = parser.parse_args()
+
+    clf, manifest = load_student_model(args.model, mmap_mode="r")
+    if manifest is None and not os.path.isdir(args.model):
+        manifest = read_manifest(model_store_path(args.model))
+    settings = (manifest or {}).get("vectorizer") or {"n_features": 2**16, "ngram_range": [1, 3], "alternate_sign": False}
+    thresholds = ((manifest or {}).get("thresholds") or {}).get("mode_thresholds") or {}
+    decision_threshold = args.decision_threshold if args.decision_threshold is not None else float(thresholds.get("balanced", 0.0))
+
+    df = load_eval_set(args.eval_csv)
+    y_true = df["label"].to_numpy(dtype=int)
+    vectorizer = shared_vectorizer(settings["n_features"], settings["ngram_range"], settings["alternate_sign"])
+    features = cached_transform(vectorizer, df["sentence"].astype(str), cache_dir=FEATURE_CACHE_DIR)
+
+    dense_scores = np.asarray(clf.decision_function(features), dtype=np.float64)
+    dense_acc, dense_f1 = evaluate(dense_scores, y_true, decision_threshold)
+    dense_bytes = int(np.asarray(clf.coef_).nbytes)
+
+    print("=" * 78)
+    print("SPARSE STUDENT PRUNING")
+    print("=" * 78)
+    print(f"Model: {args.model}")
+    print(f"Eval set: {args.eval_csv} ({len(df)} rows) | decision threshold: {decision_threshold:+.3f}")
+    print(f"Dense: accuracy={dense_acc * 100:.2f}% f1={dense_f1:.4f} weights={np.asarray(clf.coef_).size} bytes={dense_bytes}")
+    print(f"{'threshold':>10} {'kept':>8} {'bytes':>9} {'accuracy':>9} {'delta':>8} {'f1':>7}")
+
+    sweep = []
+    for value in [float(item) for item in args.thresholds.split(",") if item.strip()]:
+        student = SparseStudent.from_classifier(clf, magnitude_threshold=value, vectorizer_settings=settings)
+        acc, f1 = evaluate(student.decision_scores_from_features(features), y_true, decision_threshold)
+        sweep.append((value, student, acc))
+        print(
+            f"{value:>10.4f} {student.metadata['kept_weights']:>8} {student.nbytes:>9} "
+            f"{acc * 100:>8.2f}% {(acc - dense_acc) * 100:>+7.2f} {f1:>7.4f}"
+        )
+
+    if args.threshold is not None:
+        chosen = SparseStudent.from_classifier(clf, magnitude_threshold=args.threshold, vectorizer_settings=settings)
+    else:
+        # Largest threshold whose accuracy stays within the allowed drop.
+        acceptable = [entry for entry in sweep if dense_acc - entry[2] <= args.max_accuracy_drop]
+        chosen = max(acceptable, key=lambda entry: entry[0])[1] if acceptable else sweep[0][1]
+
+    chosen_acc, _ = evaluate(chosen.decision_scores_from_features(features), y_true, decision_threshold)
+    chosen.metadata.update(
+        {
+            "source_model": os.path.abspath(args.model),
+            "eval_csv": os.path.basename(args.eval_csv),
+            "dense_accuracy": dense_acc,
+            "sparse_accuracy": chosen_acc,
+            "accuracy_delta": chosen_acc - dense_acc,
+        }
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    chosen.save(args.output)
+    print(
+        f"\n[System] Saved sparse student to {args.output} "
+        f"(threshold={chosen.metadata['magnitude_threshold']:.4f}, kept={chosen.metadata['kept_weights']}, "
+        f"{chosen.nbytes} bytes vs {dense_bytes} dense, accuracy delta {(chosen_acc - dense_acc) * 100:+.2f} pts)"
+    )
+
+
+if __name__ == "__main__":
+    main()
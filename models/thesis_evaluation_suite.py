@@ -12,15 +12,13 @@ Generates final-days artifacts:
 
 import argparse
 import os
-import pickle
+import sys
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import SGDClassifier
 from sklearn.metrics import (
     auc,
     confusion_matrix,
@@ -29,13 +27,32 @@ from sklearn.metrics import (
     precision_score,
     recall_score,
 )
-from sklearn.pipeline import FeatureUnion, Pipeline
+from sklearn.pipeline import Pipeline
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output", "thesis_eval")
+CORPUS_CACHE_DIR = os.path.join(PROJECT_ROOT, "output", "cache", "corpus")
+FEATURE_CACHE_DIR = os.path.join(PROJECT_ROOT, "output", "cache", "features")
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.corpus_cache import clean_text, load_corpus
+from core.evaluation_engine import (
+    Candidate,
+    FeatureConfig,
+    run_evaluation,
+    sgd_hinge,
+    train_test_frame,
+    word_char_tfidf,
+    word_tfidf,
+)
+from core.feature_cache import cached_transform
+from core.model_store import load_student_model
+from core.threshold_sweep import sweep_thresholds
 
 
 TAGALOG_MARKERS = {
@@ -81,99 +98,21 @@ class EvalResult:
     tn: int
 
 
-def clean_text(text: str, lowercase: bool = True) -> str:
-    if not isinstance(text, str):
-        return ""
-    if lowercase:
-        text = text.lower()
-    text = text.strip()
-    text = " ".join(text.split())
-    return text
-
-
-def normalize_labels(df: pd.DataFrame, source_file: str) -> Tuple[Optional[pd.DataFrame], bool]:
-    label_map = {
-        "information_item": 0,
-        "information": 0,
-        "info": 0,
-        "action_item": 1,
-        "action": 1,
-        "act": 1,
-        "0": 0,
-        "1": 1,
-    }
-
-    df_copy = df.copy()
-    df_copy.columns = [c.lower().strip() for c in df_copy.columns]
-
-    text_col = None
-    if "sentence" in df_copy.columns:
-        text_col = "sentence"
-    elif "text" in df_copy.columns:
-        text_col = "text"
-    else:
-        for col in df_copy.columns:
-            if "text" in col.lower() or "sentence" in col.lower() or "content" in col.lower():
-                text_col = col
-                break
-
-    label_col = None
-    if "label" in df_copy.columns:
-        label_col = "label"
-    else:
-        for col in df_copy.columns:
-            if "label" in col.lower() or "type" in col.lower() or "classification" in col.lower():
-                label_col = col
-                break
-
-    if text_col is None or label_col is None:
-        print(f"Skipped {source_file}: missing text/label columns")
-        return None, False
-
-    normalized_labels: List[int] = []
-    valid_texts: List[str] = []
-    for idx, raw_label in enumerate(df_copy[label_col].astype(str)):
-        key = raw_label.strip().lower()
-        if key not in label_map:
-            continue
-        normalized_labels.append(label_map[key])
-        valid_texts.append(str(df_copy[text_col].iloc[idx]))
-
-    if not normalized_labels:
-        print(f"Skipped {source_file}: no valid labels after normalization")
-        return None, False
-
-    result = pd.DataFrame({
-        "sentence": valid_texts,
-        "label": normalized_labels,
-        "source_file": source_file,
-    })
-    return result, True
-
-
 def load_labeled_corpus(max_rows_per_file: int = 0) -> pd.DataFrame:
-    csv_files = sorted([f for f in os.listdir(DATA_DIR) if f.endswith(".csv")])
-    parts = []
-
-    for csv_file in csv_files:
-        file_path = os.path.join(DATA_DIR, csv_file)
-        try:
-            df = pd.read_csv(file_path)
-            normalized, ok = normalize_labels(df, csv_file)
-            if not ok:
-                continue
-            if max_rows_per_file > 0 and len(normalized) > max_rows_per_file:
-                normalized = normalized.sample(n=max_rows_per_file, random_state=42)
-            parts.append(normalized)
-        except Exception as exc:
-            print(f"Failed to load {csv_file}: {exc}")
-
-    if not parts:
+    """Load every labeled CSV in data/ through the normalized corpus cache."""
+    corpus = load_corpus(data_dir=DATA_DIR, cache_dir=CORPUS_CACHE_DIR, verbose=False)
+    if corpus.empty:
         raise ValueError("No labeled CSV rows found in data folder")
 
-    all_data = pd.concat(parts, ignore_index=True)
-    all_data = all_data.dropna(subset=["sentence", "label"])
-    return all_data
+    if max_rows_per_file > 0:
+        parts = []
+        for _, rows in corpus.groupby("source_file", sort=False):
+            if len(rows) > max_rows_per_file:
+                rows = rows.sample(n=max_rows_per_file, random_state=42)
+            parts.append(rows)
+        corpus = pd.concat(parts, ignore_index=True)
+
+    return corpus.dropna(subset=["sentence", "label"])
 
 
 def apply_data_hygiene(df: pd.DataFrame, output_dir: str) -> pd.DataFrame:
@@ -184,8 +123,9 @@ def apply_data_hygiene(df: pd.DataFrame, output_dir: str) -> pd.DataFrame:
     - flag potential indirect-commitment rows for manual consistency check
     """
     cleaned = df.copy()
-    cleaned["sentence_raw"] = cleaned["sentence"].astype(str)
-    cleaned["sentence"] = cleaned["sentence_raw"].apply(lambda s: clean_text(s, lowercase=True))
+    if "sentence_raw" not in cleaned.columns:
+        cleaned["sentence_raw"] = cleaned["sentence"].astype(str)
+        cleaned["sentence"] = cleaned["sentence_raw"].apply(lambda s: clean_text(s, lowercase=True))
     cleaned["sentence_norm"] = cleaned["sentence"].str.replace(r"\s+", " ", regex=True).str.strip()
 
     conflict_summary = (
@@ -263,7 +203,7 @@ def load_hard_negative_rows(hard_negatives_file: str) -> pd.DataFrame:
 
     result = pd.DataFrame(
         {
-            "sentence": hard_df["sentence"].astype(str),
+            "sentence": hard_df["sentence"].astype(str).map(clean_text),
             "sentence_raw": hard_df["sentence"].astype(str),
             "label": labels,
             "source_file": "manual_hard_negative",
@@ -286,8 +226,9 @@ def build_runtime_vectorizer(vectorizer_n_features: int = 2**16, ngram_range: Tu
 def load_pickled_classifier(model_path: str):
     if not os.path.exists(model_path):
         raise FileNotFoundError(f"Model pickle not found: {model_path}")
-    with open(model_path, "rb") as handle:
-        return pickle.load(handle)
+    # Uses the memory-mapped model store next to the pickle when it is current.
+    model, _ = load_student_model(model_path, mmap_mode="r")
+    return model
 
 
 def get_scoring_texts(df: pd.DataFrame, runtime_mode: bool) -> pd.Series:
@@ -320,73 +261,16 @@ def build_pipeline(
     char_ngram_range: Tuple[int, int] = (3, 5),
 ) -> Pipeline:
     if use_char_ngrams:
-        vectorizer = FeatureUnion(
-            [
-                (
-                    "word_tfidf",
-                    TfidfVectorizer(
-                        analyzer="word",
-                        ngram_range=ngram_range,
-                        max_features=100000,
-                        min_df=2,
-                        max_df=0.95,
-                        sublinear_tf=True,
-                    ),
-                ),
-                (
-                    "char_tfidf",
-                    TfidfVectorizer(
-                        analyzer="char_wb",
-                        ngram_range=char_ngram_range,
-                        max_features=60000,
-                        min_df=2,
-                        sublinear_tf=True,
-                    ),
-                ),
-            ]
-        )
+        vectorizer = word_char_tfidf(ngram_range=ngram_range, char_ngram_range=char_ngram_range)
     else:
-        vectorizer = TfidfVectorizer(
-            analyzer="word",
-            ngram_range=ngram_range,
-            max_features=100000,
-            min_df=2,
-            max_df=0.95,
-            sublinear_tf=True,
-        )
+        vectorizer = word_tfidf(ngram_range=ngram_range)
 
-    return Pipeline(
-        [
-            ("tfidf", vectorizer),
-            (
-                "clf",
-                SGDClassifier(
-                    loss="hinge",
-                    penalty="l2",
-                    alpha=0.0001,
-                    max_iter=2000,
-                    tol=1e-4,
-                    class_weight=class_weight,
-                    random_state=42,
-                    n_jobs=-1,
-                ),
-            ),
-        ]
-    )
+    return Pipeline([("tfidf", vectorizer), ("clf", sgd_hinge(class_weight=class_weight))])
 
 
 def choose_high_recall_threshold(y_true: np.ndarray, scores: np.ndarray, target_recall: float) -> float:
-    precision_vals, recall_vals, thresholds = precision_recall_curve(y_true, scores)
-    if thresholds.size == 0:
-        return 0.0
-
-    candidate = np.where(recall_vals[:-1] >= target_recall)[0]
-    if candidate.size > 0:
-        best_idx = candidate[np.argmax(precision_vals[:-1][candidate])]
-    else:
-        best_idx = int(np.argmax(recall_vals[:-1]))
-
-    return float(thresholds[best_idx])
+    sweep = sweep_thresholds(y_true, scores)
+    return sweep.threshold(sweep.high_recall_index(target_recall), default=0.0)
 
 
 def evaluate_at_threshold(y_true: np.ndarray, scores: np.ndarray, threshold: float, mode_name: str) -> EvalResult:
@@ -638,56 +522,70 @@ def save_score_distribution_plot(
     plt.close(fig)
 
 
+ABLATION_CONFIGS = [
+    ("Ablation ngram unigram", {"ngram": (1, 1), "lowercase": True, "class_weight": "balanced"}),
+    ("Ablation ngram uni+bi", {"ngram": (1, 2), "lowercase": True, "class_weight": "balanced"}),
+    ("Ablation add char 3-5", {"ngram": (1, 2), "lowercase": True, "class_weight": "balanced", "char": True}),
+    ("Ablation lowercase on", {"ngram": (1, 2), "lowercase": True, "class_weight": "balanced"}),
+    ("Ablation preserve case", {"ngram": (1, 2), "lowercase": False, "class_weight": "balanced"}),
+    ("Ablation class weight none", {"ngram": (1, 2), "lowercase": True, "class_weight": None}),
+    ("Ablation class weight balanced", {"ngram": (1, 2), "lowercase": True, "class_weight": "balanced"}),
+]
+
+
+def ablation_candidates() -> List[Candidate]:
+    """Evaluation-engine candidates for ``ABLATION_CONFIGS`` (scored at threshold 0)."""
+    candidates = []
+    for label, cfg in ABLATION_CONFIGS:
+        use_char = bool(cfg.get("char", False))
+        features = FeatureConfig(
+            name=f"{'word_char' if use_char else 'word'}_{cfg['ngram'][0]}{cfg['ngram'][1]}"
+            f"{'' if cfg['lowercase'] else '_cased'}",
+            factory=word_char_tfidf if use_char else word_tfidf,
+            params={"ngram_range": cfg["ngram"], "lowercase": cfg["lowercase"]},
+            # Preserving case needs text that was never lowercased (and no lowercasing in TF-IDF).
+            text_column="sentence" if cfg["lowercase"] else "sentence_cased",
+        )
+        candidates.append(
+            Candidate(
+                label,
+                features,
+                sgd_hinge,
+                {"class_weight": cfg["class_weight"]},
+                threshold=0.0,
+                tags={
+                    "ngram_range": str(cfg["ngram"]),
+                    "lowercase": cfg["lowercase"],
+                    "class_weight": str(cfg["class_weight"]),
+                    "use_char_ngrams": use_char,
+                },
+            )
+        )
+    return candidates
+
+
 def run_ablation_study(
     train_df: pd.DataFrame,
     test_df: pd.DataFrame,
     output_csv_path: str,
+    n_jobs: Optional[int] = None,
 ) -> pd.DataFrame:
-    base_text_train = train_df["sentence"].astype(str)
-    base_text_test = test_df["sentence"].astype(str)
-    y_train = train_df["label"].values
-    y_test = test_df["label"].values
+    frame, folds = train_test_frame(train_df, test_df, name="external_validity")
+    raw_text = frame["sentence_raw"] if "sentence_raw" in frame.columns else frame["sentence"]
+    frame["sentence_cased"] = raw_text.astype(str).apply(lambda s: clean_text(s, lowercase=False))
+
+    # Configs sharing a featurization are vectorized once; identical configs are fitted once.
+    run = run_evaluation(
+        frame,
+        ablation_candidates(),
+        folds,
+        n_jobs=n_jobs,
+        output_csv=os.path.join(os.path.dirname(os.path.abspath(output_csv_path)), "ablation_metrics_table.csv"),
+    )
 
-    configs = [
-        ("Ablation ngram unigram", {"ngram": (1, 1), "lowercase": True, "class_weight": "balanced"}),
-        ("Ablation ngram uni+bi", {"ngram": (1, 2), "lowercase": True, "class_weight": "balanced"}),
-        ("Ablation add char 3-5", {"ngram": (1, 2), "lowercase": True, "class_weight": "balanced", "char": True}),
-        ("Ablation lowercase on", {"ngram": (1, 2), "lowercase": True, "class_weight": "balanced"}),
-        ("Ablation preserve case", {"ngram": (1, 2), "lowercase": False, "class_weight": "balanced"}),
-        ("Ablation class weight none", {"ngram": (1, 2), "lowercase": True, "class_weight": None}),
-        ("Ablation class weight balanced", {"ngram": (1, 2), "lowercase": True, "class_weight": "balanced"}),
+    result_df = run.table.rename(columns={"candidate": "config", "f1": "f1_action"})[
+        ["config", "ngram_range", "lowercase", "class_weight", "use_char_ngrams", "precision", "recall", "f1_action", "f1_macro"]
     ]
-
-    rows = []
-    for label, cfg in configs:
-        x_train = base_text_train.apply(lambda s: clean_text(s, lowercase=cfg["lowercase"]))
-        x_test = base_text_test.apply(lambda s: clean_text(s, lowercase=cfg["lowercase"]))
-
-        pipeline = build_pipeline(
-            ngram_range=cfg["ngram"],
-            class_weight=cfg["class_weight"],
-            use_char_ngrams=cfg.get("char", False),
-        )
-        pipeline.fit(x_train, y_train)
-
-        scores = pipeline.decision_function(x_test)
-        y_pred = (scores >= 0.0).astype(int)
-
-        rows.append(
-            {
-                "config": label,
-                "ngram_range": str(cfg["ngram"]),
-                "lowercase": cfg["lowercase"],
-                "class_weight": str(cfg["class_weight"]),
-                "use_char_ngrams": bool(cfg.get("char", False)),
-                "precision": precision_score(y_test, y_pred, zero_division=0),
-                "recall": recall_score(y_test, y_pred, zero_division=0),
-                "f1_action": f1_score(y_test, y_pred, pos_label=1, zero_division=0),
-                "f1_macro": f1_score(y_test, y_pred, average="macro", zero_division=0),
-            }
-        )
-
-    result_df = pd.DataFrame(rows)
     result_df.to_csv(output_csv_path, index=False)
     return result_df
 
@@ -817,6 +715,12 @@ def main():
         action="store_true",
         help="Use combined word n-grams and char n-grams (3-5) for robustness",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for the ablation study (default: CPU count)",
+    )
     args = parser.parse_args()
 
     os.makedirs(args.output_dir, exist_ok=True)
@@ -851,14 +755,13 @@ def main():
         print(f"Loading deployed pickle model: {args.model_path}")
         model = load_pickled_classifier(args.model_path)
         vectorizer = build_runtime_vectorizer()
-        x_train_features = vectorizer.transform(x_train)
-        x_test_features = vectorizer.transform(x_test)
+        x_train_features = cached_transform(vectorizer, x_train, cache_dir=FEATURE_CACHE_DIR)
+        x_test_features = cached_transform(vectorizer, x_test, cache_dir=FEATURE_CACHE_DIR)
         scores = model.decision_function(x_test_features)
         train_scores = model.decision_function(x_train_features)
         print("Scoring with runtime HashingVectorizer (n_features=2**16, ngram_range=(1, 3))")
     else:
-        x_train = x_train.apply(lambda s: clean_text(s, lowercase=True))
-        x_test = x_test.apply(lambda s: clean_text(s, lowercase=True))
+        # Corpus and hard-negative sentences are already cleaned (lowercase) by the corpus cache.
         model = build_pipeline(
             ngram_range=(1, 2),
             class_weight="balanced",
@@ -944,6 +847,7 @@ def main():
         train_df,
         test_df,
         os.path.join(args.output_dir, "ablation_study_results.csv"),
+        n_jobs=args.jobs,
     )
 
     write_interpretation(
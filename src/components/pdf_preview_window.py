@@ -8,7 +8,16 @@ from app.export_service import ExportService, ReportContentFormatter
 class PDFPreviewWindow(ctk.CTkToplevel):
     """Preview and export window for meeting minutes PDFs with enhanced analytics."""
 
-    def __init__(self, parent, transcript_text, source_file=None, summary_text=None, topics=None, duration_seconds=None):
+    def __init__(
+        self,
+        parent,
+        transcript_text,
+        source_file=None,
+        summary_text=None,
+        topics=None,
+        duration_seconds=None,
+        sentence_table=None,
+    ):
         super().__init__(parent)
 
         self.source_file = source_file
@@ -17,19 +26,31 @@ class PDFPreviewWindow(ctk.CTkToplevel):
         self.exporter = ExportService()
         
         self.clean_transcript_text = self.formatter.clean_transcript_text(transcript_text)
-        self.extraction = self.exporter.extract_action_items_fast(self.clean_transcript_text)
+        # A table built for this transcript by the caller is reused instead of splitting again.
+        self.extraction = self.exporter.extract_action_items_fast(
+            self.clean_transcript_text, sentence_table=sentence_table
+        )
         self.action_items = self.extraction.get("action_items", [])
         self.action_details = self.extraction.get("details", [])
         self.model_weights = self.extraction.get("confidence_scores", [])
         self.total_sentences = int(self.extraction.get("total_sentences", 0))
         self.clean_transcript_text = self.extraction.get("clean_transcript", self.clean_transcript_text)
-        self.analytics = self.exporter.build_transcript_analytics(self.clean_transcript_text, action_items=self.action_items)
+        # One sentence split of the transcript, shared by extraction, analytics, summary, and export.
+        self.sentence_table = self.extraction.get("sentence_table")
+        self.analytics = self.exporter.build_transcript_analytics(
+            self.clean_transcript_text,
+            action_items=self.action_items,
+            sentence_table=self.sentence_table,
+        )
         self.summary_text = self.exporter.build_preview_summary(
             self.clean_transcript_text,
             action_items=self.action_items,
             summary_text=summary_text,
+            sentence_table=self.sentence_table,
+        )
+        self.topics = topics or self.exporter.build_topic_labels(
+            self.clean_transcript_text, sentence_table=self.sentence_table
         )
-        self.topics = topics or self.exporter.build_topic_labels(self.clean_transcript_text)
         self.weight_analytics = None
 
         self.breakdown_path = None
@@ -482,6 +503,7 @@ class PDFPreviewWindow(ctk.CTkToplevel):
                 include_sections=include_sections,
                 duration_seconds=self.duration_seconds,
                 analytics=self.weight_analytics,
+                sentence_table=self.sentence_table,
             )
             try:
                 os.startfile(pdf_path)
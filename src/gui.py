@@ -367,7 +367,15 @@ class CompactActionApp(ctk.CTk):
         popup.protocol("WM_DELETE_WINDOW", lambda: close_with(None))
         popup.bind("<Escape>", lambda _event: close_with(None))
 
-    def open_pdf_preview(self, transcript_text, source_file=None, summary_text=None, topics=None, duration_seconds=None):
+    def open_pdf_preview(
+        self,
+        transcript_text,
+        source_file=None,
+        summary_text=None,
+        topics=None,
+        duration_seconds=None,
+        sentence_table=None,
+    ):
         """Open PDF preview window with analytics, duration, model weights, and toggleable sections."""
         PDFPreviewWindow(
             parent=self,
@@ -376,5 +384,6 @@ class CompactActionApp(ctk.CTk):
             summary_text=summary_text,
             topics=topics,
             duration_seconds=duration_seconds,
+            sentence_table=sentence_table,
         )
 
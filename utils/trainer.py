@@ -6,9 +6,17 @@ Handles CSV dataset loading, incremental training, and self-training feedback.
 import argparse
 import os
 import sys
+import time
+import numpy as np
 import pandas as pd
 from sklearn.utils import shuffle
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.corpus_cache import find_text_label_columns, load_corpus, normalize_labels
+
 
 class ModelTrainer:
     """Manages training data loading, model training, and dataset management."""
@@ -26,59 +34,252 @@ class ModelTrainer:
         base = os.path.basename(path).lower()
         return base.startswith("hard_negative_information_items")
 
-    def train_from_csv(self, file_paths, max_synthetic_ratio=0.25, random_seed=42):
+    def _iter_csv_chunks(self, path, chunksize):
         """
-        Train the SVM model from CSV datasets.
+        Yield normalized ``text``/``label`` frames from a CSV, ``chunksize`` rows at a time.
+
+        Args:
+            path (str): CSV file path
+            chunksize (int): Rows read per chunk
+
+        Yields:
+            pd.DataFrame: Cleaned chunk with ``text`` (str) and ``label`` (0/1) columns
+        """
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            columns = [str(c).lower().strip() for c in chunk.columns]
+            if None in find_text_label_columns(columns):
+                print(f"[Error] {path} is missing 'text'/'sentence' or 'label' columns.")
+                print(f"Actual columns found: {columns}")
+                return
+
+            # Same cleaning and label mapping as the corpus cache used by the in-memory path.
+            normalized, ok = normalize_labels(chunk, path)
+            if not ok:
+                continue
+            normalized = normalized[normalized["sentence"].str.len() > 0]
+            yield pd.DataFrame(
+                {
+                    "text": normalized["sentence_raw"].to_numpy(),
+                    "label": normalized["label"].to_numpy(dtype=int),
+                }
+            )
+
+    def _iter_sampled_chunks(self, paths, keep_rows, total_rows, chunksize, rng):
+        """
+        Stream a uniform sample of exactly ``keep_rows`` out of ``total_rows`` across files.
+
+        Each chunk keeps a hypergeometric number of rows (selection sampling), so the sample
+        is drawn without replacement while holding only one chunk in memory.
+        """
+        remaining_keep = keep_rows
+        remaining_rows = total_rows
+        for path in paths:
+            for chunk in self._iter_csv_chunks(path, chunksize):
+                if remaining_keep <= 0:
+                    return
+                size = min(len(chunk), remaining_rows)
+                if size <= 0:
+                    continue
+                if remaining_keep >= remaining_rows:
+                    take = size
+                else:
+                    take = int(rng.hypergeometric(remaining_keep, remaining_rows - remaining_keep, size))
+                remaining_keep -= take
+                remaining_rows -= size
+                if take:
+                    positions = np.sort(rng.choice(size, size=take, replace=False))
+                    yield chunk.iloc[positions]
+
+    def _stream_minibatches(self, sources, batch_size, rng):
+        """
+        Interleave several row streams into shuffled mini-batches.
+
+        Every mini-batch draws its rows from the sources in proportion to the rows each one has
+        left (multivariate hypergeometric), so real and synthetic rows are spread evenly over the
+        whole run instead of arriving file by file.
+
+        Args:
+            sources (list): ``(chunk_iterator, row_count)`` pairs
+            batch_size (int): Rows per mini-batch
+            rng (np.random.Generator): Random generator
+
+        Yields:
+            pd.DataFrame: Shuffled mini-batch
+        """
+        iterators = [iter(chunks) for chunks, _ in sources]
+        remaining = np.array([max(0, int(count)) for _, count in sources], dtype=np.int64)
+        buffers = [None] * len(sources)
+        offsets = [0] * len(sources)
+
+        while remaining.sum() > 0:
+            counts = rng.multivariate_hypergeometric(remaining, min(batch_size, int(remaining.sum())))
+            parts = []
+            for index, count in enumerate(counts):
+                needed = int(count)
+                while needed > 0:
+                    buffer = buffers[index]
+                    if buffer is None or offsets[index] >= len(buffer):
+                        buffer = next(iterators[index], None)
+                        if buffer is None:
+                            break
+                        buffers[index], offsets[index] = buffer, 0
+                    piece = buffer.iloc[offsets[index]:offsets[index] + needed]
+                    offsets[index] += len(piece)
+                    needed -= len(piece)
+                    parts.append(piece)
+                # A source that ran dry early (file changed since counting) is dropped.
+                remaining[index] = 0 if needed > 0 else remaining[index] - int(count)
+
+            if parts:
+                batch = pd.concat(parts, ignore_index=True)
+                yield batch.iloc[rng.permutation(len(batch))]
+
+    def train_from_csv_streaming(
+        self,
+        file_paths,
+        max_synthetic_ratio=0.25,
+        random_seed=42,
+        chunksize=5000,
+        batch_size=2000,
+        epochs=1,
+        tune_paths=None,
+        target_recall=0.95,
+    ):
+        """
+        Train out-of-core: CSVs are read in chunks and each mini-batch goes straight to ``partial_fit``.
+
+        A first pass only counts usable rows per file. Training passes then keep a uniform
+        sample of synthetic rows capped at ``max_synthetic_ratio`` x real rows and interleave it
+        with the real rows. Memory stays at about one chunk per file, whatever the corpus size.
 
         Args:
             file_paths (list): List of CSV file paths to train on
-            max_synthetic_ratio (float): Maximum synthetic-to-real ratio in the final training mix
-            random_seed (int): Random seed for reproducible sampling and shuffle
+            max_synthetic_ratio (float): Maximum synthetic-to-real ratio in the training mix
+            random_seed (int): Random seed for reproducible sampling and interleaving
+            chunksize (int): Rows read from a CSV at a time
+            batch_size (int): Rows per ``partial_fit`` call
+            epochs (int): Number of passes over the data (each with a fresh sample and order)
+            tune_paths (list | None): Held-out labeled CSVs used to re-tune the mode thresholds
+            target_recall (float): Recall the high-recall mode must reach when re-tuning
         """
-        real_parts = []
-        synthetic_parts = []
+        chunksize = max(1, int(chunksize))
+        batch_size = max(1, int(batch_size))
+        real_files = []
+        synthetic_files = []
 
         for path in file_paths:
-            if os.path.exists(path):
-                print(f"[System] Training on {path}...")
-                df = pd.read_csv(path)
-
-                # --- ROBUST COLUMN CLEANING ---
-                # Convert all column names to lowercase and remove spaces
-                df.columns = [c.lower().strip() for c in df.columns]
-
-                # Check if required columns exist after cleaning
-                if "label" not in df.columns or ("text" not in df.columns and "sentence" not in df.columns):
-                    print(f"[Error] {path} is missing 'text'/'sentence' or 'label' columns.")
-                    print(f"Actual columns found: {df.columns.tolist()}")
-                    continue  # Skip this file and move to the next
-
-                # Clean data: Remove empty rows
-                text_col = "text" if "text" in df.columns else "sentence"
-                df = df.dropna(subset=[text_col, "label"])
-
-                normalized = pd.DataFrame(
-                    {
-                        "text": df[text_col].astype(str),
-                        "label": [1 if "action" in str(l).lower() else 0 for l in df["label"].tolist()],
-                    }
+            if not os.path.exists(path):
+                print(f"[Error] File not found: {path}")
+                continue
+            rows = sum(len(chunk) for chunk in self._iter_csv_chunks(path, chunksize))
+            if rows == 0:
+                continue
+            print(f"[System] Streaming {path} ({rows} rows)...")
+            (synthetic_files if self._is_synthetic_file(path) else real_files).append((path, rows))
+
+        real_rows = sum(rows for _, rows in real_files)
+        synthetic_rows = sum(rows for _, rows in synthetic_files)
+        if real_rows == 0 and synthetic_rows == 0:
+            print("[Error] No valid training rows were loaded. Aborting training.")
+            return
+
+        synthetic_keep = synthetic_rows
+        if real_rows > 0 and synthetic_rows > 0:
+            synthetic_keep = min(synthetic_rows, int(real_rows * max_synthetic_ratio))
+            if synthetic_keep < synthetic_rows:
+                print(
+                    f"[System] Synthetic cap applied: keeping {synthetic_keep} synthetic rows "
+                    f"for {real_rows} real rows (ratio={max_synthetic_ratio:.2f})."
                 )
 
-                if self._is_synthetic_file(path):
-                    synthetic_parts.append(normalized)
-                else:
-                    real_parts.append(normalized)
+        class_counts = {0: 0, 1: 0}
+        batches = 0
+        for epoch in range(max(1, int(epochs))):
+            rng = np.random.default_rng(random_seed + epoch)
+            sources = [(self._iter_csv_chunks(path, chunksize), rows) for path, rows in real_files]
+            if synthetic_keep > 0:
+                sources.append(
+                    (
+                        self._iter_sampled_chunks(
+                            [path for path, _ in synthetic_files], synthetic_keep, synthetic_rows, chunksize, rng
+                        ),
+                        synthetic_keep,
+                    )
+                )
 
-                print(f"  - Successfully processed {len(normalized)} rows.")
-            else:
-                print(f"[Error] File not found: {path}")
+            epoch_rows = 0
+            for batch in self._stream_minibatches(sources, batch_size, rng):
+                labels = batch["label"].tolist()
+                self.classifier.train_on_batch(batch["text"].tolist(), labels)
+                epoch_rows += len(batch)
+                batches += 1
+                if epoch == 0:
+                    for label in labels:
+                        class_counts[label] += 1
+            print(f"[System] Epoch {epoch + 1}/{max(1, int(epochs))}: {epoch_rows} rows in mini-batches of {batch_size}")
+
+        print(f"[System] Streaming training finished: {batches} mini-batches")
+        print(
+            f"[System] Class distribution: {class_counts} | "
+            f"real={real_rows}, synthetic={synthetic_keep}"
+        )
+
+        if tune_paths:
+            self.tune_thresholds(tune_paths, target_recall=target_recall)
+
+        # Save the updated model (wait so the CLI run ends with the model on disk)
+        self.classifier.save_model(wait=True)
+        print("[System] Training complete. Model saved.")
+
+    def train_from_csv(
+        self,
+        file_paths,
+        max_synthetic_ratio=0.25,
+        random_seed=42,
+        streaming=False,
+        chunksize=5000,
+        batch_size=2000,
+        epochs=1,
+        tune_paths=None,
+        target_recall=0.95,
+    ):
+        """
+        Train the SVM model from CSV datasets.
+
+        Args:
+            file_paths (list): List of CSV file paths to train on
+            max_synthetic_ratio (float): Maximum synthetic-to-real ratio in the final training mix
+            random_seed (int): Random seed for reproducible sampling and shuffle
+            streaming (bool): Train out-of-core in mini-batches (see ``train_from_csv_streaming``)
+            chunksize (int): Streaming only: rows read from a CSV at a time
+            batch_size (int): Streaming only: rows per ``partial_fit`` call
+            epochs (int): Streaming only: number of passes over the data
+            tune_paths (list | None): Held-out labeled CSVs used to re-tune the mode thresholds
+            target_recall (float): Recall the high-recall mode must reach when re-tuning
+        """
+        if streaming:
+            self.train_from_csv_streaming(
+                file_paths,
+                max_synthetic_ratio=max_synthetic_ratio,
+                random_seed=random_seed,
+                chunksize=chunksize,
+                batch_size=batch_size,
+                epochs=epochs,
+                tune_paths=tune_paths,
+                target_recall=target_recall,
+            )
+            return
 
-        if not real_parts and not synthetic_parts:
+        # Normalized rows come from the corpus cache; CSVs are only re-parsed when they change.
+        corpus = load_corpus(file_paths, source_names={path: path for path in file_paths})
+        if corpus.empty:
             print("[Error] No valid training rows were loaded. Aborting training.")
             return
 
-        real_df = pd.concat(real_parts, ignore_index=True) if real_parts else pd.DataFrame(columns=["text", "label"])
-        synthetic_df = pd.concat(synthetic_parts, ignore_index=True) if synthetic_parts else pd.DataFrame(columns=["text", "label"])
+        corpus = corpus.rename(columns={"sentence_raw": "text"})[["text", "label", "source_file"]]
+        synthetic_mask = corpus["source_file"].map(self._is_synthetic_file).astype(bool)
+        real_df = corpus[~synthetic_mask][["text", "label"]].reset_index(drop=True)
+        synthetic_df = corpus[synthetic_mask][["text", "label"]].reset_index(drop=True)
 
         if len(real_df) > 0 and len(synthetic_df) > 0:
             max_synthetic_rows = int(len(real_df) * max_synthetic_ratio)
@@ -101,10 +302,45 @@ class ModelTrainer:
             f"real={len(real_df)}, synthetic={len(synthetic_df)}"
         )
 
-        # Save the updated model
-        self.classifier.save_model()
+        if tune_paths:
+            self.tune_thresholds(tune_paths, target_recall=target_recall)
+
+        # Save the updated model (wait so the CLI run ends with the model on disk)
+        self.classifier.save_model(wait=True)
         print("[System] Training complete. Model saved.")
 
+    def tune_thresholds(self, file_paths, target_recall=0.95):
+        """
+        Re-tune the classifier's operating-mode thresholds on held-out labeled CSVs.
+
+        Args:
+            file_paths (list): Labeled CSVs that were not used for training
+            target_recall (float): Recall the high-recall mode must reach
+
+        Returns:
+            ThresholdSweep | None: Precision/recall/F1 curve, or None if no rows were loaded
+        """
+        corpus = load_corpus(file_paths, source_names={path: path for path in file_paths})
+        if corpus.empty:
+            print("[Warning] No labeled rows to tune thresholds on; keeping the current mode thresholds.")
+            return None
+
+        started = time.perf_counter()
+        sweep = self.classifier.tune_mode_thresholds(
+            corpus["sentence_raw"].tolist(),
+            corpus["label"].tolist(),
+            target_recall=target_recall,
+        )
+        elapsed = time.perf_counter() - started
+        for mode, point in sweep.operating_points(target_recall=target_recall).items():
+            if point is not None:
+                print(
+                    f"[System] {mode}: threshold={point['threshold']:+.4f} "
+                    f"precision={point['precision']:.4f} recall={point['recall']:.4f} f1={point['f1']:.4f}"
+                )
+        print(f"[System] Mode thresholds re-tuned on {len(corpus)} rows in {elapsed:.2f}s")
+        return sweep
+
     def collect_user_corrections(self, correction_data):
         """
         Process user corrections from a review session.
@@ -159,6 +395,8 @@ class ModelTrainer:
             persist_csv=True,
             persist_model=True,
         )
+        # The CSV append and model save run in the background; the CLI reports them once on disk.
+        self.classifier.flush_model_writes()
         print(f"[System] Saved {len(corrections)} corrections to {csv_path}")
         print("[System] Model updated and saved.")
 
@@ -190,10 +428,6 @@ class ModelTrainer:
 
 def main():
     """CLI entry point for training without using Main.py."""
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    if project_root not in sys.path:
-        sys.path.insert(0, project_root)
-
     from core.classifier import ActionItemClassifier
 
     parser = argparse.ArgumentParser(
@@ -223,6 +457,41 @@ def main():
         default=42,
         help="Random seed for sampling/shuffling (default: 42).",
     )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Stream CSVs in chunks and train per mini-batch (flat memory for large corpora).",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=5000,
+        help="Rows read per CSV chunk in streaming mode (default: 5000).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=2000,
+        help="Rows per partial_fit mini-batch in streaming mode (default: 2000).",
+    )
+    parser.add_argument(
+        "--epochs",
+        type=int,
+        default=1,
+        help="Passes over the data in streaming mode (default: 1).",
+    )
+    parser.add_argument(
+        "--tune-datasets",
+        nargs="*",
+        default=None,
+        help="Held-out labeled CSVs used to re-tune the operating-mode thresholds after training.",
+    )
+    parser.add_argument(
+        "--target-recall",
+        type=float,
+        default=0.95,
+        help="Recall the high-recall mode must reach when re-tuning (default: 0.95).",
+    )
 
     args = parser.parse_args()
 
@@ -240,6 +509,12 @@ def main():
         file_paths,
         max_synthetic_ratio=args.max_synthetic_ratio,
         random_seed=args.seed,
+        streaming=args.streaming,
+        chunksize=args.chunksize,
+        batch_size=args.batch_size,
+        epochs=args.epochs,
+        tune_paths=args.tune_datasets,
+        target_recall=args.target_recall,
     )
 
 